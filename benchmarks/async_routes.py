@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Compare the news index routes served by the Wagtail ``serve`` view against the
+async routes served by ``wagtailnews.views.serve.serve``, under a local ASGI
+server (uvicorn, which is not a dependency of wagtailnews).
+
+Databases on another machine spend most of their time waiting on the network,
+which ``--latency`` simulates for every query.
+
+    pip install uvicorn
+    python benchmarks/async_routes.py --concurrency 50 --requests 500 --latency 0.005
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def setup_django(database_name):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.app.settings'
+    os.environ['DATABASE_NAME'] = database_name
+
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.DEBUG = False
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def create_news(items):
+    from django.utils import timezone
+    from wagtail.models import Page
+
+    from tests.app.models import NewsIndex, NewsItem
+
+    root_page = Page.objects.get(pk=2)
+    index = root_page.add_child(instance=NewsIndex(title='News', slug='news'))
+    now = timezone.now()
+    NewsItem.objects.bulk_create(
+        NewsItem(
+            newsindex=index,
+            title='Hello {}'.format(i),
+            date=now - timezone.timedelta(hours=i),
+        )
+        for i in range(items))
+    newsitem = NewsItem.objects.filter(newsindex=index).first()
+    year = timezone.localtime(newsitem.date).year
+    return [
+        '/news/',
+        '/news/{}/'.format(year),
+        '/news/rss/',
+        str(newsitem.url),
+    ]
+
+
+def add_latency(latency):
+    from django.db.backends import utils
+
+    def slow(execute):
+        def wrapper(self, *args, **kwargs):
+            time.sleep(latency)
+            return execute(self, *args, **kwargs)
+        return wrapper
+
+    utils.CursorWrapper.execute = slow(utils.CursorWrapper.execute)
+    utils.CursorWrapper.executemany = slow(utils.CursorWrapper.executemany)
+
+
+def start_server():
+    import uvicorn
+    from django.core.asgi import get_asgi_application
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+
+    config = uvicorn.Config(
+        get_asgi_application(), host='127.0.0.1', port=port,
+        log_level='warning', lifespan='off')
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return port
+
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        'GET {} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'
+        .format(path).encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(response.split(b' ', 2)[1])
+
+
+async def load(port, paths, concurrency, requests):
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(paths[i % len(paths)])
+    timings = []
+
+    async def worker():
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            status = await fetch(port, path)
+            timings.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError('{} returned {}'.format(path, status))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - start, timings
+
+
+class ThreadCounter:
+    """Track the most threads alive at once"""
+
+    def __init__(self):
+        self.peak = 0
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(0.001)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        return self.peak
+
+
+def run(urlconf, port, paths, args):
+    from django.conf import settings
+    from django.urls import clear_url_caches
+
+    settings.ROOT_URLCONF = urlconf
+    clear_url_caches()
+    # Warm up
+    asyncio.run(load(port, paths, 1, len(paths)))
+
+    counter = ThreadCounter()
+    elapsed, timings = asyncio.run(
+        load(port, paths, args.concurrency, args.requests))
+    peak_threads = counter.stop()
+    timings.sort()
+    return {
+        'rps': args.requests / elapsed,
+        'p50': statistics.median(timings) * 1000,
+        'p95': timings[int(len(timings) * 0.95) - 1] * 1000,
+        'threads': peak_threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=200,
+                        help='News items to create')
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='Simulated database latency per query, in seconds')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, 'benchmark.sqlite3'))
+        paths = create_news(args.items)
+        add_latency(args.latency)
+        port = start_server()
+
+        results = [
+            ('sync serve view', run('tests.app.urls', port, paths, args)),
+            ('async serve view', run('tests.app.urls_async', port, paths, args)),
+        ]
+
+    print('items: {}, latency: {}s, concurrency: {}, requests: {}'.format(
+        args.items, args.latency, args.concurrency, args.requests))
+    for name, result in results:
+        print(
+            '{:<18} {rps:7.1f} req/s  p50 {p50:7.1f}ms  p95 {p95:7.1f}ms  '
+            'peak threads {threads}'.format(name, **result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Compare the merged news item search against the old approach of searching
+each news item model in turn.
+
+Search backends backed by an external service spend most of their time
+waiting on the network, which ``--latency`` simulates.
+
+    python benchmarks/search.py --items 1000 --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def setup_django(database_name):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.app.settings'
+    os.environ['DATABASE_NAME'] = database_name
+
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.WAGTAILSEARCH_BACKENDS = {
+        'default': {'BACKEND': 'wagtail.search.backends.database.fallback'},
+    }
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def create_news(items):
+    from wagtail.models import Page
+
+    from tests.app.models import (
+        NewsIndex, NewsItem, SecondaryNewsIndex, SecondaryNewsItem)
+
+    root_page = Page.objects.get(pk=2)
+    index = root_page.add_child(instance=NewsIndex(title='News'))
+    secondary = root_page.add_child(instance=SecondaryNewsIndex(title='Other'))
+    NewsItem.objects.bulk_create(
+        NewsItem(newsindex=index, title='Hello {}'.format(i))
+        for i in range(items))
+    SecondaryNewsItem.objects.bulk_create(
+        SecondaryNewsItem(newsindex=secondary, title='Hello {}'.format(i))
+        for i in range(items))
+    return [NewsItem, SecondaryNewsItem]
+
+
+class SlowBackend:
+    def __init__(self, backend, latency):
+        self.backend = backend
+        self.latency = latency
+
+    def autocomplete(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return self.backend.autocomplete(*args, **kwargs)
+
+
+def old_search(backend, models, query):
+    results = []
+    for NewsItem in models:
+        results.extend(backend.autocomplete(query, NewsItem)[:10])
+    return results
+
+
+def new_search(backend, models, query):
+    from wagtailnews.search import search_newsitems
+    querysets = [NewsItem.objects.all() for NewsItem in models]
+    return list(search_newsitems(querysets, query, page_size=20, backend=backend))
+
+
+def timeit(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=1000,
+                        help='News items to create for each model')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Simulated search backend latency, in seconds')
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, 'benchmark.sqlite3'))
+        models = create_news(args.items)
+
+        from wagtail.search.backends import get_search_backend
+        backend = SlowBackend(get_search_backend(), args.latency)
+
+        old = timeit(lambda: old_search(backend, models, 'hello'), args.repeat)
+        new = timeit(lambda: new_search(backend, models, 'hello'), args.repeat)
+
+    print('models: {}, items per model: {}, latency: {}s'.format(
+        len(models), args.items, args.latency))
+    print('per-model loop:  {:.1f}ms'.format(old * 1000))
+    print('merged search:   {:.1f}ms'.format(new * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+from wagtail.api.v2.router import WagtailAPIRouter
+
+from wagtailnews.api import NewsItemsAPIViewSet
+
+from .models import NewsItem
+
+
+class NewsAPIViewSet(NewsItemsAPIViewSet):
+    model = NewsItem
+
+
+api_router = WagtailAPIRouter("wagtailapi")
+api_router.register_endpoint("news", NewsAPIViewSet)
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:22
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_newsindex_body_alter_newsindextag_tag_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsitem',
+            name='last_modified',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Last modified'),
+        ),
+        migrations.AddField(
+            model_name='secondarynewsitem',
+            name='last_modified',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Last modified'),
+        ),
+    ]
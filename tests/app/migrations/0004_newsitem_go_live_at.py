@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_newsitem_last_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsitem',
+            name='go_live_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Go live date/time'),
+        ),
+        migrations.AddField(
+            model_name='secondarynewsitem',
+            name='go_live_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name='Go live date/time'),
+        ),
+    ]
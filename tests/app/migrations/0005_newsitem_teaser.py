@@ -0,0 +1,33 @@
+# Generated by Django 5.0.14 on 2026-10-19 16:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_newsitem_go_live_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newsitem',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='newsitem',
+            name='teaser',
+            field=models.TextField(blank=True, editable=False, verbose_name='Teaser'),
+        ),
+        migrations.AddField(
+            model_name='secondarynewsitem',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Excerpt'),
+        ),
+        migrations.AddField(
+            model_name='secondarynewsitem',
+            name='teaser',
+            field=models.TextField(blank=True, editable=False, verbose_name='Teaser'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-19 17:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_newsitem_teaser'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newsitem',
+            name='date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Published date'),
+        ),
+        migrations.AlterField(
+            model_name='secondarynewsitem',
+            name='date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Published date'),
+        ),
+    ]
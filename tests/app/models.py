@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils.html import format_html
 from modelcluster.contrib.taggit import ClusterTaggableManager
 from modelcluster.fields import ParentalKey
 from taggit.models import TaggedItemBase
@@ -58,6 +59,7 @@ class NewsIndex(NewsIndexMixin, Page):
 
 class NewsItem(AbstractNewsItem):
     title = models.CharField(max_length=32)
+    slug_fields = ["title"]
     page = models.ForeignKey(
         "wagtailcore.Page",
         null=True,
@@ -76,6 +78,7 @@ class NewsItem(AbstractNewsItem):
     ]
 
     search_fields = AbstractNewsItem.search_fields + [
+        index.SearchField("title"),
         index.AutocompleteField("title"),
     ]
 
@@ -92,6 +95,9 @@ class NewsItem(AbstractNewsItem):
             self.date, self.title
         )
 
+    def render_teaser(self):
+        return format_html("<p><b>{}</b> {}</p>", self.title, " ".join(self.tags.names()))
+
 
 class NewsItemRevision(AbstractNewsItemRevision):
     newsitem = models.ForeignKey(
@@ -111,6 +117,7 @@ class SecondaryNewsIndex(NewsIndexMixin, Page):
 
 class SecondaryNewsItem(AbstractNewsItem):
     title = models.CharField(max_length=32)
+    slug_fields = ["title"]
 
     edit_handler = TabbedInterface(
         [
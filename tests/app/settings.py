@@ -23,8 +23,13 @@ INSTALLED_APPS = [
     "wagtail.documents",
     "wagtail.images",
     "wagtail.contrib.routable_page",
+    "wagtail.contrib.sitemaps",
+    "wagtail.contrib.frontend_cache",
+    "wagtail.api.v2",
+    "rest_framework",
     "django.contrib.admin",
     "django.contrib.auth",
+    "django.contrib.sitemaps",
     "django.contrib.contenttypes",
     "django.contrib.messages",
     "django.contrib.sessions",
@@ -42,6 +47,11 @@ DATABASES = {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": env("DATABASE_NAME", "test.sqlite3"),
     },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": env("DATABASE_NAME", "test.sqlite3"),
+        "TEST": {"MIRROR": "default"},
+    },
 }
 
 WAGTAIL_SITE_NAME = "Wagtail News"
@@ -0,0 +1,16 @@
+from wagtail.contrib.sitemaps import Sitemap
+
+from wagtailnews.sitemaps import NewsItemSitemap
+
+from .models import NewsItem
+
+
+class NewsSitemap(NewsItemSitemap):
+    model = NewsItem
+    limit = 2
+
+
+sitemaps = {
+    "pages": Sitemap,
+    "news": NewsSitemap,
+}
@@ -1,8 +1,24 @@
-from django.urls import re_path, include
+from django.urls import path, re_path, include
 from wagtail import urls as wagtail_urls
 from wagtail.admin import urls as wagtailadmin_urls
+from wagtail.contrib.sitemaps import views as sitemap_views
+
+from .api import api_router
+from .sitemaps import sitemaps
 
 urlpatterns = [
     re_path(r"^admin/", include(wagtailadmin_urls)),
+    path("api/v2/", api_router.urls),
+    path(
+        "sitemap.xml",
+        sitemap_views.index,
+        {"sitemaps": sitemaps, "sitemap_url_name": "sitemap"},
+    ),
+    path(
+        "sitemap-<section>.xml",
+        sitemap_views.sitemap,
+        {"sitemaps": sitemaps},
+        name="sitemap",
+    ),
     re_path(r"", include(wagtail_urls)),
 ]
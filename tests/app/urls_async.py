@@ -0,0 +1,12 @@
+from django.urls import re_path
+from wagtail.urls import serve_pattern
+
+from wagtailnews.views.serve import serve
+
+from .urls import urlpatterns as sync_urlpatterns
+
+# The test URLs, with the async serve view in front of the Wagtail URLs
+urlpatterns = sync_urlpatterns[:-1] + [
+    re_path(serve_pattern, serve, name="wagtail_serve"),
+    sync_urlpatterns[-1],
+]
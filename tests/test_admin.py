@@ -1,9 +1,12 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from wagtail.models import Page
 from wagtail.test.utils import WagtailTestUtils
 
-from tests.app.models import NewsIndex, SecondaryNewsIndex
+from tests.app.models import (
+    NewsIndex, NewsItem, SecondaryNewsIndex, SecondaryNewsItem)
 
 
 class TestNewsIndexChooser(TestCase, WagtailTestUtils):
@@ -21,3 +24,66 @@ class TestNewsIndexChooser(TestCase, WagtailTestUtils):
         response = self.client.get(reverse('wagtailnews:choose'))
         self.assertContains(response, self.index1.get_admin_display_title())
         self.assertContains(response, self.index2.get_admin_display_title())
+
+    def test_newsitem_stats(self):
+        NewsItem.objects.create(newsindex=self.index1, title='One')
+        NewsItem.objects.create(newsindex=self.index1, title='Two')
+        NewsItem.objects.create(newsindex=self.index1, title='Draft', live=False)
+        SecondaryNewsItem.objects.create(newsindex=self.index2, title='Other')
+
+        response = self.client.get(reverse('wagtailnews:choose'))
+        stats = {
+            newsindex.pk: (newsindex.newsitem_count, newsindex.newsitem_draft_count)
+            for newsindex, model_type in response.context['newsindex_list']}
+        self.assertEqual(stats, {self.index1.pk: (3, 1), self.index2.pk: (1, 0)})
+        self.assertContains(response, '3 posts')
+
+    def test_constant_queries(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('wagtailnews:choose'))
+            return len(queries)
+
+        before = count_queries()
+        root_page = Page.objects.get(pk=2)
+        for i in range(3):
+            root_page.add_child(instance=NewsIndex(title='Index {}'.format(i)))
+            root_page.add_child(instance=SecondaryNewsIndex(
+                title='Secondary {}'.format(i)))
+        self.assertEqual(count_queries(), before)
+
+
+class TestNewsItemChooser(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestNewsItemChooser, self).setUp()
+        self.login()
+        self.root_page = Page.objects.get(pk=2)
+        self.index1 = self.root_page.add_child(instance=NewsIndex(
+            title='First index'))
+        self.index2 = self.root_page.add_child(instance=NewsIndex(
+            title='Second index'))
+        self.item1 = NewsItem.objects.create(newsindex=self.index1, title='Foo')
+        self.item2 = NewsItem.objects.create(newsindex=self.index2, title='Bar')
+
+    def test_filter_by_index(self):
+        response = self.client.get(reverse('newsitem_chooser:choose'))
+        self.assertContains(response, self.index1.title)
+        self.assertContains(response, self.index2.title)
+        self.assertContains(response, self.item1.title)
+        self.assertContains(response, self.item2.title)
+
+        response = self.client.get(reverse('newsitem_chooser:choose_results'), {
+            'index_id': self.index2.pk})
+        self.assertNotContains(response, self.item1.title)
+        self.assertContains(response, self.item2.title)
+
+    def test_constant_queries(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('newsitem_chooser:choose'))
+            return len(queries)
+
+        before = count_queries()
+        for i in range(3):
+            self.root_page.add_child(instance=NewsIndex(title='Index {}'.format(i)))
+        self.assertEqual(count_queries(), before)
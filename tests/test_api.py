@@ -0,0 +1,224 @@
+import datetime
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.models import Site
+
+from tests.app.models import NewsIndex, NewsItem
+from wagtailnews import keyset
+
+
+class TestAPIRoute(TestCase):
+    def setUp(self):
+        super().setUp()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        other_index = root_page.add_child(instance=NewsIndex(title="Other", slug="other"))
+        self.date = timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0))
+        # Five news items, two sharing each date
+        self.newsitems = [
+            NewsItem.objects.create(
+                newsindex=self.index,
+                title="Post {}".format(i),
+                date=self.date - datetime.timedelta(days=i // 2),
+            )
+            for i in range(5)
+        ]
+        NewsItem.objects.create(newsindex=self.index, title="Draft", live=False)
+        NewsItem.objects.create(newsindex=other_index, title="Other")
+        self.url = "/news/api/"
+
+    def get(self, url=None, status=200, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, status)
+        return response
+
+    def test_default_fields(self):
+        data = self.get(limit=1).json()
+        newsitem = self.newsitems[1]  # The same date as 0, with a greater pk
+        self.assertEqual(data["items"], [{
+            "id": newsitem.pk,
+            "url": str(newsitem.url),
+            "date": "2017-04-13T02:00:00Z",
+            "teaser": "<p><b>Post 1</b> </p>",
+            "excerpt": "Post 1",
+        }])
+
+    def test_pages(self):
+        pks = []
+        url = self.url + "?limit=2"
+        while url:
+            data = self.get(url).json()
+            self.assertLessEqual(len(data["items"]), 2)
+            pks.extend(item["id"] for item in data["items"])
+            url = data["next"]
+        self.assertEqual(pks, [n.pk for n in sorted(
+            self.newsitems, key=lambda n: (n.date, n.pk), reverse=True)])
+
+    def test_one_query_per_page(self):
+        first = self.get(limit=2).json()
+        with CaptureQueriesContext(connection) as queries:
+            self.get(first["next"])
+        newsitem_queries = [q for q in queries if "app_newsitem" in q["sql"]]
+        self.assertEqual(len(newsitem_queries), 1)
+
+    def test_only_requested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(fields="excerpt").json()
+        self.assertEqual(set(data["items"][0]), {"id", "url", "excerpt"})
+        sql = [q["sql"] for q in queries if "app_newsitem" in q["sql"]][0]
+        self.assertNotIn('"app_newsitem"."teaser"', sql)
+        self.assertNotIn('"app_newsitem"."page_id"', sql)
+
+    def test_extra_api_fields(self):
+        with mock.patch.object(NewsIndex, "api_fields", ["title"]):
+            data = self.get(limit=1).json()
+            self.assertEqual(data["items"][0]["title"], "Post 1")
+            self.get(fields="teaser", status=400)
+
+    def test_bad_requests(self):
+        self.assertEqual(
+            self.get(fields="title,live", status=400).json(),
+            {"error": "Unknown fields: title, live"})
+        self.get(limit="0", status=400)
+        self.get(limit="101", status=400)
+        self.get(limit="ten", status=400)
+        self.get(cursor="not a cursor", status=400)
+        self.get(cursor=keyset.encode_cursor(self.newsitems[0])[:-3], status=400)
+
+    def test_etag(self):
+        response = self.get()
+        etag = response["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        self.newsitems[0].title = "Changed"
+        self.newsitems[0].save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class TestNewsItemsAPIViewSet(TestCase):
+    def setUp(self):
+        super().setUp()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.other_index = root_page.add_child(
+            instance=NewsIndex(title="Other", slug="other"))
+        self.date = timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0))
+        self.newsitems = [
+            NewsItem.objects.create(
+                newsindex=self.index if i % 2 else self.other_index,
+                title="Post {}".format(i),
+                date=self.date - datetime.timedelta(days=i),
+            )
+            for i in range(4)
+        ]
+        self.newsitems[0].tags.add("wagtail", "news")
+        self.newsitems[0].save()
+        self.newsitems[1].tags.add("wagtail")
+        self.newsitems[1].save()
+        NewsItem.objects.create(newsindex=self.index, title="Draft", live=False)
+        unpublished = root_page.add_child(
+            instance=NewsIndex(title="Unpublished", slug="unpublished", live=False))
+        NewsItem.objects.create(newsindex=unpublished, title="Hidden")
+        self.url = "/api/v2/news/"
+
+    def get(self, status=200, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status)
+        return response
+
+    def get_ids(self, **params):
+        return [item["id"] for item in self.get(**params).json()["items"]]
+
+    def test_listing(self):
+        data = self.get().json()
+        self.assertEqual(data["meta"]["total_count"], 4)
+        newsitem = self.newsitems[0]
+        self.assertTrue(data["items"][0].pop("teaser").startswith("<p><b>Post 0</b>"))
+        self.assertEqual(data["items"][0], {
+            "id": newsitem.pk,
+            "meta": {
+                "type": "app.NewsItem",
+                "detail_url": "http://localhost/api/v2/news/{}/".format(newsitem.pk),
+                "html_url": "http://localhost" + str(newsitem.url),
+                "newsindex": self.other_index.pk,
+            },
+            "date": "2017-04-13T12:00:00+10:00",
+        })
+        self.assertEqual(
+            [item["id"] for item in data["items"]],
+            [newsitem.pk for newsitem in self.newsitems])
+
+    def test_detail(self):
+        newsitem = self.newsitems[1]
+        response = self.client.get("{}{}/".format(self.url, newsitem.pk))
+        data = response.json()
+        self.assertEqual(data["meta"]["html_url"], "http://localhost" + str(newsitem.url))
+        self.assertEqual(data["excerpt"], "Post 1 wagtail")
+
+        draft = NewsItem.objects.get(title="Draft")
+        response = self.client.get("{}{}/".format(self.url, draft.pk))
+        self.assertEqual(response.status_code, 404)
+
+    def test_filter_newsindex(self):
+        self.assertEqual(
+            self.get_ids(newsindex=self.index.pk),
+            [self.newsitems[1].pk, self.newsitems[3].pk])
+
+    def test_filter_dates(self):
+        self.assertEqual(
+            self.get_ids(date_from="2017-04-11", date_to="2017-04-12"),
+            [self.newsitems[1].pk, self.newsitems[2].pk])
+        self.assertEqual(self.get_ids(date_from="2017-04-13"), [self.newsitems[0].pk])
+        self.get(date_from="2017-04-31", status=400)
+        self.get(date_to="yesterday", status=400)
+
+    def test_filter_tags(self):
+        self.assertEqual(
+            self.get_ids(tag="wagtail"), [self.newsitems[0].pk, self.newsitems[1].pk])
+        self.assertEqual(self.get_ids(tag="wagtail,news"), [self.newsitems[0].pk])
+        self.assertEqual(self.get_ids(tag="nothing"), [])
+
+    def test_unknown_parameters(self):
+        self.get(search="post", status=400)
+        self.get(fields="title", status=400)
+
+    def test_only_serialized_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(fields="_,id,excerpt").json()
+        self.assertEqual(set(data["items"][0]), {"id", "excerpt"})
+        sql = [q["sql"] for q in queries if 'FROM "app_newsitem"' in q["sql"]][-1]
+        self.assertIn('"app_newsitem"."excerpt"', sql)
+        self.assertNotIn('"app_newsitem"."teaser"', sql)
+        self.assertNotIn('"app_newsitem"."page_id"', sql)
+
+    def test_news_index_urls_resolved_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get(fields="_,html_url")
+        for i in range(3):
+            NewsItem.objects.create(newsindex=self.index, title="More")
+        with CaptureQueriesContext(connection) as more_queries:
+            self.get(fields="_,html_url")
+        self.assertEqual(len(more_queries), len(queries))
+
+    def test_etag(self):
+        response = self.get()
+        etag = response["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.newsitems[0].title = "Changed"
+        self.newsitems[0].save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(WAGTAILNEWS_CACHE_MAX_AGE=60)
+    def test_cache_control(self):
+        self.assertEqual(self.get()["Cache-Control"], "max-age=60")
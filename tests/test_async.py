@@ -0,0 +1,104 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache as default_cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from wagtail.models import Site
+
+from tests.app.models import NewsIndex, NewsItem
+from wagtailnews.models import NewsIndexMixin
+
+
+@override_settings(ROOT_URLCONF="tests.app.urls_async")
+class TestAsyncRoutes(TestCase):
+    def setUp(self):
+        super().setUp()
+        default_cache.clear()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.newsitem = NewsItem.objects.create(
+            newsindex=self.index,
+            title="A post",
+            date=timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0)),
+        )
+        self.newsitem_url = str(self.newsitem.url)
+
+    async def assertAsyncRoute(self, name, url, status=200):
+        view = getattr(NewsIndexMixin, name)
+        with mock.patch.object(NewsIndexMixin, name, autospec=True, side_effect=view) as m:
+            response = await self.async_client.get(url)
+        m.assert_called_once()
+        self.assertEqual(response.status_code, status)
+        return response
+
+    async def test_listings(self):
+        for name, url in [
+            ("av_index", "/news/"),
+            ("av_year", "/news/2017/"),
+            ("av_month", "/news/2017/4/"),
+            ("av_day", "/news/2017/4/13/"),
+        ]:
+            response = await self.assertAsyncRoute(name, url)
+            self.assertContains(response, self.newsitem_url)
+
+        await self.assertAsyncRoute("av_day", "/news/2017/4/12/")
+        await self.assertAsyncRoute("av_month", "/news/2017/13/", status=404)
+
+    @override_settings(WAGTAILNEWS_CACHE_TIMEOUT=60)
+    async def test_empty_archives(self):
+        with mock.patch.object(NewsIndex, "empty_archives", "404"):
+            await self.assertAsyncRoute("av_year", "/news/2017/")
+            await self.assertAsyncRoute("av_day", "/news/2017/4/12/", status=404)
+        with mock.patch.object(NewsIndex, "empty_archives", "cache"):
+            response = await self.assertAsyncRoute("av_month", "/news/2003/2/")
+            cached = await self.assertAsyncRoute("av_month", "/news/2003/2/")
+        self.assertEqual(cached.content, response.content)
+
+    async def test_pages(self):
+        await NewsItem.objects.abulk_create(
+            NewsItem(newsindex=self.index, title="Post {}".format(i)) for i in range(25)
+        )
+        response = await self.assertAsyncRoute("av_index", "/news/?page=2")
+        self.assertEqual(response.context["newsitem_page"].number, 2)
+        self.assertEqual(len(response.context["newsitem_list"]), 6)
+        self.assertContains(response, self.newsitem_url)
+
+    async def test_post(self):
+        response = await self.assertAsyncRoute("av_post", self.newsitem_url)
+        self.assertEqual(response.context["newsitem"], self.newsitem)
+
+        response = await self.assertAsyncRoute(
+            "av_post", "/news/2017/4/13/{}-old-slug/".format(self.newsitem.pk),
+            status=301)
+        self.assertEqual(response["Location"], self.newsitem_url)
+
+        await self.assertAsyncRoute("av_post", "/news/2017/4/13/0-a-post/", status=404)
+
+    async def test_feed(self):
+        response = await self.assertAsyncRoute("anewsfeed", "/news/rss/")
+        self.assertContains(response, "A post")
+
+    @override_settings(WAGTAILNEWS_CACHE_TIMEOUT=60, WAGTAILNEWS_CACHE_MAX_AGE=60)
+    async def test_feed_cached(self):
+        await self.async_client.get("/news/rss/")
+        await NewsItem.objects.acreate(newsindex=self.index, title="Second post")
+        response = await self.assertAsyncRoute("anewsfeed", "/news/rss/")
+        self.assertNotContains(response, "Second post")
+        self.assertEqual(response["Cache-Control"], "max-age=60")
+
+    async def test_sync_routes(self):
+        # Routes without an async version are served in a thread
+        response = await self.async_client.get("/news/api/")
+        self.assertEqual(response.json()["items"][0]["id"], self.newsitem.pk)
+        response = await self.async_client.get("/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_overridden_route(self):
+        class CustomIndex(NewsIndexMixin):
+            def v_index(self, request):
+                pass
+
+        index = CustomIndex()
+        self.assertIsNone(index._get_async_view(index.v_index))
+        self.assertEqual(index._get_async_view(index.v_year), index.av_year)
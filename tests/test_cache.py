@@ -0,0 +1,226 @@
+import datetime
+from unittest import mock
+from unittest.mock import MagicMock
+
+from django.core.cache import cache as default_cache
+from django.db import connection
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.models import Site
+
+from tests.app.models import NewsIndex, NewsItem
+from wagtailnews import signals
+from wagtailnews.cache import (
+    bump_generation, cache_newsitem_fragment, get_generation,
+    get_generation_cache, make_cache_key, make_newsitem_cache_key)
+
+
+class TestGeneration(TestCase):
+    def setUp(self):
+        super().setUp()
+        default_cache.clear()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.other_index = root_page.add_child(
+            instance=NewsIndex(title="Other", slug="other")
+        )
+        self.newsitem = NewsItem.objects.create(
+            newsindex=self.index,
+            title="A post",
+            date=timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0)),
+        )
+
+    def test_generation_is_stable(self):
+        self.assertEqual(get_generation(self.index.pk), get_generation(self.index.pk))
+        self.assertEqual(make_cache_key(self.index.pk, "a"), self.index.get_cache_key("a"))
+
+    def test_bump(self):
+        generation = get_generation(self.index.pk)
+        key = self.index.get_cache_key("feed")
+        other_key = self.other_index.get_cache_key("feed")
+
+        self.assertEqual(bump_generation(self.index.pk), generation + 1)
+        self.assertEqual(get_generation(self.index.pk), generation + 1)
+        self.assertNotEqual(self.index.get_cache_key("feed"), key)
+        self.assertEqual(self.other_index.get_cache_key("feed"), other_key)
+
+    def test_evicted_generation_is_not_reused(self):
+        generation = get_generation(self.index.pk)
+        bump_generation(self.index.pk)
+        get_generation_cache().clear()
+        self.assertGreater(bump_generation(self.index.pk), generation + 1)
+
+    def test_signals_bump_on_commit(self):
+        for signal in [
+            signals.newsitem_published,
+            signals.newsitem_unpublished,
+            signals.newsitem_deleted,
+        ]:
+            generation = get_generation(self.index.pk)
+            with self.captureOnCommitCallbacks(execute=True):
+                signal.send(sender=NewsItem, instance=self.newsitem)
+                self.assertEqual(get_generation(self.index.pk), generation)
+            self.assertEqual(get_generation(self.index.pk), generation + 1)
+
+    def test_batch_signals_bump_once_per_index(self):
+        other = NewsItem.objects.create(newsindex=self.other_index, title="Other")
+        generation = get_generation(self.index.pk)
+        other_generation = get_generation(self.other_index.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            signals.newsitems_published.send(
+                sender=NewsItem, instances=[self.newsitem, other, self.newsitem])
+        self.assertEqual(get_generation(self.index.pk), generation + 1)
+        self.assertEqual(get_generation(self.other_index.pk), other_generation + 1)
+
+    def test_newsindex_publish_bumps(self):
+        generation = get_generation(self.index.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.index.save_revision().publish()
+        self.assertEqual(get_generation(self.index.pk), generation + 1)
+
+
+@override_settings(WAGTAILNEWS_CACHE_TIMEOUT=60)
+class TestFeedCache(TestCase):
+    def setUp(self):
+        super().setUp()
+        default_cache.clear()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.url = self.index.url + self.index.reverse_subpage("feed")
+        NewsItem.objects.create(newsindex=self.index, title="First post")
+
+    def test_feed_cached_until_publish(self):
+        self.assertContains(self.client.get(self.url), "First post")
+
+        newsitem = NewsItem.objects.create(newsindex=self.index, title="Second post")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertNotContains(response, "Second post")
+        # Only Wagtail's page routing queries
+        self.assertFalse(
+            [query for query in queries if "app_newsitem" in query["sql"]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            signals.newsitem_published.send(
+                sender=NewsItem, instance=newsitem, created=True)
+        self.assertContains(self.client.get(self.url), "Second post")
+
+    def test_cached_per_scheme(self):
+        # Feeds build relative links with the request's scheme
+        self.client.get(self.url)
+        NewsItem.objects.create(newsindex=self.index, title="Second post")
+        self.assertNotContains(self.client.get(self.url), "Second post")
+        self.assertContains(self.client.get(self.url, secure=True), "Second post")
+
+    @override_settings(WAGTAILNEWS_CACHE_TIMEOUT=None)
+    def test_not_cached_by_default(self):
+        self.client.get(self.url)
+        NewsItem.objects.create(newsindex=self.index, title="Second post")
+        self.assertContains(self.client.get(self.url), "Second post")
+
+
+class TestNewsItemCache(TestCase):
+    def setUp(self):
+        super().setUp()
+        default_cache.clear()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.newsitem = NewsItem.objects.create(newsindex=self.index, title="A post")
+        self.template = Template(
+            "{% load wagtailnews_tags %}"
+            "{% newsitem_cache newsitem 'teaser' lang %}"
+            "{{ newsitem.title }} {{ lang }}"
+            "{% endnewsitem_cache %}"
+        )
+
+    def render(self, newsitem, lang="en"):
+        return self.template.render(Context({"newsitem": newsitem, "lang": lang}))
+
+    def test_cached(self):
+        self.assertEqual(self.render(self.newsitem), "A post en")
+
+        # The fragment is reused for the same version of the news item
+        stale = NewsItem.objects.get(pk=self.newsitem.pk)
+        stale.title = "Not rendered"
+        self.assertEqual(self.render(stale), "A post en")
+
+        # Vary on extra arguments
+        self.assertEqual(self.render(stale, lang="fr"), "Not rendered fr")
+
+    def test_changes_with_newsitem(self):
+        self.render(self.newsitem)
+
+        self.newsitem.title = "Updated"
+        self.newsitem.save()
+        self.assertEqual(self.render(self.newsitem), "Updated en")
+
+        self.newsitem.unpublish()
+        self.newsitem.title = "Unpublished"
+        self.assertEqual(self.render(self.newsitem), "Unpublished en")
+
+    def test_changes_with_newsindex(self):
+        self.render(self.newsitem)
+
+        self.newsitem.title = "Other news item published"
+        bump_generation(self.index.pk)
+        self.assertEqual(self.render(self.newsitem), "Other news item published en")
+
+    def test_generation_read_once_per_request(self):
+        other = NewsItem.objects.create(newsindex=self.index, title="Another post")
+        request = RequestFactory().get("/")
+        template = Template(
+            "{% load wagtailnews_tags %}"
+            "{% for newsitem in newsitems %}"
+            "{% newsitem_cache newsitem 'teaser' %}{{ newsitem.title }}{% endnewsitem_cache %}"
+            "{% endfor %}"
+        )
+        with mock.patch(
+            "wagtailnews.cache.get_generation_cache", wraps=get_generation_cache
+        ) as generation_cache:
+            template.render(Context(
+                {"newsitems": [self.newsitem, other], "request": request}))
+        generation_cache.assert_called_once_with()
+
+    def test_latest_revision(self):
+        self.newsitem.save_revision()
+        newsitem = NewsItem.objects.annotate_latest_revision().get()
+        self.render(newsitem)
+
+        revision = newsitem.save_revision()
+        newsitem = NewsItem.objects.annotate_latest_revision().get()
+        self.assertEqual(newsitem.latest_revision_id, revision.pk)
+        newsitem.title = "New revision"
+        self.assertEqual(self.render(newsitem), "New revision en")
+
+    def test_escaping(self):
+        self.newsitem.title = "<b>Bold</b>"
+        self.newsitem.save()
+        template = Template(
+            "{% load wagtailnews_tags %}"
+            "{% newsitem_cache newsitem 'title' %}{{ newsitem.title }}{% endnewsitem_cache %}"
+        )
+        for i in range(2):
+            self.assertEqual(
+                template.render(Context({"newsitem": self.newsitem})),
+                "&lt;b&gt;Bold&lt;/b&gt;",
+            )
+
+    def test_python_api(self):
+        render = MagicMock(return_value="fragment")
+        for i in range(2):
+            self.assertEqual(
+                cache_newsitem_fragment(self.newsitem, "body", render, timeout=60),
+                "fragment",
+            )
+        render.assert_called_once_with()
+        self.assertIsNotNone(
+            default_cache.get(make_newsitem_cache_key(self.newsitem, "body")))
+
+    def test_syntax_error(self):
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                "{% load wagtailnews_tags %}"
+                "{% newsitem_cache newsitem %}{% endnewsitem_cache %}"
+            )
@@ -0,0 +1,367 @@
+import datetime
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.models import Page
+
+from tests.app.models import (
+    NewsIndex, NewsItem, SecondaryNewsIndex, SecondaryNewsItem)
+from wagtailnews import signals
+
+
+class TestUpdateNewsIndex(TestCase):
+    def setUp(self):
+        super(TestUpdateNewsIndex, self).setUp()
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+        self.secondary_index = root_page.add_child(
+            instance=SecondaryNewsIndex(title='Secondary'))
+
+        self.backend = mock.Mock()
+        patcher = mock.patch(
+            'wagtailnews.management.commands.update_news_index.get_search_backends_with_name',
+            return_value=[('default', self.backend)])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.state_file = os.path.join(tmp.name, 'state.json')
+
+    def run_command(self, **options):
+        call_command(
+            'update_news_index', state_file=self.state_file, stdout=StringIO(),
+            **options)
+
+    def indexed(self, model=NewsItem):
+        return [
+            newsitem
+            for call in self.backend.add_bulk.call_args_list
+            if call[0][0] is model
+            for newsitem in call[0][1]
+        ]
+
+    def test_all(self):
+        newsitems = [
+            NewsItem.objects.create(newsindex=self.index, title=str(i))
+            for i in range(5)]
+        secondary = SecondaryNewsItem.objects.create(
+            newsindex=self.secondary_index, title='Secondary')
+
+        self.run_command(chunk_size=2)
+
+        self.assertEqual(self.indexed(), newsitems)
+        self.assertEqual(self.indexed(SecondaryNewsItem), [secondary])
+        # Chunks of two
+        self.assertEqual(self.backend.add_bulk.call_count, 4)
+
+    def test_watermark(self):
+        old = NewsItem.objects.create(newsindex=self.index, title='Old')
+        self.run_command()
+        with open(self.state_file) as f:
+            self.assertIn('watermark', json.load(f)['app.newsitem'])
+
+        self.backend.reset_mock()
+        NewsItem.objects.filter(pk=old.pk).update(
+            last_modified=timezone.now() - datetime.timedelta(days=1))
+        new = NewsItem.objects.create(newsindex=self.index, title='New')
+        self.run_command()
+        self.assertEqual(self.indexed(), [new])
+
+    def test_since(self):
+        old = NewsItem.objects.create(newsindex=self.index, title='Old')
+        NewsItem.objects.filter(pk=old.pk).update(
+            last_modified=timezone.now() - datetime.timedelta(days=10))
+        new = NewsItem.objects.create(newsindex=self.index, title='New')
+
+        since = timezone.now() - datetime.timedelta(days=1)
+        self.run_command(since=since.isoformat())
+        self.assertEqual(self.indexed(), [new])
+
+    def test_resume(self):
+        newsitems = [
+            NewsItem.objects.create(newsindex=self.index, title=str(i))
+            for i in range(4)]
+        with open(self.state_file, 'w') as f:
+            json.dump({'app.newsitem': {
+                'since': None,
+                'started_at': timezone.now().isoformat(),
+                'last_pk': newsitems[1].pk,
+            }}, f)
+
+        self.run_command(models=['app.NewsItem'])
+        self.assertEqual(self.indexed(), newsitems[2:])
+        self.assertEqual(self.indexed(SecondaryNewsItem), [])
+
+    def test_model_watermark(self):
+        """Indexing one model does not move the watermark of the others"""
+        self.run_command()
+        secondary = SecondaryNewsItem.objects.create(
+            newsindex=self.secondary_index, title='Secondary')
+        NewsItem.objects.create(newsindex=self.index, title='News')
+        self.run_command(models=['app.NewsItem'])
+
+        self.backend.reset_mock()
+        self.run_command()
+        self.assertEqual(self.indexed(), [])
+        self.assertEqual(self.indexed(SecondaryNewsItem), [secondary])
+
+
+class TestImportNews(TestCase):
+    def setUp(self):
+        super(TestImportNews, self).setUp()
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+
+        self.backend = mock.Mock()
+        patcher = mock.patch(
+            'wagtailnews.indexing.get_search_backends_with_name',
+            return_value=[('default', self.backend)])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def run_command(self, path, **options):
+        stderr = StringIO()
+        call_command(
+            'import_news', path, index=self.index.pk, stdout=StringIO(),
+            stderr=stderr, **options)
+        return stderr.getvalue()
+
+    def test_jsonl(self):
+        handler = mock.Mock()
+        signals.newsitems_published.connect(handler, sender=NewsItem)
+        path = self.write('news.jsonl', '\n'.join(json.dumps(record) for record in [
+            {'title': 'First', 'date': '2017-04-13T12:00:00', 'tags': ['one', 'two words']},
+            {'title': 'Second', 'date': '2017-04-14 12:00'},
+            {'title': 'Third', 'date': '2017-04-15 12:00'},
+        ]))
+
+        self.run_command(path, chunk_size=2)
+
+        newsitems = list(NewsItem.objects.order_by('date'))
+        self.assertEqual([n.title for n in newsitems], ['First', 'Second', 'Third'])
+        self.assertTrue(all(n.live and not n.has_unpublished_changes for n in newsitems))
+        self.assertEqual(sorted(newsitems[0].tags.names()), ['one', 'two words'])
+
+        # Every news item gets its first revision, including its tags
+        revision = newsitems[0].get_latest_revision_as_newsitem()
+        self.assertEqual(revision.title, 'First')
+        self.assertEqual(sorted(revision.tags.names()), ['one', 'two words'])
+
+        # Indexed and signalled a chunk at a time, after everything was created
+        self.assertEqual(self.backend.add_bulk.call_count, 2)
+        self.assertEqual(handler.call_count, 2)
+        self.assertEqual(
+            [n for call in handler.call_args_list for n in call[1]['instances']],
+            newsitems)
+
+    def test_csv_drafts(self):
+        handler = mock.Mock()
+        signals.newsitems_draft_saved.connect(handler, sender=NewsItem)
+        path = self.write('news.csv', 'title,date,tags\nFirst,2017-04-13 12:00,"one, two"\n')
+
+        self.run_command(path, draft=True)
+
+        newsitem = NewsItem.objects.get()
+        self.assertEqual(newsitem.title, 'First')
+        self.assertFalse(newsitem.live)
+        self.assertEqual(sorted(newsitem.tags.names()), ['one', 'two'])
+        handler.assert_called_once()
+
+    def test_invalid_records(self):
+        path = self.write('news.jsonl', '\n'.join([
+            json.dumps({'title': 'Valid', 'date': '2017-04-13 12:00'}),
+            json.dumps({'title': 'x' * 100, 'date': '2017-04-13 12:00'}),
+            json.dumps({'title': 'No date', 'date': 'tomorrow'}),
+            '{not json',
+        ]))
+
+        stderr = self.run_command(path)
+
+        self.assertEqual([n.title for n in NewsItem.objects.all()], ['Valid'])
+        self.assertIn('Line 2: title', stderr)
+        self.assertIn('Line 3: date', stderr)
+        self.assertIn('Line 4: Invalid JSON', stderr)
+
+    def test_without_bulk_insert_pks(self):
+        """Databases that do not return pks from bulk inserts save each news item"""
+        path = self.write('news.jsonl', '\n'.join(json.dumps(record) for record in [
+            {'title': 'First', 'date': '2017-04-13 12:00', 'tags': ['one']},
+            {'title': 'Second', 'date': '2017-04-14 12:00', 'tags': ['two']},
+        ]))
+        backend = mock.Mock()
+        with mock.patch.object(
+                type(connection.features), 'can_return_rows_from_bulk_insert', False), \
+                mock.patch('wagtail.search.index.get_search_backends_with_name',
+                           return_value=[('default', backend)]):
+            self.run_command(path)
+
+        # Only indexed once all the news items are imported
+        backend.add.assert_not_called()
+        self.assertEqual(self.backend.add_bulk.call_count, 1)
+        newsitems = list(NewsItem.objects.order_by('date'))
+        self.assertEqual([list(n.tags.names()) for n in newsitems], [['one'], ['two']])
+        self.assertEqual(
+            [n.get_latest_revision_as_newsitem().title for n in newsitems],
+            ['First', 'Second'])
+
+    def test_scheduled_not_signalled(self):
+        handler = mock.Mock()
+        signals.newsitems_published.connect(handler, sender=NewsItem)
+        future = (timezone.now() + datetime.timedelta(days=1)).strftime('%Y-%m-%d %H:%M')
+        path = self.write('news.jsonl', '\n'.join(json.dumps(record) for record in [
+            {'title': 'Now', 'date': '2017-04-13 12:00'},
+            {'title': 'Later', 'date': future},
+        ]))
+        self.run_command(path)
+
+        later = NewsItem.objects.get(title='Later')
+        self.assertFalse(later.live)
+        self.assertIsNotNone(later.go_live_at)
+        handler.assert_called_once()
+        self.assertEqual(
+            [n.title for n in handler.call_args[1]['instances']], ['Now'])
+
+    def test_query_count(self):
+        """Importing more news items does not take more queries for each chunk"""
+        def import_newsitems(count):
+            path = self.write('news.jsonl', '\n'.join(
+                json.dumps({'title': str(i), 'date': '2017-04-13 12:00'})
+                for i in range(count)))
+            with CaptureQueriesContext(connection) as context:
+                self.run_command(path, chunk_size=100)
+            return len(context.captured_queries)
+
+        self.assertEqual(import_newsitems(1), import_newsitems(20))
+
+
+class TestExportNews(TestCase):
+    def setUp(self):
+        super(TestExportNews, self).setUp()
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+        self.other_index = root_page.add_child(instance=NewsIndex(title='Other'))
+        self.newsitems = [
+            NewsItem.objects.create(newsindex=self.index, title=str(i))
+            for i in range(3)]
+        self.other = NewsItem.objects.create(newsindex=self.other_index, title='Other')
+
+    def run_command(self, **options):
+        stdout = StringIO()
+        call_command('export_news', 'app.NewsItem', stdout=stdout, **options)
+        return stdout.getvalue()
+
+    def test_jsonl(self):
+        rows = [json.loads(line) for line in self.run_command().splitlines()]
+        self.assertEqual(
+            [row['id'] for row in rows],
+            [newsitem.pk for newsitem in self.newsitems + [self.other]])
+        self.assertEqual(rows[0]['title'], '0')
+        self.assertEqual(rows[0]['newsindex_id'], self.index.pk)
+        self.assertNotIn('latest_revision', rows[0])
+
+    def test_revisions(self):
+        newsitem = self.newsitems[0]
+        newsitem.title = 'Draft'
+        newsitem.save_revision()
+
+        rows = [
+            json.loads(line)
+            for line in self.run_command(revisions=True, index=self.index.pk).splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]['title'], '0')
+        self.assertEqual(rows[0]['latest_revision']['title'], 'Draft')
+        self.assertIsNone(rows[1]['latest_revision'])
+
+    def test_csv(self):
+        lines = self.run_command(format='csv').splitlines()
+        self.assertTrue(lines[0].startswith('id,newsindex_id,'))
+        self.assertEqual(len(lines), 5)
+
+    def test_query_count(self):
+        with self.assertNumQueries(1):
+            self.run_command(revisions=True, chunk_size=2)
+
+    def test_not_a_news_item(self):
+        with self.assertRaises(CommandError):
+            call_command('export_news', 'wagtailcore.Page', stdout=StringIO())
+
+
+class TestPublishScheduledNews(TestCase):
+    def setUp(self):
+        super(TestPublishScheduledNews, self).setUp()
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+        self.future = timezone.now() + datetime.timedelta(hours=1)
+
+    def test_publish_future_newsitem(self):
+        newsitem = NewsItem.objects.create(
+            newsindex=self.index, title='Future', date=self.future)
+        self.assertFalse(newsitem.live)
+        self.assertEqual(newsitem.go_live_at, self.future)
+        self.assertEqual(newsitem.status_string, 'scheduled')
+        self.assertEqual(list(self.index.get_newsitems_for_display()), [])
+
+    def test_publish_scheduled(self):
+        handler = mock.Mock()
+        signals.newsitems_published.connect(handler, sender=NewsItem)
+        due = NewsItem.objects.create(newsindex=self.index, title='Due', date=self.future)
+        later = NewsItem.objects.create(newsindex=self.index, title='Later', date=self.future)
+        NewsItem.objects.filter(pk=due.pk).update(
+            go_live_at=timezone.now() - datetime.timedelta(minutes=1))
+
+        call_command('publish_scheduled_news', stdout=StringIO())
+
+        due.refresh_from_db()
+        self.assertTrue(due.live)
+        self.assertIsNone(due.go_live_at)
+        self.assertFalse(NewsItem.objects.get(pk=later.pk).live)
+        self.assertEqual(list(self.index.get_newsitems_for_display()), [due])
+        handler.assert_called_once_with(
+            sender=NewsItem, signal=signals.newsitems_published, instances=[due])
+
+    def test_unpublish_scheduled(self):
+        newsitem = NewsItem.objects.create(
+            newsindex=self.index, title='Future', date=self.future)
+        newsitem.unpublish()
+        NewsItem.objects.update(date=timezone.now())
+
+        call_command('publish_scheduled_news', stdout=StringIO())
+        self.assertFalse(NewsItem.objects.get().live)
+
+    def test_publish_past_date(self):
+        newsitem = NewsItem.objects.create(
+            newsindex=self.index, title='Future', date=self.future)
+        newsitem.date = timezone.now()
+        newsitem.live = True
+        newsitem.save()
+        self.assertTrue(newsitem.live)
+        self.assertIsNone(NewsItem.objects.get().go_live_at)
+
+    def test_schedule_existing(self):
+        NewsItem.objects.create(newsindex=self.index, title='Future')
+        NewsItem.objects.update(date=self.future)
+
+        call_command('publish_scheduled_news', schedule_existing=True, stdout=StringIO())
+
+        newsitem = NewsItem.objects.get()
+        self.assertFalse(newsitem.live)
+        self.assertEqual(newsitem.go_live_at, self.future)
@@ -1,7 +1,12 @@
+import datetime
+import json
 from unittest.mock import MagicMock
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from wagtail.models import Page
 from wagtail.test.utils import WagtailTestUtils
 
@@ -118,6 +123,29 @@ class TestCreateNewsItem(TestCase, WagtailTestUtils):
             created=True,
         )
 
+    def test_create_newsitem_scheduled(self):
+        """Publishing a news item dated in the future schedules it"""
+        handler = MagicMock()
+        signals.newsitem_published.connect(handler, sender=NewsItem)
+
+        response = self.client.post(
+            reverse("wagtailnews:create", kwargs={"pk": self.index.pk}),
+            {
+                "title": "test title",
+                "tags": "",
+                "date": "2099-11-03 17:12",
+                "action-publish": "publish",
+            },
+            follow=True,
+        )
+
+        newsitem = NewsItem.objects.get()
+        self.assertFalse(newsitem.live)
+        self.assertEqual(newsitem.go_live_at, newsitem.date)
+        handler.assert_not_called()
+        self.assertContains(
+            response, "The news post &quot;test title&quot; has been scheduled")
+
 
 class TestEditNewsItem(TestCase, WagtailTestUtils):
     def setUp(self):
@@ -172,6 +200,39 @@ class TestEditNewsItem(TestCase, WagtailTestUtils):
             created=False,
         )
 
+    def test_publish_changes_scheduled(self):
+        """Publishing a future date takes a live news item off the site"""
+        published = MagicMock()
+        unpublished = MagicMock()
+        signals.newsitem_published.connect(published, sender=NewsItem)
+        signals.newsitem_unpublished.connect(unpublished, sender=NewsItem)
+
+        response = self.client.post(
+            reverse(
+                "wagtailnews:edit",
+                kwargs={"pk": self.index.pk, "newsitem_pk": self.newsitem.pk},
+            ),
+            {
+                "title": "updated title",
+                "tags": "",
+                "date": "2099-11-03 17:12",
+                "action-publish": "publish",
+            },
+            follow=True,
+        )
+
+        newsitem = NewsItem.objects.get()
+        self.assertFalse(newsitem.live)
+        self.assertEqual(newsitem.go_live_at, newsitem.date)
+        published.assert_not_called()
+        unpublished.assert_called_once_with(
+            sender=NewsItem, signal=signals.newsitem_unpublished, instance=newsitem
+        )
+        self.assertContains(
+            response,
+            "Your changes to &quot;updated title&quot; have been scheduled",
+        )
+
     def test_save_draft_changes(self):
         handler = MagicMock()
         signals.newsitem_draft_saved.connect(handler, sender=NewsItem)
@@ -263,6 +324,210 @@ class TestEditNewsItem(TestCase, WagtailTestUtils):
         )
 
 
+class TestBulkActions(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super().setUp()
+        self.login()
+        root_page = Page.objects.get(pk=2)
+        self.index = NewsIndex(title="News", slug="news")
+        root_page.add_child(instance=self.index)
+        self.newsitems = [
+            NewsItem.objects.create(
+                newsindex=self.index, title="post {}".format(i), live=False
+            )
+            for i in range(3)
+        ]
+        self.url = reverse("wagtailnews:bulk_action", kwargs={"pk": self.index.pk})
+
+    def test_confirm(self):
+        response = self.client.get(
+            self.url,
+            {"action": "delete", "id": [self.newsitems[0].pk, self.newsitems[1].pk]},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "post 0")
+        self.assertContains(response, "post 1")
+        self.assertNotContains(response, "post 2")
+        self.assertEqual(NewsItem.objects.count(), 3)
+
+    def test_listing_has_bulk_actions(self):
+        response = self.client.get(
+            reverse("wagtailnews:index", kwargs={"pk": self.index.pk})
+        )
+        self.assertContains(response, self.url)
+        self.assertContains(response, 'value="publish"')
+
+    def test_publish(self):
+        # A draft with unsaved changes publishes its latest revision
+        newsitem = self.newsitems[0]
+        newsitem.title = "post 0 draft"
+        newsitem.tags.add("draft")
+        newsitem.save_revision()
+
+        handler = MagicMock()
+        signals.newsitems_published.connect(handler, sender=NewsItem)
+
+        response = self.client.post(
+            self.url, {"action": "publish", "id": [item.pk for item in self.newsitems]}
+        )
+        self.assertRedirects(
+            response, reverse("wagtailnews:index", kwargs={"pk": self.index.pk})
+        )
+
+        self.assertEqual(NewsItem.objects.live().count(), 3)
+        newsitem = NewsItem.objects.get(pk=newsitem.pk)
+        self.assertEqual(newsitem.title, "post 0 draft")
+        self.assertFalse(newsitem.has_unpublished_changes)
+        self.assertEqual(list(newsitem.tags.names()), ["draft"])
+
+        handler.assert_called_once()
+        self.assertEqual(
+            {instance.pk for instance in handler.call_args[1]["instances"]},
+            {item.pk for item in self.newsitems},
+        )
+
+    def test_publish_query_count(self):
+        """Publishing more news items does not take more queries"""
+        for newsitem in self.newsitems:
+            newsitem.tags.add("tag {}".format(newsitem.pk), "shared")
+            newsitem.save_revision()
+
+        def publish(newsitems):
+            NewsItem.objects.update(live=False)
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(
+                    self.url,
+                    {"action": "publish", "id": [item.pk for item in newsitems]},
+                )
+            return len(context.captured_queries)
+
+        publish(self.newsitems)
+        self.assertEqual(publish(self.newsitems[:1]), publish(self.newsitems))
+        self.assertEqual(
+            [sorted(newsitem.tags.names()) for newsitem in NewsItem.objects.order_by("pk")],
+            [sorted(["tag {}".format(newsitem.pk), "shared"]) for newsitem in self.newsitems],
+        )
+
+    def test_publish_scheduled(self):
+        """News items dated in the future are scheduled, not published"""
+        future = self.newsitems[0]
+        future.date = timezone.now() + datetime.timedelta(days=1)
+        future.save()
+        handler = MagicMock()
+        signals.newsitems_published.connect(handler, sender=NewsItem)
+
+        response = self.client.post(
+            self.url,
+            {"action": "publish", "id": [item.pk for item in self.newsitems]},
+            follow=True,
+        )
+
+        future = NewsItem.objects.get(pk=future.pk)
+        self.assertFalse(future.live)
+        self.assertEqual(future.go_live_at, future.date)
+        self.assertEqual(
+            {instance.pk for instance in handler.call_args[1]["instances"]},
+            {self.newsitems[1].pk, self.newsitems[2].pk},
+        )
+        self.assertContains(response, "2 news posts have been published")
+        self.assertContains(response, "1 news post has been scheduled")
+
+    def test_publish_scheduled_live_newsitem(self):
+        """Live news items scheduled by publishing a future date are unpublished"""
+        NewsItem.objects.update(live=True)
+        newsitem = NewsItem.objects.get(pk=self.newsitems[0].pk)
+        newsitem.date = timezone.now() + datetime.timedelta(days=1)
+        newsitem.save_revision()
+        published = MagicMock()
+        signals.newsitems_published.connect(published, sender=NewsItem)
+        unpublished = MagicMock()
+        signals.newsitems_unpublished.connect(unpublished, sender=NewsItem)
+
+        self.client.post(self.url, {"action": "publish", "id": [newsitem.pk]})
+
+        self.assertFalse(NewsItem.objects.get(pk=newsitem.pk).live)
+        published.assert_not_called()
+        unpublished.assert_called_once()
+        self.assertEqual(
+            [instance.pk for instance in unpublished.call_args[1]["instances"]],
+            [newsitem.pk],
+        )
+
+    def test_unpublish(self):
+        NewsItem.objects.update(live=True)
+        handler = MagicMock()
+        signals.newsitems_unpublished.connect(handler, sender=NewsItem)
+
+        self.client.post(
+            self.url, {"action": "unpublish", "id": [self.newsitems[0].pk]}
+        )
+
+        self.assertEqual(
+            list(NewsItem.objects.filter(live=False)), [self.newsitems[0]]
+        )
+        handler.assert_called_once_with(
+            sender=NewsItem,
+            signal=signals.newsitems_unpublished,
+            instances=[self.newsitems[0]],
+        )
+
+    def test_delete(self):
+        handler = MagicMock()
+        signals.newsitems_deleted.connect(handler, sender=NewsItem)
+
+        self.client.post(
+            self.url, {"action": "delete", "id": [item.pk for item in self.newsitems]}
+        )
+
+        self.assertEqual(NewsItem.objects.count(), 0)
+        self.assertEqual(len(handler.call_args[1]["instances"]), 3)
+
+    def test_other_index_untouched(self):
+        other_index = NewsIndex(title="Other news", slug="other-news")
+        Page.objects.get(pk=2).add_child(instance=other_index)
+        other = NewsItem.objects.create(newsindex=other_index, title="other")
+
+        self.client.post(self.url, {"action": "delete", "id": [other.pk]})
+        self.assertTrue(NewsItem.objects.filter(pk=other.pk).exists())
+
+
+class TestExport(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super().setUp()
+        self.login()
+        root_page = Page.objects.get(pk=2)
+        self.index = NewsIndex(title="News", slug="news")
+        root_page.add_child(instance=self.index)
+        self.newsitem = NewsItem.objects.create(newsindex=self.index, title="Post")
+        self.newsitem.save_revision()
+        self.url = reverse("wagtailnews:export", kwargs={"pk": self.index.pk})
+
+    def test_jsonl(self):
+        response = self.client.get(self.url, {"revisions": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="news.jsonl"', response["Content-Disposition"])
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "Post")
+        self.assertEqual(rows[0]["latest_revision"]["title"], "Post")
+
+    def test_csv(self):
+        response = self.client.get(self.url, {"format": "csv"})
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+
+    def test_unknown_format(self):
+        response = self.client.get(self.url, {"format": "xml"})
+        self.assertEqual(response.status_code, 404)
+
+
 class TestPreviewDraft(TestCase, WagtailTestUtils):
     def setUp(self):
         super().setUp()
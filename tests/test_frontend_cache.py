@@ -0,0 +1,192 @@
+import datetime
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from wagtail.models import Site
+from wagtail.test.utils import WagtailTestUtils
+
+from tests.app.models import NewsIndex, NewsItem
+from wagtailnews import signals
+from wagtailnews.bulk import delete_newsitems, publish_newsitems
+from wagtailnews.frontend_cache import get_newsitem_urls
+
+
+class PurgeHandler(BaseHTTPRequestHandler):
+    def do_PURGE(self):
+        self.server.purged.append("http://{}{}".format(self.headers["Host"], self.path))
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestFrontendCache(TestCase, WagtailTestUtils):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), PurgeHandler)
+        cls.server.purged = []
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.settings = override_settings(WAGTAILFRONTENDCACHE={
+            "default": {
+                "BACKEND": "wagtail.contrib.frontend_cache.backends.HTTPBackend",
+                "LOCATION": "http://127.0.0.1:{}".format(cls.server.server_port),
+            },
+        })
+        cls.settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.server.purged.clear()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.date = timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0))
+        self.newsitem = NewsItem.objects.create(
+            newsindex=self.index, title="A post", date=self.date
+        )
+
+    def get_urls(self, newsitem, date=(2017, 4, 13), slug="a-post"):
+        year, month, day = date
+        index = "http://localhost/news/"
+        return {
+            index,
+            index + "?page=1",
+            index + "rss/",
+            index + "{}/".format(year),
+            index + "{}/?page=1".format(year),
+            index + "{}/{}/".format(year, month),
+            index + "{}/{}/?page=1".format(year, month),
+            index + "{}/{}/{}/".format(year, month, day),
+            index + "{}/{}/{}/?page=1".format(year, month, day),
+            index + "{}/{}/{}/{}-{}/".format(year, month, day, newsitem.pk, slug),
+        }
+
+    def test_newsitem_urls(self):
+        self.assertEqual(get_newsitem_urls([self.newsitem]), self.get_urls(self.newsitem))
+
+    def test_listing_pages(self):
+        NewsItem.objects.bulk_create([
+            NewsItem(newsindex=self.index, title="Post {}".format(i), date=self.date)
+            for i in range(20)
+        ])
+        urls = get_newsitem_urls([self.newsitem])
+        # 21 news items, and room for one more, is two pages
+        self.assertIn("http://localhost/news/?page=2", urls)
+        self.assertIn("http://localhost/news/2017/4/13/?page=2", urls)
+        self.assertNotIn("http://localhost/news/?page=3", urls)
+
+    def test_edit_purges_old_and_new_urls(self):
+        self.login()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "wagtailnews:edit",
+                    kwargs={"pk": self.index.pk, "newsitem_pk": self.newsitem.pk},
+                ),
+                {
+                    "title": "New title",
+                    "tags": "",
+                    "date": "2016-02-01 12:00",
+                    "action-publish": "publish",
+                },
+            )
+
+        self.assertEqual(
+            set(self.server.purged),
+            self.get_urls(self.newsitem) | self.get_urls(
+                self.newsitem, date=(2016, 2, 1), slug="new-title"),
+        )
+
+    def test_unpublish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsitem.unpublish()
+            signals.newsitem_unpublished.send(sender=NewsItem, instance=self.newsitem)
+        self.assertEqual(set(self.server.purged), self.get_urls(self.newsitem))
+
+    def test_delete(self):
+        newsitem = NewsItem.objects.get(pk=self.newsitem.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            newsitem.delete()
+            signals.newsitem_deleted.send(sender=NewsItem, instance=newsitem)
+        self.assertEqual(set(self.server.purged), self.get_urls(self.newsitem))
+
+    def test_bulk_publish(self):
+        self.newsitem.title = "Draft title"
+        self.newsitem.save_revision()
+        other = NewsItem.objects.create(
+            newsindex=self.index, title="Other", date=self.date, live=False
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            published, scheduled, unpublished = publish_newsitems(NewsItem.objects.all())
+            signals.newsitems_published.send(sender=NewsItem, instances=published)
+
+        expected = self.get_urls(self.newsitem)
+        expected |= self.get_urls(self.newsitem, slug="draft-title")
+        expected |= self.get_urls(other, slug="other")
+        self.assertEqual(set(self.server.purged), expected)
+
+    def test_draft_not_purged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newsitem.save_revision()
+            signals.newsitem_draft_saved.send(
+                sender=NewsItem, instance=self.newsitem, created=False)
+        self.assertEqual(self.server.purged, [])
+
+    def test_tag_urls(self):
+        self.newsitem.tags.add("News")
+        self.newsitem.save()
+        urls = get_newsitem_urls([self.newsitem])
+        self.assertEqual(
+            urls - self.get_urls(self.newsitem),
+            {"http://localhost/news/tag/news/", "http://localhost/news/tag/news/?page=1"},
+        )
+
+    def test_delete_tag_urls(self):
+        self.newsitem.tags.add("News")
+        self.newsitem.save()
+        tag_urls = {
+            "http://localhost/news/tag/news/",
+            "http://localhost/news/tag/news/?page=1",
+        }
+        newsitem = NewsItem.objects.get(pk=self.newsitem.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            newsitem.delete()
+            signals.newsitem_deleted.send(sender=NewsItem, instance=newsitem)
+        self.assertEqual(set(self.server.purged), self.get_urls(self.newsitem) | tag_urls)
+
+    def test_bulk_delete_tag_urls(self):
+        self.newsitem.tags.add("News")
+        self.newsitem.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = delete_newsitems(NewsItem.objects.all())
+            signals.newsitems_deleted.send(sender=NewsItem, instances=deleted)
+        self.assertIn("http://localhost/news/tag/news/", self.server.purged)
+
+    def test_bulk_delete_query_count(self):
+        """Deleting more tagged news items does not take more queries"""
+        def delete(count):
+            for i in range(count):
+                newsitem = NewsItem.objects.create(
+                    newsindex=self.index, title="Post {}".format(i), date=self.date)
+                newsitem.tags.add("Tag {}".format(i))
+                newsitem.save()
+            with CaptureQueriesContext(connection) as context:
+                delete_newsitems(NewsItem.objects.all())
+            return len(context.captured_queries)
+
+        self.assertEqual(delete(2), delete(10))
@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from wagtail.models import Page
+from wagtail.test.utils import WagtailTestUtils
+
+from tests.app.models import NewsIndex, NewsItem
+from wagtailnews.indexing import deferred_indexing
+
+
+class MockBackendMixin:
+    def setUp(self):
+        super(MockBackendMixin, self).setUp()
+        self.backend = mock.Mock(catch_indexing_errors=False)
+        backends = [('default', self.backend)]
+        for target in ['wagtail.search.index.get_search_backends_with_name',
+                       'wagtailnews.indexing.get_search_backends_with_name']:
+            patcher = mock.patch(target, return_value=backends)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+        self.backend.reset_mock()
+
+
+class TestDeferredIndexing(MockBackendMixin, TestCase):
+    def test_immediate_without_deferral(self):
+        NewsItem.objects.create(newsindex=self.index, title='Hello')
+        self.assertEqual(self.backend.add.call_count, 1)
+
+    def test_batched_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with deferred_indexing():
+                first = NewsItem.objects.create(newsindex=self.index, title='First')
+                first.title = 'First edited'
+                first.save()
+                second = NewsItem.objects.create(newsindex=self.index, title='Second')
+                second.save(update_fields=['title'])
+                self.backend.add.assert_not_called()
+                self.backend.add_bulk.assert_not_called()
+
+        self.assertEqual(len(callbacks), 1)
+        self.backend.add.assert_not_called()
+        self.backend.add_bulk.assert_called_once()
+        model, objects = self.backend.add_bulk.call_args[0]
+        self.assertIs(model, NewsItem)
+        self.assertCountEqual(objects, [first, second])
+
+    def test_deleted(self):
+        newsitem = NewsItem.objects.create(newsindex=self.index, title='Hello')
+        pk = newsitem.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            with deferred_indexing():
+                newsitem.delete()
+
+        self.backend.add_bulk.assert_not_called()
+        self.backend.delete.assert_called_once()
+        deleted = self.backend.delete.call_args[0][0]
+        self.assertEqual(deleted.pk, pk)
+
+    def test_nested(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with deferred_indexing():
+                NewsItem.objects.create(newsindex=self.index, title='First')
+                with deferred_indexing():
+                    NewsItem.objects.create(newsindex=self.index, title='Second')
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(len(self.backend.add_bulk.call_args[0][1]), 2)
+
+
+class TestPublishIndexing(MockBackendMixin, TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestPublishIndexing, self).setUp()
+        self.login()
+
+    def test_publish_indexes_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('wagtailnews:create', kwargs={'pk': self.index.pk}), {
+                    'title': 'A post',
+                    'date': '2017-08-12 12:00',
+                    'tags': '',
+                    'action-publish': 'publish',
+                })
+        self.assertEqual(response.status_code, 302)
+
+        self.backend.add.assert_not_called()
+        self.backend.add_bulk.assert_called_once_with(
+            NewsItem, [NewsItem.objects.get()])
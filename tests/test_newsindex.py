@@ -1,13 +1,21 @@
 import datetime
+from unittest import mock
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.template import Template, TemplateSyntaxError
+from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
-from wagtail.models import Page
+from django.utils.cache import get_max_age
+from taggit.models import Tag
+from wagtail.models import Page, Site
 from wagtail.test.utils import WagtailTestUtils
 
 from tests.app.models import (
     NewsIndex, NewsItem, SecondaryNewsIndex, SecondaryNewsItem)
+from wagtailnews import signals
 
 
 class TestNewsIndex(TestCase, WagtailTestUtils):
@@ -73,3 +81,316 @@ class TestGetNewsItem(TestCase, WagtailTestUtils):
         NewsIndex.newsitem_model = 'NoSuchModel'
         with self.assertRaises(LookupError):
             NewsIndex.get_newsitem_model()
+
+
+@override_settings(WAGTAILNEWS_CACHE_MAX_AGE=3600)
+class TestCacheHeaders(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestCacheHeaders, self).setUp()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.index = root.add_child(instance=NewsIndex(title='News', slug='news'))
+        self.newsitem = NewsItem.objects.create(newsindex=self.index, title='Now')
+
+    def get_max_age(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return get_max_age(response)
+
+    def test_max_age(self):
+        self.assertEqual(self.get_max_age('/news/'), 3600)
+        self.assertEqual(self.get_max_age('/news/rss/'), 3600)
+
+    def test_capped_by_scheduled_newsitem(self):
+        NewsItem.objects.create(
+            newsindex=self.index, title='Future',
+            date=timezone.now() + datetime.timedelta(minutes=10))
+        year = timezone.localtime(self.newsitem.date).year
+        for url in ['/news/', '/news/{}/'.format(year), '/news/rss/']:
+            max_age = self.get_max_age(url)
+            self.assertGreater(max_age, 500)
+            self.assertLessEqual(max_age, 600)
+
+    def test_overdue_scheduled_newsitem(self):
+        """Nothing is cached until publish_scheduled_news catches up"""
+        NewsItem.objects.create(
+            newsindex=self.index, title='Future',
+            date=timezone.now() + datetime.timedelta(minutes=10))
+        NewsItem.objects.update(go_live_at=timezone.now() - datetime.timedelta(minutes=1))
+        self.assertEqual(self.get_max_age('/news/'), 0)
+
+    def test_other_index_ignored(self):
+        other = Page.objects.get(pk=2).add_child(
+            instance=NewsIndex(title='Other', slug='other'))
+        NewsItem.objects.create(
+            newsindex=other, title='Future',
+            date=timezone.now() + datetime.timedelta(minutes=10))
+        self.assertEqual(self.get_max_age('/news/'), 3600)
+
+    def test_get_cache_timeout(self):
+        self.assertIsNone(self.index.get_cache_timeout())
+        NewsItem.objects.create(
+            newsindex=self.index, title='Future',
+            date=timezone.now() + datetime.timedelta(minutes=10))
+        with self.assertNumQueries(1):
+            self.assertLessEqual(self.index.get_cache_timeout(), 600)
+        self.assertEqual(self.index.get_cache_timeout(60), 60)
+
+    @override_settings(WAGTAILNEWS_CACHE_MAX_AGE=None)
+    def test_no_setting(self):
+        response = self.client.get('/news/')
+        self.assertNotIn('Cache-Control', response)
+
+
+class TestListing(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestListing, self).setUp()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.index = root.add_child(instance=NewsIndex(title='News', slug='news'))
+        date = timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0))
+        for i in range(3):
+            newsitem = NewsItem.objects.create(
+                newsindex=self.index, title='Post {}'.format(i), date=date)
+            newsitem.tags.add('tag {}'.format(i))
+            newsitem.save()
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_defaults_fetch_everything(self):
+        newsitems = self.index.get_listing_newsitems(self.index.get_newsitems())
+        self.assertEqual(newsitems.query.deferred_loading, (frozenset(), True))
+        self.assertEqual(newsitems._prefetch_related_lookups, ())
+
+    def test_listing_hooks(self):
+        with mock.patch.multiple(
+            NewsIndex,
+            listing_fields=['title'],
+            listing_select_related=['page'],
+            listing_prefetch=['tags'],
+        ):
+            newsitems = list(self.index.get_listing_newsitems(self.index.get_newsitems()))
+
+        self.assertEqual(
+            newsitems[0].get_deferred_fields(),
+            {'has_unpublished_changes', 'go_live_at', 'teaser', 'excerpt'},
+        )
+        tags = [[tag] for tag in Tag.objects.order_by('name')]
+        with self.assertNumQueries(0):
+            self.assertEqual([n.title for n in newsitems], ['Post 0', 'Post 1', 'Post 2'])
+            self.assertEqual([n.page for n in newsitems], [None, None, None])
+            self.assertEqual([list(n.tags.all()) for n in newsitems], tags)
+            [n.get_cache_version() for n in newsitems]
+
+    def test_urls_without_a_query_per_newsitem(self):
+        for url in ['/news/', '/news/2017/', '/news/2017/4/', '/news/2017/4/13/']:
+            count = self.count_queries(url)
+            NewsItem.objects.create(
+                newsindex=self.index, title='Another',
+                date=timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0)))
+            self.assertEqual(self.count_queries(url), count, url)
+
+
+class TestEmptyArchives(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestEmptyArchives, self).setUp()
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.index = root.add_child(instance=NewsIndex(title='News', slug='news'))
+        date = timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0))
+        for i in range(3):
+            NewsItem.objects.create(
+                newsindex=self.index, title='Post {}'.format(i), date=date)
+        NewsItem.objects.create(
+            newsindex=self.index, title='Draft', date=date + datetime.timedelta(days=1),
+            live=False)
+
+    def get_listing_queries(self, url, status):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status, url)
+        return [q for q in queries if 'app_newsitem' in q['sql']]
+
+    def test_get_archive_counts(self):
+        with self.assertNumQueries(1):
+            counts = self.index.get_archive_counts()
+        self.assertEqual(counts, {datetime.date(2017, 4, 13): 3})
+
+    def test_rendered_by_default(self):
+        self.assertEqual(self.client.get('/news/2003/2/17/').status_code, 200)
+
+    @override_settings(WAGTAILNEWS_CACHE_TIMEOUT=60)
+    @mock.patch.object(NewsIndex, 'empty_archives', '404')
+    def test_404(self):
+        for url in ['/news/2017/', '/news/2017/4/', '/news/2017/4/13/']:
+            self.get_listing_queries(url, 200)
+        for url in ['/news/2003/', '/news/2017/3/', '/news/2017/4/14/']:
+            self.assertEqual(self.get_listing_queries(url, 404), [], url)
+
+    @override_settings(WAGTAILNEWS_CACHE_TIMEOUT=60)
+    @mock.patch.object(NewsIndex, 'empty_archives', 'cache')
+    def test_cached_empty_response(self):
+        response = self.client.get('/news/2003/2/17/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['date'], datetime.date(2003, 2, 17))
+        self.assertEqual(list(response.context['newsitem_list']), [])
+
+        with mock.patch.object(NewsIndex, 'get_template') as get_template:
+            cached = self.client.get('/news/2003/2/17/')
+        get_template.assert_not_called()
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(self.get_listing_queries('/news/2003/2/17/', 200), [])
+
+        newsitem = NewsItem.objects.create(
+            newsindex=self.index, title='Old news',
+            date=timezone.make_aware(datetime.datetime(2003, 2, 17, 12, 0, 0)))
+        with self.captureOnCommitCallbacks(execute=True):
+            signals.newsitem_published.send(
+                sender=NewsItem, instance=newsitem, created=True)
+        self.assertContains(self.client.get('/news/2003/2/17/'), 'Old news')
+
+
+@mock.patch.object(
+    NewsIndex, 'get_template', return_value='app/news_index_stream.html')
+class TestStreaming(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestStreaming, self).setUp()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.index = root.add_child(instance=NewsIndex(title='News', slug='news'))
+        date = timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0))
+        self.newsitems = [
+            NewsItem.objects.create(
+                newsindex=self.index, title='Post {}'.format(i),
+                date=date - datetime.timedelta(hours=i))
+            for i in range(5)
+        ]
+
+    def test_not_streamed_by_default(self, get_template):
+        response = self.client.get('/news/2017/')
+        self.assertFalse(response.streaming)
+        self.assertContains(response, '<h1>Post 4</h1>')
+
+    def test_streamed(self, get_template):
+        normal = self.client.get('/news/2017/').content.decode()
+
+        with mock.patch.multiple(NewsIndex, listing_stream=True, listing_stream_chunk_size=2):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/news/2017/')
+            self.assertTrue(response.streaming)
+            # Only the news items are counted before the response is sent
+            self.assertEqual(
+                len([q for q in queries if 'app_newsitem' in q['sql']]), 1)
+
+            with CaptureQueriesContext(connection) as queries:
+                chunks = [chunk.decode() for chunk in response.streaming_content]
+
+        # The head, three chunks of news items, and the tail
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(chunks[0], '<header>News</header>\n')
+        self.assertEqual(chunks[1].count('<h1>'), 2)
+        self.assertEqual(chunks[-1], '<footer>1 of 1</footer>\n')
+        self.assertEqual(''.join(chunks), normal)
+        # One query for the news items, and none for their URLs
+        self.assertEqual(len([q for q in queries if 'app_newsitem' in q['sql']]), 1)
+        self.assertEqual(
+            len([q for q in queries if 'wagtailcore_page' in q['sql']]), 0)
+
+    def test_stream_argument(self, get_template):
+        request = RequestFactory().get('/')
+        newsitems = self.index.get_newsitems_for_display()
+        response = self.index.respond(request, 'all', newsitems, stream=True)
+        self.assertTrue(response.streaming)
+        with mock.patch.object(NewsIndex, 'listing_stream', True):
+            response = self.index.respond(request, 'all', newsitems, stream=False)
+        self.assertFalse(response.streaming)
+
+    def test_syntax_error(self, get_template):
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                '{% load wagtailnews_tags %}'
+                '{% stream_newsitems newsitem_list %}{% endstream_newsitems %}')
+
+    def test_template_without_stream_tag(self, get_template):
+        get_template.return_value = 'app/news_index.html'
+        with mock.patch.object(NewsIndex, 'listing_stream', True):
+            response = self.client.get('/news/')
+            self.assertIn(b'<h1>Post 4</h1>', b''.join(response.streaming_content))
+
+
+class TestTagArchive(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestTagArchive, self).setUp()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.index = root.add_child(instance=NewsIndex(title='News', slug='news'))
+        self.other_index = root.add_child(instance=NewsIndex(title='Other', slug='other'))
+        self.newsitems = [
+            self.make_newsitem(self.index, 'Both', ['Apple', 'Banana']),
+            self.make_newsitem(self.index, 'Banana', ['Banana']),
+            self.make_newsitem(self.index, 'Draft', ['Apple', 'Banana'], live=False),
+            self.make_newsitem(self.other_index, 'Other', ['Apple', 'Cherry']),
+        ]
+
+    def make_newsitem(self, index, title, tags, live=True):
+        newsitem = NewsItem(newsindex=index, title=title, live=live)
+        newsitem.tags.add(*tags)
+        newsitem.save()
+        return newsitem
+
+    def test_tag_route(self):
+        response = self.client.get('/news/tag/banana/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['newsitem_view'], 'tag')
+        self.assertEqual(response.context['tag'].name, 'Banana')
+        self.assertEqual(
+            set(response.context['newsitem_list']),
+            {self.newsitems[0], self.newsitems[1]})
+        self.assertEqual(
+            self.index.reverse_subpage('tag', args=['banana']), 'tag/banana/')
+
+    def test_tag_route_unused_tag(self):
+        response = self.client.get('/news/tag/cherry/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['newsitem_list']), [])
+
+    def test_tag_route_unknown_tag(self):
+        self.assertEqual(self.client.get('/news/tag/durian/').status_code, 404)
+
+    def test_tag_route_untagged_model(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        root.add_child(instance=SecondaryNewsIndex(title='Secondary', slug='secondary'))
+        self.assertEqual(self.client.get('/secondary/tag/banana/').status_code, 404)
+
+    def test_tag_filter_skips_tags_table(self):
+        tag = Tag.objects.get(slug='banana')
+        newsitems = self.index.get_newsitems().filter(tags=tag)
+        self.assertNotIn('taggit_tag', str(newsitems.query))
+
+    def test_get_tag_counts(self):
+        with self.assertNumQueries(1):
+            tags = self.index.get_tag_counts()
+        self.assertEqual(
+            [(tag.name, tag.newsitem_count) for tag in tags],
+            [('Banana', 2), ('Apple', 1)])
+        self.assertEqual(
+            [(tag.name, tag.newsitem_count) for tag in self.other_index.get_tag_counts()],
+            [('Apple', 1), ('Cherry', 1)])
+
+    def test_get_tag_counts_untagged_model(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        index = root.add_child(instance=SecondaryNewsIndex(title='Secondary'))
+        self.assertEqual(index.get_tag_counts(), [])
+
+    @override_settings(WAGTAILNEWS_CACHE_TIMEOUT=60)
+    def test_get_tag_counts_cached(self):
+        cache.clear()
+        self.index.get_tag_counts()
+        with self.assertNumQueries(0):
+            self.index.get_tag_counts()
+
+        newsitem = self.make_newsitem(self.index, 'Cherry', ['Cherry'])
+        with self.captureOnCommitCallbacks(execute=True):
+            signals.newsitem_published.send(
+                sender=NewsItem, instance=newsitem, created=True)
+        self.assertIn('Cherry', [tag.name for tag in self.index.get_tag_counts()])
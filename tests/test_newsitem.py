@@ -3,13 +3,17 @@ from __future__ import absolute_import, unicode_literals
 
 import datetime
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from urllib.parse import quote
 from wagtail.models import Site
 from wagtail.test.utils import WagtailTestUtils
 
 from tests.app.models import NewsIndex, NewsItem
+from wagtailnews import signals
+from wagtailnews.bulk import publish_newsitems
+from wagtailnews.feeds import LatestEntriesFeed
 
 
 class TestNewsItem(TestCase, WagtailTestUtils):
@@ -65,3 +69,131 @@ class TestNewsItem(TestCase, WagtailTestUtils):
             quote("/news/2017/4/13/{}-你好世界/".format(self.newsitem.pk)),
         )
         self.assertEqual(response.redirect_chain, [(self.newsitem.url(), 301)])
+
+
+class TestTeaser(TestCase):
+    def setUp(self):
+        super(TestTeaser, self).setUp()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = NewsIndex(title="News", slug="news")
+        root_page.add_child(instance=self.index)
+        self.newsitem = NewsItem.objects.create(newsindex=self.index, title="A post")
+
+    def test_rendered_on_save(self):
+        newsitem = NewsItem.objects.only("teaser", "excerpt").get()
+        self.assertEqual(newsitem.teaser, "<p><b>A post</b> </p>")
+        self.assertEqual(newsitem.excerpt, "A post")
+
+    def test_not_rendered_on_partial_save(self):
+        self.newsitem.title = "Changed"
+        self.newsitem.save(update_fields=["title"])
+        self.assertEqual(NewsItem.objects.get().teaser, "<p><b>A post</b> </p>")
+
+    def test_excerpt_length(self):
+        self.newsitem.excerpt_length = 2
+        self.assertEqual(self.newsitem.render_excerpt("<p>One <b>two</b> three</p>"), "One two…")
+
+    def test_bulk_publish(self):
+        self.newsitem.title = "Draft"
+        self.newsitem.tags.add("news")
+        self.newsitem.save_revision()
+        self.assertEqual(NewsItem.objects.get().teaser, "<p><b>A post</b> </p>")
+
+        publish_newsitems(NewsItem.objects.all())
+        newsitem = NewsItem.objects.get()
+        self.assertEqual(newsitem.teaser, "<p><b>Draft</b> news</p>")
+        self.assertEqual(newsitem.excerpt, "Draft news")
+
+    def test_feed_description(self):
+        feed = LatestEntriesFeed(self.index)
+        self.assertEqual(feed.item_description(self.newsitem), "<p><b>A post</b> </p>")
+        self.newsitem.teaser = ""
+        self.assertEqual(feed.item_description(self.newsitem), "A post")
+
+
+class TestNavigation(TestCase):
+    def setUp(self):
+        super(TestNavigation, self).setUp()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.other_index = root_page.add_child(
+            instance=NewsIndex(title="Other", slug="other"))
+
+    def make_newsitem(self, title, day, tags=(), index=None, live=True):
+        newsitem = NewsItem(
+            newsindex=index or self.index,
+            title=title,
+            date=timezone.make_aware(datetime.datetime(2017, 4, day, 12, 0, 0)),
+            live=live,
+        )
+        newsitem.tags.add(*tags)
+        newsitem.save()
+        return newsitem
+
+    def test_previous_next(self):
+        first = self.make_newsitem("First", 1)
+        # Same date, ordered by pk
+        second = self.make_newsitem("Second", 2)
+        third = self.make_newsitem("Third", 2)
+        self.make_newsitem("Draft", 3, live=False)
+        self.make_newsitem("Other index", 3, index=self.other_index)
+        fourth = self.make_newsitem("Fourth", 4)
+
+        self.assertIsNone(first.get_previous())
+        self.assertEqual(first.get_next(), second)
+        self.assertEqual(second.get_previous(), first)
+        self.assertEqual(second.get_next(), third)
+        self.assertEqual(third.get_previous(), second)
+        self.assertEqual(third.get_next(), fourth)
+        self.assertIsNone(fourth.get_next())
+
+    def test_previous_url_without_extra_queries(self):
+        first = self.make_newsitem("First", 1)
+        second = self.make_newsitem("Second", 2)
+        second = NewsItem.objects.select_related("newsindex").get(pk=second.pk)
+        second.newsindex.specific
+        with self.assertNumQueries(1):
+            previous = second.get_previous()
+            self.assertEqual(previous.url, first.url)
+
+    def test_get_related(self):
+        newsitem = self.make_newsitem("Post", 5, ["a", "b", "c"])
+        one = self.make_newsitem("One", 1, ["a"])
+        two = self.make_newsitem("Two", 2, ["a", "b"])
+        newer_one = self.make_newsitem("Newer one", 3, ["c"])
+        self.make_newsitem("Unrelated", 4, ["d"])
+        self.make_newsitem("Draft", 4, ["a", "b", "c"], live=False)
+        self.make_newsitem("Other index", 4, ["a", "b", "c"], index=self.other_index)
+
+        related = newsitem.get_related()
+        self.assertEqual(related, [two, newer_one, one])
+        self.assertEqual([n.shared_tags for n in related], [2, 1, 1])
+        self.assertEqual(newsitem.get_related(1), [two])
+
+    def test_get_related_query_count(self):
+        newsitem = self.make_newsitem("Post", 5, ["a", "b"])
+        for i in range(3):
+            self.make_newsitem("Post {}".format(i), i + 1, ["a", "b"])
+        newsitem.newsindex.specific
+        with self.assertNumQueries(1):
+            related = newsitem.get_related()
+            [n.url for n in related]
+
+    def test_get_related_untagged(self):
+        newsitem = self.make_newsitem("Post", 5)
+        self.make_newsitem("Other", 4, ["a"])
+        self.assertEqual(newsitem.get_related(), [])
+
+    @override_settings(WAGTAILNEWS_CACHE_TIMEOUT=60)
+    def test_get_related_cached(self):
+        cache.clear()
+        newsitem = self.make_newsitem("Post", 5, ["a"])
+        one = self.make_newsitem("One", 1, ["a"])
+        self.assertEqual(newsitem.get_related(), [one])
+
+        two = self.make_newsitem("Two", 2, ["a"])
+        self.assertEqual(newsitem.get_related(), [one])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            signals.newsitem_published.send(sender=NewsItem, instance=two, created=True)
+        self.assertEqual(newsitem.get_related(), [two, one])
@@ -1,12 +1,13 @@
 from functools import wraps
 
 from django.contrib.auth.models import Group, Permission, User
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from wagtail.models import GroupPagePermission, Page
 from wagtail.test.utils import WagtailTestUtils
 
 from tests.app.models import NewsIndex, NewsItem, SecondaryNewsIndex
+from wagtailnews.permissions import get_permitted_page_paths
 
 
 def p(permission_string):
@@ -318,6 +319,57 @@ class TestDeleteNewsItem(WithNewsItemTestCase, PermissionTestCase):
         self.assertNotContains(response, self.url)
 
 
+class TestBulkActions(WithNewsItemTestCase, PermissionTestCase):
+    def setUp(self):
+        super(TestBulkActions, self).setUp()
+        self.url = reverse("wagtailnews:bulk_action", kwargs={"pk": self.index.pk})
+
+    def post(self, action):
+        return self.client.post(self.url, {"action": action, "id": [self.newsitem.pk]})
+
+    @grant_permissions(["app.change_newsitem"])
+    def test_unpublish_permission(self):
+        """Test users with change permission can unpublish in bulk"""
+        self.post("unpublish")
+        self.assertFalse(NewsItem.objects.get().live)
+
+    @grant_permissions(["app.change_newsitem"])
+    def test_no_delete_permission(self):
+        """Test users can not delete in bulk without delete permission"""
+        self.assertEqual(self.post("delete").status_code, 302)
+        self.assertTrue(NewsItem.objects.exists())
+
+    @grant_permissions(["app.delete_newsitem"])
+    def test_no_change_permission(self):
+        """Test users can not unpublish in bulk without change permission"""
+        self.post("unpublish")
+        self.assertTrue(NewsItem.objects.get().live)
+
+    @grant_permissions(["app.delete_newsitem"])
+    def test_bulk_buttons(self):
+        """Test that only the permitted bulk actions appear on the index page"""
+        response = self.client.get(
+            reverse("wagtailnews:index", kwargs={"pk": self.index.pk})
+        )
+        self.assertContains(response, 'value="delete"')
+        self.assertNotContains(response, 'value="publish"')
+
+
+class TestExport(WithNewsItemTestCase, PermissionTestCase):
+    def setUp(self):
+        super(TestExport, self).setUp()
+        self.url = reverse("wagtailnews:export", kwargs={"pk": self.index.pk})
+
+    @grant_permissions(["app.change_newsitem"])
+    def test_has_permission(self):
+        """Test users with change permission can export news items"""
+        self.assertStatusCode(self.url, 200)
+
+    def test_no_permission(self):
+        """Test users can not export news items without change permission"""
+        self.assertStatusCode(self.url, 302)
+
+
 class TestSearchNewsItem(WithNewsItemTestCase, PermissionTestCase):
     def setUp(self):
         super(TestSearchNewsItem, self).setUp()
@@ -340,3 +392,131 @@ class TestSearchNewsItem(WithNewsItemTestCase, PermissionTestCase):
         response = self.client.get(self.search_url)
         self.assertNotContains(response, "News")
         self.assertNotContains(response, self.url)
+
+
+@override_settings(WAGTAILNEWS_INDEX_PERMISSIONS=True)
+class TestNewsIndexPagePermissions(PermissionTestCase):
+    def setUp(self):
+        super(TestNewsIndexPagePermissions, self).setUp()
+        root_page = Page.objects.get(pk=2)
+        self.news1 = root_page.add_child(
+            instance=NewsIndex(title="Department 1", slug="dept-1")
+        )
+        self.news2 = root_page.add_child(
+            instance=NewsIndex(title="Department 2", slug="dept-2")
+        )
+        self.other_news = root_page.add_child(
+            instance=NewsIndex(title="Other department", slug="other")
+        )
+
+        # Only grant page permissions on the first two news indexes
+        GroupPagePermission.objects.filter(group=self.group).delete()
+        GroupPagePermission.objects.create(
+            group=self.group, page=self.news1, permission_type="change"
+        )
+        GroupPagePermission.objects.create(
+            group=self.group, page=self.news2, permission_type="publish"
+        )
+
+    @grant_permissions(["app.add_newsitem", "app.change_newsitem"])
+    def test_chooser(self):
+        response = self.client.get(reverse("wagtailnews:choose"))
+        self.assertContains(response, self.news1.title)
+        self.assertContains(response, self.news2.title)
+        self.assertNotContains(response, self.other_news.title)
+
+    @grant_permissions(["app.add_newsitem", "app.change_newsitem"])
+    def test_news_index(self):
+        self.assertStatusCode(
+            reverse("wagtailnews:index", kwargs={"pk": self.news1.pk}), 200
+        )
+        self.assertStatusCode(
+            reverse("wagtailnews:index", kwargs={"pk": self.other_news.pk}), 302
+        )
+
+    @grant_permissions(["app.add_newsitem", "app.change_newsitem"])
+    def test_create(self):
+        self.assertStatusCode(
+            reverse("wagtailnews:create", kwargs={"pk": self.news2.pk}), 200
+        )
+        self.assertStatusCode(
+            reverse("wagtailnews:create", kwargs={"pk": self.other_news.pk}), 302
+        )
+
+    @grant_permissions(["app.change_newsitem"])
+    def test_edit(self):
+        newsitem = NewsItem.objects.create(newsindex=self.other_news, title="Other")
+        self.assertStatusCode(
+            reverse(
+                "wagtailnews:edit",
+                kwargs={"pk": self.other_news.pk, "newsitem_pk": newsitem.pk},
+            ),
+            302,
+        )
+
+    @grant_permissions(["app.change_newsitem"])
+    def test_edit_newsitem_of_other_index(self):
+        """Test news items can not be reached through a permitted news index"""
+        newsitem = NewsItem.objects.create(newsindex=self.other_news, title="Other")
+        kwargs = {"pk": self.news1.pk, "newsitem_pk": newsitem.pk}
+        self.assertStatusCode(reverse("wagtailnews:edit", kwargs=kwargs), 404)
+        response = self.client.post(
+            reverse("wagtailnews:edit", kwargs=kwargs),
+            {"title": "Changed", "date": "2017-04-13 12:00", "action-publish": "publish"},
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(NewsItem.objects.get(pk=newsitem.pk).title, "Other")
+        self.assertStatusCode(reverse("wagtailnews:view_draft", kwargs=kwargs), 404)
+
+    @grant_permissions(["app.change_newsitem"])
+    def test_view_draft(self):
+        newsitem = NewsItem.objects.create(newsindex=self.news1, title="Mine")
+        self.assertStatusCode(
+            reverse(
+                "wagtailnews:view_draft",
+                kwargs={"pk": self.news1.pk, "newsitem_pk": newsitem.pk},
+            ),
+            200,
+        )
+        newsitem = NewsItem.objects.create(newsindex=self.other_news, title="Other")
+        self.assertStatusCode(
+            reverse(
+                "wagtailnews:view_draft",
+                kwargs={"pk": self.other_news.pk, "newsitem_pk": newsitem.pk},
+            ),
+            302,
+        )
+
+    @grant_permissions(["app.add_newsitem", "app.change_newsitem"])
+    def test_preview(self):
+        newsitem = NewsItem.objects.create(newsindex=self.other_news, title="Other")
+        self.assertStatusCode(
+            reverse(
+                "wagtailnews:preview_on_edit",
+                kwargs={"index_pk": self.other_news.pk, "newsitem_pk": newsitem.pk},
+            ),
+            302,
+        )
+        self.assertStatusCode(
+            reverse("wagtailnews:preview_on_create", kwargs={"index_pk": self.other_news.pk}),
+            302,
+        )
+
+    def test_model_permission_still_required(self):
+        self.assertStatusCode(
+            reverse("wagtailnews:index", kwargs={"pk": self.news1.pk}), 302
+        )
+
+    def test_page_paths_evaluated_once(self):
+        with self.assertNumQueries(1):
+            paths = get_permitted_page_paths(self.user)
+            self.assertEqual(get_permitted_page_paths(self.user), paths)
+        self.assertCountEqual(paths, [self.news1.path, self.news2.path])
+
+    def test_superuser(self):
+        superuser = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password"
+        )
+        self.client.force_login(superuser)
+        response = self.client.get(reverse("wagtailnews:choose"))
+        self.assertContains(response, self.other_news.title)
@@ -0,0 +1,106 @@
+import datetime
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from wagtail.models import Site
+from wagtail.test.utils import WagtailTestUtils
+
+from tests.app.models import NewsIndex, NewsItem
+from wagtailnews import replica
+
+
+@override_settings(WAGTAILNEWS_REPLICA_DATABASE="replica")
+class TestReplica(TransactionTestCase, WagtailTestUtils):
+    # The replica mirrors the default database in tests, so it can only see
+    # committed news items
+    databases = {"default", "replica"}
+    serialized_rollback = True
+
+    def setUp(self):
+        super().setUp()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.newsitem = NewsItem.objects.create(
+            newsindex=self.index,
+            title="A post",
+            date=timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0)),
+        )
+        self.newsitem.tags.add("wagtail")
+        self.newsitem.save()
+
+    def get_newsitem_queries(self, url):
+        with CaptureQueriesContext(connections["default"]) as default_queries:
+            with CaptureQueriesContext(connections["replica"]) as replica_queries:
+                response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [
+            [query for query in queries if "app_newsitem" in query["sql"]]
+            for queries in [default_queries, replica_queries]
+        ]
+
+    def test_public_routes_read_replica(self):
+        for url in [
+            self.index.url,
+            self.index.url + "2017/",
+            self.index.url + "2017/4/",
+            self.index.url + "2017/4/13/",
+            self.index.url + "tag/wagtail/",
+            self.index.url + "api/",
+            self.index.url + "rss/",
+            str(self.newsitem.url),
+        ]:
+            default_queries, replica_queries = self.get_newsitem_queries(url)
+            self.assertTrue(replica_queries, url)
+            self.assertFalse(default_queries, url)
+
+    def test_no_vary_cookie(self):
+        response = self.client.get(self.index.url)
+        self.assertNotIn("Vary", response)
+
+    @override_settings(WAGTAILNEWS_REPLICA_DATABASE=None)
+    def test_default(self):
+        default_queries, replica_queries = self.get_newsitem_queries(self.index.url)
+        self.assertTrue(default_queries)
+        self.assertFalse(replica_queries)
+
+    def test_editors_read_default(self):
+        self.login()
+        default_queries, replica_queries = self.get_newsitem_queries(self.index.url)
+        self.assertTrue(default_queries)
+        self.assertFalse(replica_queries)
+
+    def test_read_your_writes(self):
+        self.login()
+        self.client.post(
+            reverse("wagtailnews:bulk_action", kwargs={"pk": self.index.pk}),
+            {"action": "unpublish", "id": [self.newsitem.pk]},
+        )
+        self.assertIn(replica.SESSION_KEY, self.client.session)
+
+        # Without admin access, only the recent change keeps the session on
+        # the default database
+        user = get_user_model().objects.create_user("visitor", password="password")
+        self.client.force_login(user)
+        session = self.client.session
+        session[replica.SESSION_KEY] = time.time()
+        session.save()
+        default_queries, replica_queries = self.get_newsitem_queries(self.index.url)
+        self.assertTrue(default_queries)
+        self.assertFalse(replica_queries)
+
+        session[replica.SESSION_KEY] = time.time() - 60
+        session.save()
+        default_queries, replica_queries = self.get_newsitem_queries(self.index.url)
+        self.assertFalse(default_queries)
+        self.assertTrue(replica_queries)
+
+    def test_preview_reads_default(self):
+        request = RequestFactory().get("/")
+        self.assertEqual(replica.get_read_database(request), "replica")
+        request.is_preview = True
+        self.assertIsNone(replica.get_read_database(request))
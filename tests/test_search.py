@@ -0,0 +1,153 @@
+import threading
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from wagtail.models import Page
+from wagtail.test.utils import WagtailTestUtils
+
+from tests.app.models import (
+    NewsIndex, NewsItem, SecondaryNewsIndex, SecondaryNewsItem)
+from wagtailnews.search import (
+    decode_cursor, encode_cursor, run_concurrently, search_newsitems)
+
+FALLBACK_SEARCH_BACKEND = {
+    'default': {'BACKEND': 'wagtail.search.backends.database.fallback'},
+}
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=FALLBACK_SEARCH_BACKEND)
+class TestSearchNewsItems(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestSearchNewsItems, self).setUp()
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+        self.other_index = root_page.add_child(instance=NewsIndex(title='Other'))
+        self.newsitems = [
+            NewsItem.objects.create(
+                newsindex=self.index, title='Hello {}'.format(i))
+            for i in range(5)
+        ] + [
+            NewsItem.objects.create(
+                newsindex=self.other_index, title='Hello other {}'.format(i))
+            for i in range(4)
+        ]
+        NewsItem.objects.create(newsindex=self.index, title='Goodbye')
+
+    def test_merged_pages(self):
+        querysets = [
+            NewsItem.objects.filter(newsindex=self.index),
+            NewsItem.objects.filter(newsindex=self.other_index),
+        ]
+        seen = []
+        cursor = None
+        for page_number in range(3):
+            results = search_newsitems(querysets, 'hello', cursor=cursor, page_size=4)
+            seen.extend(results)
+            cursor = results.next_cursor
+            if not results.has_next:
+                break
+
+        self.assertEqual(page_number, 2)
+        self.assertCountEqual(seen, self.newsitems)
+
+    def test_results_are_interleaved(self):
+        querysets = [
+            NewsItem.objects.filter(newsindex=self.index),
+            NewsItem.objects.filter(newsindex=self.other_index),
+        ]
+        results = search_newsitems(querysets, 'hello', page_size=4)
+        self.assertEqual(
+            sorted(result.newsindex_id for result in results),
+            sorted([self.index.pk, self.index.pk, self.other_index.pk, self.other_index.pk]))
+
+    def test_no_results(self):
+        results = search_newsitems([NewsItem.objects.all()], 'nothing')
+        self.assertEqual(list(results), [])
+        self.assertIsNone(results.next_cursor)
+
+    def test_cursor_offsets_by_queryset(self):
+        querysets = [
+            NewsItem.objects.filter(newsindex=self.index),
+            NewsItem.objects.filter(newsindex=self.other_index),
+        ]
+        results = search_newsitems(querysets, 'hello', page_size=4)
+        self.assertEqual(decode_cursor(results.next_cursor), {'0': 2, '1': 2})
+
+    def test_cursor(self):
+        cursor = encode_cursor({'0': 10})
+        self.assertEqual(decode_cursor(cursor), {'0': 10})
+        self.assertEqual(decode_cursor('not a cursor!'), {})
+        self.assertEqual(decode_cursor(encode_cursor({'0': -1})), {})
+        self.assertEqual(decode_cursor(None), {})
+
+    def test_run_concurrently(self):
+        self.assertEqual(
+            run_concurrently([lambda: 1, lambda: 2, lambda: 3]), [1, 2, 3])
+
+    def test_run_concurrently_in_transaction(self):
+        """Tests always run in a transaction, so nothing runs in a thread"""
+        self.assertEqual(
+            run_concurrently([threading.get_ident] * 2), [threading.get_ident()] * 2)
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=FALLBACK_SEARCH_BACKEND)
+class TestSearchThreads(TransactionTestCase, WagtailTestUtils):
+    # Outside of a transaction, so searches run in the thread pool
+    serialized_rollback = True
+
+    def setUp(self):
+        super(TestSearchThreads, self).setUp()
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+        self.secondary_index = root_page.add_child(
+            instance=SecondaryNewsIndex(title='Secondary'))
+        self.newsitems = [
+            NewsItem.objects.create(newsindex=self.index, title='Hello {}'.format(i))
+            for i in range(3)
+        ] + [
+            SecondaryNewsItem.objects.create(
+                newsindex=self.secondary_index, title='Hello secondary {}'.format(i))
+            for i in range(3)
+        ]
+
+    @override_settings(WAGTAILNEWS_SEARCH_THREADS=2)
+    def test_run_concurrently(self):
+        idents = run_concurrently([threading.get_ident] * 2)
+        self.assertNotIn(threading.get_ident(), idents)
+
+    @override_settings(WAGTAILNEWS_SEARCH_THREADS=2)
+    def test_search_in_threads(self):
+        querysets = [NewsItem.objects.all(), SecondaryNewsItem.objects.all()]
+        seen = []
+        cursor = None
+        while True:
+            results = search_newsitems(querysets, 'hello', cursor=cursor, page_size=4)
+            seen.extend(results)
+            cursor = results.next_cursor
+            if not results.has_next:
+                break
+        self.assertCountEqual(seen, self.newsitems)
+
+
+@override_settings(WAGTAILSEARCH_BACKENDS=FALLBACK_SEARCH_BACKEND)
+class TestSearchView(TestCase, WagtailTestUtils):
+    def setUp(self):
+        super(TestSearchView, self).setUp()
+        self.login()
+        root_page = Page.objects.get(pk=2)
+        self.index = root_page.add_child(instance=NewsIndex(title='News'))
+        root_page.add_child(instance=SecondaryNewsIndex(title='Secondary'))
+        for i in range(25):
+            NewsItem.objects.create(newsindex=self.index, title='Hello {}'.format(i))
+
+    def test_search(self):
+        response = self.client.get(reverse('wagtailnews:search'), {'q': 'hello'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['object_list']), 20)
+        next_cursor = response.context['next_cursor']
+        self.assertIsNotNone(next_cursor)
+
+        response = self.client.get(reverse('wagtailnews:search'), {
+            'q': 'hello', 'cursor': next_cursor})
+        self.assertEqual(len(response.context['object_list']), 5)
+        self.assertIsNone(response.context['next_cursor'])
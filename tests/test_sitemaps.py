@@ -0,0 +1,95 @@
+import datetime
+
+from django.contrib.sites.requests import RequestSite
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.models import Site
+
+from tests.app.models import NewsIndex, NewsItem
+from tests.app.sitemaps import NewsSitemap
+from wagtailnews.sitemaps import NewsItemSitemap
+
+
+class TestNewsItemSitemap(TestCase):
+    def setUp(self):
+        super().setUp()
+        root_page = Site.objects.get(is_default_site=True).root_page
+        self.index = root_page.add_child(instance=NewsIndex(title="News", slug="news"))
+        self.other_index = root_page.add_child(
+            instance=NewsIndex(title="Other", slug="other")
+        )
+        date = timezone.make_aware(datetime.datetime(2017, 4, 13, 12, 0, 0))
+        self.newsitems = [
+            NewsItem.objects.create(newsindex=index, title="Post {}".format(i), date=date)
+            for i, index in enumerate([self.index, self.other_index, self.index])
+        ]
+
+    def get_urls(self, sitemap, page=1):
+        request = RequestFactory().get("/sitemap-news.xml")
+        sitemap.request = request
+        return sitemap.get_urls(page=page, site=RequestSite(request))
+
+    def test_urls(self):
+        sitemap = NewsSitemap()
+        urls = self.get_urls(sitemap)
+        self.assertEqual(
+            [url["location"] for url in urls],
+            [
+                "http://localhost/news/2017/4/13/{}-post-0/".format(self.newsitems[0].pk),
+                "http://localhost/other/2017/4/13/{}-post-1/".format(self.newsitems[1].pk),
+            ],
+        )
+        self.assertEqual(urls[0]["lastmod"], self.newsitems[0].last_modified)
+        self.assertEqual(len(self.get_urls(sitemap, page=2)), 1)
+
+    def test_excluded(self):
+        NewsItem.objects.create(newsindex=self.index, title="Draft", live=False)
+        NewsItem.objects.create(
+            newsindex=self.index,
+            title="Future",
+            date=timezone.now() + datetime.timedelta(days=1),
+        )
+        self.other_index.unpublish()
+
+        sitemap = NewsSitemap()
+        self.assertEqual(
+            list(sitemap.items()), [self.newsitems[0], self.newsitems[2]]
+        )
+
+    def test_query_count(self):
+        """News indexes are fetched and routed once for each page of news items"""
+        def count_queries():
+            sitemap = NewsSitemap()
+            sitemap.limit = 100
+            with CaptureQueriesContext(connection) as context:
+                self.get_urls(sitemap)
+            return len(context.captured_queries)
+
+        # Warm the cache of site root paths
+        count_queries()
+        queries = count_queries()
+        for i in range(10):
+            NewsItem.objects.create(newsindex=self.index, title="More")
+        self.assertEqual(count_queries(), queries)
+
+    def test_index_view(self):
+        response = self.client.get("/sitemap.xml")
+        self.assertContains(response, "/sitemap-news.xml</loc>")
+        self.assertContains(response, "/sitemap-news.xml?p=2</loc>")
+        self.assertNotContains(response, "sitemap-news.xml?p=3")
+
+    def test_sitemap_view(self):
+        response = self.client.get("/sitemap-news.xml", {"p": 2})
+        self.assertContains(
+            response,
+            "<loc>http://localhost/news/2017/4/13/{}-post-2/</loc>".format(
+                self.newsitems[2].pk
+            ),
+        )
+        self.assertIn("Last-Modified", response)
+
+    def test_model_argument(self):
+        sitemap = NewsItemSitemap(model=NewsItem)
+        self.assertEqual(len(self.get_urls(sitemap)), 3)
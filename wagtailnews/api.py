@@ -0,0 +1,228 @@
+"""
+List news items in the Wagtail API.
+
+``wagtail.api.v2`` has endpoints for pages, images and documents, but not for
+news items. :class:`NewsItemsAPIViewSet` is an endpoint for the news items of
+one news item model, which plugs in to a ``WagtailAPIRouter`` alongside them.
+"""
+import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Min
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date
+from rest_framework.fields import Field
+from rest_framework.filters import BaseFilterBackend
+from wagtail.api.v2.filters import FieldsFilter, OrderingFilter
+from wagtail.api.v2.serializers import BaseSerializer
+from wagtail.api.v2.utils import BadRequestError
+from wagtail.api.v2.views import BaseAPIViewSet
+from wagtail.models import Page, Site
+
+from . import cache, keyset
+from .conf import get_setting
+from .models import LISTING_URL_FIELDS, get_newsitem_tags_field
+
+
+class NewsItemHtmlUrlField(Field):
+    """
+    Serializes the "html_url" field of each news item, the full URL of the
+    news item on the site.
+    """
+
+    def get_attribute(self, instance):
+        return instance
+
+    def to_representation(self, newsitem):
+        return self.context["view"].get_newsitem_url(newsitem)
+
+
+class NewsIndexField(Field):
+    """Serializes the "newsindex" field of each news item, as the news index ID"""
+
+    def get_attribute(self, instance):
+        return instance.newsindex_id
+
+    def to_representation(self, newsindex_id):
+        return newsindex_id
+
+
+class NewsItemSerializer(BaseSerializer):
+    html_url = NewsItemHtmlUrlField(read_only=True)
+    newsindex = NewsIndexField(read_only=True)
+
+
+class NewsItemFilter(BaseFilterBackend):
+    """
+    Filters news items by date and tag:
+
+    * ``?date_from=2017-04-01`` and ``?date_to=2017-04-30`` keep the news items
+      from, and up to and including, a date in the current time zone
+    * ``?tag=wagtail`` keeps the news items tagged with a tag slug.
+      Separate several tags with commas to keep news items with all of them.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        date_from = self.get_date(request, "date_from")
+        if date_from is not None:
+            queryset = queryset.filter(date__gte=date_from)
+
+        date_to = self.get_date(request, "date_to")
+        if date_to is not None:
+            # Before the start of the next day, so the date index can be used
+            queryset = queryset.filter(date__lt=date_to + datetime.timedelta(days=1))
+
+        if "tag" in request.GET:
+            field = view.get_tags_field()
+            if field is None:
+                raise BadRequestError("tag filter error. news items are not tagged")
+            for tag in request.GET["tag"].split(","):
+                queryset = queryset.filter(**{field.name + "__slug": tag})
+
+        return queryset
+
+    def get_date(self, request, name):
+        if name not in request.GET:
+            return None
+        try:
+            date = parse_date(request.GET[name])
+        except ValueError:
+            date = None
+        if date is None:
+            raise BadRequestError(
+                "%s filter error. '%s' is not a valid date" % (name, request.GET[name])
+            )
+        return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+class NewsItemsAPIViewSet(BaseAPIViewSet):
+    """
+    An API endpoint listing the live news items of one news item model,
+    in the live and public news indexes of the current site, newest first.
+
+    Subclass this and set ``model``, then register it with the API router.
+    """
+
+    base_serializer_class = NewsItemSerializer
+    filter_backends = [FieldsFilter, NewsItemFilter, OrderingFilter]
+    known_query_parameters = BaseAPIViewSet.known_query_parameters.union([
+        "date_from",
+        "date_to",
+        "tag",
+    ]).difference([
+        # News items are searched through their news index
+        "search",
+        "search_operator",
+    ])
+    body_fields = BaseAPIViewSet.body_fields + ["date", "teaser", "excerpt"]
+    meta_fields = BaseAPIViewSet.meta_fields + ["html_url", "newsindex"]
+    listing_default_fields = BaseAPIViewSet.listing_default_fields + [
+        "html_url",
+        "newsindex",
+        "date",
+        "teaser",
+    ]
+    nested_default_fields = BaseAPIViewSet.nested_default_fields + ["html_url"]
+    name = "news"
+    model = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._newsindexes = {}
+
+    def get_newsindexes(self):
+        """The news indexes to list the news items of"""
+        site = Site.find_for_request(self.request)
+        if site is None:
+            return Page.objects.none()
+        return site.root_page.get_descendants(inclusive=True).live().public()
+
+    def get_queryset(self):
+        return (
+            self.model.objects.live()
+            .filter(newsindex__in=self.get_newsindexes())
+            .order_by(*keyset.ORDERING)
+        )
+
+    def get_tags_field(self):
+        """
+        Get the ``TaggableManager`` field of the news item model, as found by
+        its news index model, or ``None`` if news items are not tagged
+        """
+        return get_newsitem_tags_field(self.model)
+
+    def get_only_fields(self):
+        """
+        Get the news item fields to fetch: the database fields that are
+        serialized, and the fields needed for the news item URL
+        """
+        serializer_class = self.get_serializer_class()
+        names = LISTING_URL_FIELDS + list(self.model.slug_fields)
+        for name in serializer_class.Meta.fields:
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete and not field.many_to_many:
+                names.append(name)
+        return names
+
+    def load_newsindexes(self, newsitems):
+        """
+        Fetch the news indexes of a page of news items in one query, and
+        resolve the URL of each news index once
+        """
+        pks = {newsitem.newsindex_id for newsitem in newsitems}
+        pks.difference_update(self._newsindexes)
+        for newsindex in Page.objects.filter(pk__in=pks).specific():
+            self._newsindexes[newsindex.pk] = (
+                newsindex,
+                newsindex.get_full_url(self.request),
+            )
+
+    def get_newsitem_url(self, newsitem):
+        """Get the full URL of a news item, once its news index is loaded"""
+        if newsitem.newsindex_id not in self._newsindexes:
+            self.load_newsindexes([newsitem])
+        newsindex, newsindex_url = self._newsindexes[newsitem.newsindex_id]
+        if newsindex_url is None:
+            # The news index is not routable from any site
+            return None
+        newsitem.newsindex = newsindex
+        return newsindex_url + newsitem.url_suffix()
+
+    def listing_view(self, request):
+        queryset = self.get_queryset()
+        self.check_query_parameters(queryset)
+        queryset = self.filter_queryset(queryset)
+        queryset = queryset.only(*self.get_only_fields())
+        newsitems = list(self.paginate_queryset(queryset))
+        self.load_newsindexes(newsitems)
+        serializer = self.get_serializer(newsitems, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_next_go_live_at(self):
+        """
+        Get the time the next scheduled news item goes live,
+        or ``None`` if nothing is scheduled
+        """
+        return self.model.objects.filter(go_live_at__isnull=False).aggregate(
+            next_go_live_at=Min("go_live_at")
+        )["next_go_live_at"]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method != "GET" or response.status_code != 200:
+            return response
+
+        # Render now to tag the response, so it can be revalidated by
+        # browsers and caching proxies without sending the body again
+        response.render()
+        response = cache.conditional_response(request, response)
+
+        max_age = get_setting("CACHE_MAX_AGE")
+        if max_age is not None:
+            max_age = cache.cap_timeout(max_age, self.get_next_go_live_at())
+            patch_cache_control(response, max_age=max_age)
+        return response
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class WagtailNewsAppConfig(AppConfig):
+    name = "wagtailnews"
+    label = "wagtailnews"
+    verbose_name = "Wagtail news"
+
+    def ready(self):
+        from .signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
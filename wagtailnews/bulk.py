@@ -0,0 +1,241 @@
+"""
+Publish, unpublish and delete many news items at once.
+
+Each action runs a fixed number of queries however many news items it acts
+on, and updates the search index for all of them in one batch.
+The batch signals (``newsitems_published`` and friends) are left to the
+caller, as with the single news item signals.
+"""
+from contextlib import nullcontext
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Q, prefetch_related_objects
+from django.utils import timezone
+from modelcluster.models import (
+    ClusterableModel, get_all_child_m2m_relations, get_all_child_relations)
+
+from . import frontend_cache
+from .indexing import defer_update, deferred_indexing
+
+
+def publish_newsitems(newsitems):
+    """
+    Publish the latest revision of each news item in a queryset that is
+    either a draft or has unpublished changes. News items dated in the
+    future are scheduled instead, see :meth:`AbstractNewsItem.schedule`.
+    Returns the list of news items that were published, the list of news
+    items that were scheduled, and the list of scheduled news items that
+    were live before, which have been taken off the site until they go live.
+    """
+    NewsItem = newsitems.model
+    Revision = NewsItem._meta.get_field("revisions").related_model
+
+    with transaction.atomic(), deferred_indexing():
+        instances = list(
+            newsitems.filter(Q(live=False) | Q(has_unpublished_changes=True))
+            .annotate_latest_revision()
+        )
+        revisions = Revision.objects.in_bulk([
+            instance.latest_revision_id
+            for instance in instances
+            if instance.latest_revision_id is not None
+        ])
+
+        was_live = {instance.pk for instance in instances if instance.live}
+        now = timezone.now()
+        newsitems_to_save = []
+        for instance in instances:
+            revision = revisions.get(instance.latest_revision_id)
+            if revision is not None:
+                # Foreign keys are checked for all news items at once below
+                newsitem = NewsItem.from_json(revision.content_json, check_fks=False)
+                newsitem.pk = instance.pk
+                # The news item as it was, for frontend cache purging
+                setattr(newsitem, frontend_cache.PREVIOUS_ATTR, instance)
+            else:
+                newsitem = instance
+            newsitem.live = True
+            newsitem.has_unpublished_changes = False
+            newsitem.last_modified = now
+            newsitem.schedule(now)
+            newsitems_to_save.append(newsitem)
+
+        _nullify_dangling_fks(NewsItem, newsitems_to_save)
+        _prefetch_child_fks(NewsItem, newsitems_to_save)
+        for newsitem in newsitems_to_save:
+            newsitem.update_teaser()
+
+        fields = [
+            field.name
+            for field in NewsItem._meta.concrete_fields
+            if not field.primary_key
+        ]
+        NewsItem.objects.bulk_update(newsitems_to_save, fields)
+
+        _commit_child_relations(NewsItem, [
+            newsitem
+            for newsitem, instance in zip(newsitems_to_save, instances)
+            if instance.latest_revision_id is not None
+        ])
+
+        for newsitem in newsitems_to_save:
+            defer_update(newsitem)
+
+    published = [newsitem for newsitem in newsitems_to_save if newsitem.live]
+    scheduled = [newsitem for newsitem in newsitems_to_save if not newsitem.live]
+    unpublished = [newsitem for newsitem in scheduled if newsitem.pk in was_live]
+    return published, scheduled, unpublished
+
+
+def _prefetch_child_fks(NewsItem, newsitems):
+    """
+    Fetch what the child objects of news items point to, such as the tags of
+    tagged items, with one query per foreign key for all of them, before
+    the teasers are rendered
+    """
+    for relation in get_all_child_relations(NewsItem):
+        accessor = relation.get_accessor_name()
+        children = [
+            child
+            for newsitem in newsitems
+            for child in getattr(newsitem, accessor).all()
+        ]
+        fields = [
+            field.name
+            for field in relation.related_model._meta.concrete_fields
+            if field.many_to_one and field is not relation.field
+        ]
+        if children and fields:
+            prefetch_related_objects(children, *fields)
+
+
+def _commit_child_relations(NewsItem, newsitems):
+    """
+    Save the child objects of news items built from their revisions, such as
+    tags, replacing the saved ones with one delete and one insert for each
+    relation instead of a few queries for each news item.
+    """
+    if not newsitems:
+        return
+    pks = [newsitem.pk for newsitem in newsitems]
+
+    for relation in get_all_child_relations(NewsItem):
+        accessor = relation.get_accessor_name()
+        Child = relation.related_model
+        if issubclass(Child, ClusterableModel):
+            # Child objects with child objects of their own have to be saved
+            # one at a time to save those too
+            for newsitem in newsitems:
+                getattr(newsitem, accessor).commit()
+            continue
+
+        children = []
+        for newsitem in newsitems:
+            for child in getattr(newsitem, accessor).all():
+                setattr(child, relation.field.attname, newsitem.pk)
+                children.append(child)
+        Child._default_manager.filter(**{relation.field.name + "__in": pks}).delete()
+        Child._default_manager.bulk_create(children)
+
+    for field in get_all_child_m2m_relations(NewsItem):
+        Through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        Through._default_manager.filter(**{source + "__in": pks}).delete()
+        Through._default_manager.bulk_create([
+            Through(**{source + "_id": newsitem.pk, target + "_id": related.pk})
+            for newsitem in newsitems
+            for related in getattr(newsitem, field.name).all()
+        ])
+
+
+def _nullify_dangling_fks(NewsItem, newsitems):
+    """
+    Clear foreign keys that point to objects that no longer exist,
+    with one query per foreign key instead of one per news item.
+    """
+    for field in NewsItem._meta.concrete_fields:
+        if not field.many_to_one:
+            continue
+        values = {getattr(newsitem, field.attname) for newsitem in newsitems}
+        values.discard(None)
+        if not values:
+            continue
+        existing = set(
+            field.related_model._default_manager.filter(pk__in=values)
+            .values_list("pk", flat=True)
+        )
+        for newsitem in newsitems:
+            if getattr(newsitem, field.attname) not in existing:
+                setattr(newsitem, field.attname, None)
+
+
+def unpublish_newsitems(newsitems):
+    """
+    Unpublish every live or scheduled news item in a queryset.
+    Returns the list of news items that were unpublished.
+    """
+    with transaction.atomic(), deferred_indexing():
+        instances = list(
+            newsitems.filter(Q(live=True) | Q(go_live_at__isnull=False))
+        )
+        now = timezone.now()
+        newsitems.model.objects.filter(
+            pk__in=[instance.pk for instance in instances]
+        ).update(
+            live=False, has_unpublished_changes=True, go_live_at=None, last_modified=now
+        )
+
+        for instance in instances:
+            instance.live = False
+            instance.has_unpublished_changes = True
+            instance.go_live_at = None
+            instance.last_modified = now
+            defer_update(instance)
+
+    return instances
+
+
+def publish_scheduled_newsitems(newsitems, now=None):
+    """
+    Make every scheduled news item in a queryset that is due to go live,
+    live. Returns the list of news items that went live.
+    """
+    if now is None:
+        now = timezone.now()
+    with transaction.atomic(), deferred_indexing():
+        instances = list(
+            newsitems.filter(live=False, go_live_at__lte=now).select_for_update()
+        )
+        newsitems.model.objects.filter(
+            pk__in=[instance.pk for instance in instances]
+        ).update(live=True, go_live_at=None, last_modified=now)
+
+        for instance in instances:
+            instance.live = True
+            instance.go_live_at = None
+            instance.last_modified = now
+            defer_update(instance)
+
+    return instances
+
+
+def delete_newsitems(newsitems):
+    """
+    Delete every news item in a queryset, along with their revisions.
+    Returns the list of news items that were deleted.
+    """
+    with transaction.atomic(), deferred_indexing():
+        instances = list(newsitems)
+        if apps.is_installed("wagtail.contrib.frontend_cache"):
+            # Tags are deleted with the news items, before the URLs are purged
+            stash = frontend_cache.bulk_delete(instances)
+        else:
+            stash = nullcontext()
+        with stash:
+            newsitems.model.objects.filter(
+                pk__in=[instance.pk for instance in instances]
+            ).delete()
+
+    return instances
@@ -0,0 +1,176 @@
+"""
+Cache keys for data derived from the news items of a news index.
+
+Each news index has a generation number in the shared cache, which is bumped
+whenever a news item in it is published, unpublished or deleted. Every cache
+key wagtailnews makes includes the generation of its news index, so bumping
+the generation makes everything cached for that news index stale at once,
+in every process, without deleting any keys. The stale entries expire in
+their own time.
+
+The generation is kept in the ``WAGTAILNEWS_GENERATION_CACHE`` cache, which
+should be shared by all processes. The cached data itself is kept in the
+``WAGTAILNEWS_CACHE`` cache, which can be local to each process.
+"""
+import hashlib
+import math
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+
+from .conf import get_setting
+
+KEY_PREFIX = "wagtailnews"
+
+# The generations already read while handling a request, by news index pk
+REQUEST_ATTR = "_wagtailnews_generations"
+
+
+def get_cache():
+    """The cache that wagtailnews keeps cached data in"""
+    return caches[get_setting("CACHE", "default")]
+
+
+def get_generation_cache():
+    """The cache that the news index generations are kept in"""
+    return caches[get_setting("GENERATION_CACHE", get_setting("CACHE", "default"))]
+
+
+def _generation_key(newsindex_pk):
+    return "{}:generation:{}".format(KEY_PREFIX, newsindex_pk)
+
+
+def _new_generation():
+    # A generation that has been evicted from the cache must not start again
+    # from a number that was already used, or stale entries would come back.
+    # Starting from the time in microseconds keeps ahead of any earlier bumps
+    return int(time.time() * 1000000)
+
+
+def get_generation(newsindex_pk, request=None):
+    """
+    Get the current generation of a news index. Given a ``request``, the
+    generation is only read from the cache once while handling it
+    """
+    if request is not None:
+        generations = request.__dict__.setdefault(REQUEST_ATTR, {})
+        if newsindex_pk not in generations:
+            generations[newsindex_pk] = get_generation(newsindex_pk)
+        return generations[newsindex_pk]
+
+    cache = get_generation_cache()
+    key = _generation_key(newsindex_pk)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _new_generation(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+async def aget_generation(newsindex_pk):
+    """Get the current generation of a news index from an async view"""
+    cache = get_generation_cache()
+    key = _generation_key(newsindex_pk)
+    generation = await cache.aget(key)
+    if generation is None:
+        await cache.aadd(key, _new_generation(), timeout=None)
+        generation = await cache.aget(key)
+    return generation
+
+
+def bump_generation(newsindex_pk):
+    """
+    Atomically bump the generation of a news index, making everything cached
+    for it stale. Returns the new generation.
+    """
+    cache = get_generation_cache()
+    key = _generation_key(newsindex_pk)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Not in the cache. Another process might be adding it too
+        if cache.add(key, _new_generation(), timeout=None):
+            return cache.get(key)
+        return cache.incr(key)
+
+
+def cap_timeout(timeout, next_go_live_at):
+    """
+    Cap a timeout in seconds so that it ends when the next scheduled news item
+    goes live. A timeout of ``None`` means forever.
+    """
+    if next_go_live_at is None:
+        return timeout
+    until = math.ceil((next_go_live_at - timezone.now()).total_seconds())
+    until = max(until, 0)
+    return until if timeout is None else min(timeout, until)
+
+
+def conditional_response(request, response):
+    """
+    Tag a response with an ``ETag`` of its content, and turn it in to a
+    ``304 Not Modified`` if the request already has that content
+    """
+    # A cache validator, not a security measure. The usedforsecurity
+    # argument of md5() needs Python 3.9
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    response["ETag"] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def make_cache_key(newsindex_pk, *parts):
+    """
+    Make a cache key for something derived from the news items of a news
+    index, such as an archive count or a rendered feed
+    """
+    return _join_key(KEY_PREFIX, newsindex_pk, get_generation(newsindex_pk), *parts)
+
+
+async def amake_cache_key(newsindex_pk, *parts):
+    """Make a cache key like :func:`make_cache_key`, from an async view"""
+    generation = await aget_generation(newsindex_pk)
+    return _join_key(KEY_PREFIX, newsindex_pk, generation, *parts)
+
+
+def _join_key(*parts):
+    return ":".join(str(part) for part in parts)
+
+
+def make_newsitem_cache_key(newsitem, name, *vary_on, request=None):
+    """
+    Make a cache key for a fragment rendered from a news item, such as its
+    teaser or body. The key changes whenever the news item is published,
+    unpublished or edited, so the fragment can be reused on every page that
+    shows the news item. It also includes the generation of its news index,
+    as fragments often show other news items, such as the next news item.
+    Pass the ``request`` to read the generation once per request.
+    """
+    return _join_key(
+        KEY_PREFIX,
+        "newsitem",
+        newsitem._meta.label_lower,
+        newsitem.pk,
+        newsitem.get_cache_version(),
+        get_generation(newsitem.newsindex_id, request),
+        name,
+        *vary_on,
+    )
+
+
+def cache_newsitem_fragment(
+    newsitem, name, render, *vary_on, timeout=DEFAULT_TIMEOUT, request=None
+):
+    """
+    Get a fragment rendered from a news item from the cache, or call
+    ``render()`` to render it and cache it for next time
+    """
+    cache = get_cache()
+    key = make_newsitem_cache_key(newsitem, name, *vary_on, request=request)
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = render()
+        cache.set(key, fragment, timeout)
+    return fragment
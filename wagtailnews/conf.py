@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.utils.module_loading import import_string
 
@@ -17,5 +18,33 @@ except AttributeError:
 
         return paginator, page
 
+    async def apaginate(request, items):
+        paginator = Paginator(items, 20)
+        # Count and fetch the page with the async ORM up front,
+        # so the paginator never queries while the template renders
+        paginator.count = await items.acount()
+
+        try:
+            page_number = int(request.GET['page'])
+            page = paginator.page(page_number)
+        except (ValueError, KeyError, EmptyPage):
+            page = paginator.page(1)
+
+        page.object_list = [item async for item in page.object_list]
+        return paginator, page
+
 else:
     paginate = import_string(name)
+
+    async def apaginate(request, items):
+        def paginate_list():
+            paginator, page = paginate(request, items)
+            page.object_list = list(page.object_list)
+            return paginator, page
+
+        return await sync_to_async(paginate_list)()
+
+
+def get_setting(name, default=None):
+    """Get the value of a ``WAGTAILNEWS_<name>`` setting"""
+    return getattr(settings, 'WAGTAILNEWS_' + name, default)
@@ -0,0 +1,73 @@
+"""
+Export news items as JSON Lines or CSV.
+
+Rows are streamed from the database in chunks and written out one at a time,
+so exports use the same amount of memory however many news items there are.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef, Subquery
+
+REVISION_FIELD = "latest_revision"
+
+CONTENT_TYPES = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def get_export_fields(NewsItem):
+    return [field.attname for field in NewsItem._meta.concrete_fields]
+
+
+def iter_rows(newsitems, revisions=False, chunk_size=2000):
+    """
+    Yield a dict for each news item in a queryset, with the value of each of
+    its database columns, and optionally the ``content_json`` of its latest
+    revision as ``latest_revision``.
+    """
+    NewsItem = newsitems.model
+    fields = get_export_fields(NewsItem)
+    if revisions:
+        Revision = NewsItem._meta.get_field("revisions").related_model
+        latest = Revision.objects.filter(newsitem=OuterRef("pk")).order_by(
+            "-created_at", "-id"
+        )
+        newsitems = newsitems.annotate(
+            **{REVISION_FIELD: Subquery(latest.values("content_json")[:1])}
+        )
+        fields.append(REVISION_FIELD)
+
+    return newsitems.order_by("pk").values(*fields).iterator(chunk_size=chunk_size)
+
+
+def iter_jsonl(newsitems, revisions=False, chunk_size=2000):
+    """Yield each news item in a queryset as a line of JSON"""
+    for row in iter_rows(newsitems, revisions=revisions, chunk_size=chunk_size):
+        if row.get(REVISION_FIELD) is not None:
+            row[REVISION_FIELD] = json.loads(row[REVISION_FIELD])
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def iter_csv(newsitems, revisions=False, chunk_size=2000):
+    """Yield a header line, then each news item in a queryset as a line of CSV"""
+    fields = get_export_fields(newsitems.model)
+    if revisions:
+        fields.append(REVISION_FIELD)
+    writer = csv.DictWriter(_Echo(), fieldnames=fields)
+    yield writer.writeheader()
+    for row in iter_rows(newsitems, revisions=revisions, chunk_size=chunk_size):
+        yield writer.writerow(row)
+
+
+EXPORTERS = {
+    "jsonl": iter_jsonl,
+    "csv": iter_csv,
+}
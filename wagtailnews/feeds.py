@@ -1,14 +1,13 @@
 from django.contrib.syndication.views import Feed
-from django.utils import timezone
 
 
 class LatestEntriesFeed(Feed):
 
     def items(self):
-        now = timezone.now()
         NewsItem = self.news_index.get_newsitem_model()
-        newsitem_list = NewsItem.objects.live().order_by('-date').filter(
-            newsindex=self.news_index, date__lte=now)[:20]
+        newsitem_list = NewsItem.objects.using(
+            self.news_index.newsitem_database
+        ).live().order_by('-date').filter(newsindex=self.news_index)[:20]
         return newsitem_list
 
     def item_link(self, item):
@@ -22,6 +21,9 @@ class LatestEntriesFeed(Feed):
     def item_pubdate(self, item):
         return item.date
 
+    def item_description(self, item):
+        return item.teaser or super(LatestEntriesFeed, self).item_description(item)
+
     def __init__(self, news_index):
         super(LatestEntriesFeed, self).__init__()
         self.news_index = news_index
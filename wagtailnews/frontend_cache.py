@@ -0,0 +1,179 @@
+"""
+Purge the URLs that change when news items change from a frontend cache,
+using ``wagtail.contrib.frontend_cache``.
+
+Publishing, unpublishing or deleting a news item changes the news index and
+its pages, the year, month and day archives for the news item date, the tag
+archives for its tags, the news item itself, and the feed. If the news item
+date or slug changed, the old archives and news item URL change too.
+"""
+import math
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import prefetch_related_objects
+from django.http import HttpRequest
+from django.utils import timezone
+from wagtail.contrib.frontend_cache.utils import PurgeBatch
+from wagtail.models import Page
+
+from .conf import paginate
+from .models import get_newsitem_tags_field
+
+PREVIOUS_ATTR = "_wagtailnews_previous"
+PK_ATTR = "_wagtailnews_pk"
+TAGS_ATTR = "_wagtailnews_tags"
+
+# The tag slugs stashed by a bulk delete, by news item pk
+_bulk_delete_tags = ContextVar("wagtailnews_bulk_delete_tags", default=None)
+
+
+def get_per_page():
+    """How many news items are on each page of the news index routes"""
+    paginator, page = paginate(HttpRequest(), [])
+    return getattr(paginator, "per_page", None)
+
+
+def get_listing_urls(url, count, per_page):
+    """The URL of a news item listing, and each of its pages"""
+    urls = [url]
+    if per_page:
+        # One extra page, in case a news item was just removed
+        pages = math.ceil((count + 1) / per_page)
+        urls.extend("{}?page={}".format(url, page) for page in range(1, pages + 1))
+    return urls
+
+
+def get_newsindex_urls(newsindex, dates, tags=()):
+    """
+    Get the URLs of a news index, the feed, and the archives for each of
+    ``dates`` and the slugs in ``tags``, including every page of each listing
+    """
+    base_url = newsindex.get_full_url()
+    if base_url is None:
+        return set()
+
+    # Count the live news items for each day in one query,
+    # then add them up for the index and each archive
+    counts = newsindex._get_archive_counts()
+    per_page = get_per_page()
+
+    urls = set(get_listing_urls(base_url, sum(counts.values()), per_page))
+    urls.add(base_url + newsindex.reverse_subpage("feed"))
+
+    years = {(date.year,) for date in dates}
+    months = {(date.year, date.month) for date in dates}
+    days = {(date.year, date.month, date.day) for date in dates}
+    for name, keys in [("year", years), ("month", months), ("day", days)]:
+        for key in keys:
+            count = sum(n for day, n in counts.items() if day.timetuple()[:len(key)] == key)
+            url = base_url + newsindex.reverse_subpage(name, args=key)
+            urls.update(get_listing_urls(url, count, per_page))
+
+    if tags:
+        tag_counts = {
+            tag.slug: tag.newsitem_count for tag in newsindex._get_tag_counts()
+        }
+        for slug in tags:
+            url = base_url + newsindex.reverse_subpage("tag", args=[slug])
+            urls.update(get_listing_urls(url, tag_counts.get(slug, 0), per_page))
+
+    return urls
+
+
+def get_tag_slugs(newsindex, newsitem):
+    """Get the slugs of the tags of a news item"""
+    field = newsindex.get_newsitem_tags_field()
+    if field is None:
+        return set()
+    return {tag.slug for tag in getattr(newsitem, field.name).all()}
+
+
+def stash_tag_slugs(newsitems):
+    """
+    Remember the tag slugs of news items that are about to be deleted.
+    Their tags are deleted along with them, before the URLs are purged
+    """
+    newsitems = [newsitem for newsitem in newsitems if newsitem.pk is not None]
+    if not newsitems:
+        return
+    field = get_newsitem_tags_field(type(newsitems[0]))
+    if field is None:
+        return
+    prefetch_related_objects(newsitems, field.name)
+    for newsitem in newsitems:
+        slugs = {tag.slug for tag in getattr(newsitem, field.name).all()}
+        setattr(newsitem, TAGS_ATTR, slugs)
+
+
+def stash_deleted_tag_slugs(newsitem):
+    """
+    Remember the tag slugs of a news item that is about to be deleted,
+    reusing those stashed by :func:`bulk_delete` if it is deleting it
+    """
+    stashed = _bulk_delete_tags.get()
+    if stashed is not None and newsitem.pk in stashed:
+        setattr(newsitem, TAGS_ATTR, stashed[newsitem.pk])
+    else:
+        stash_tag_slugs([newsitem])
+
+
+@contextmanager
+def bulk_delete(newsitems):
+    """
+    Stash the tag slugs of news items about to be deleted together, with one
+    query for all of them. The news items deleted in this block reuse them
+    """
+    stash_tag_slugs(newsitems)
+    token = _bulk_delete_tags.set({
+        newsitem.pk: getattr(newsitem, TAGS_ATTR, set()) for newsitem in newsitems
+    })
+    try:
+        yield
+    finally:
+        _bulk_delete_tags.reset(token)
+
+
+def get_newsitem_urls(newsitems):
+    """Get every URL that changed when a list of news items changed"""
+    newsitems_by_index = defaultdict(list)
+    for newsitem in newsitems:
+        newsitems_by_index[newsitem.newsindex_id].append(newsitem)
+    newsindexes = Page.objects.filter(pk__in=newsitems_by_index.keys()).specific()
+
+    urls = set()
+    for newsindex in newsindexes:
+        base_url = newsindex.get_full_url()
+        if base_url is None:
+            continue
+
+        dates = set()
+        tags = set()
+        for newsitem in newsitems_by_index[newsindex.pk]:
+            if hasattr(newsitem, TAGS_ATTR):
+                tags.update(getattr(newsitem, TAGS_ATTR))
+            elif newsitem.pk is not None:
+                tags.update(get_tag_slugs(newsindex, newsitem))
+            versions = [newsitem]
+            previous = getattr(newsitem, PREVIOUS_ATTR, None)
+            if previous is not None:
+                versions.append(previous)
+            for version in versions:
+                if version.pk is None:
+                    # Deleted news items lose their pk
+                    version.pk = getattr(newsitem, PK_ATTR, None)
+                version.newsindex = newsindex
+                dates.add(timezone.localtime(version.date).date())
+                urls.add(base_url + version.url_suffix())
+
+        urls.update(get_newsindex_urls(newsindex, dates, tags))
+
+    return urls
+
+
+def purge_newsitems(newsitems):
+    """Purge every URL that changed when a list of news items changed"""
+    urls = get_newsitem_urls(newsitems)
+    if urls:
+        PurgeBatch(sorted(urls)).purge()
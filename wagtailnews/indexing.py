@@ -0,0 +1,100 @@
+"""
+Batch search index updates for news items.
+
+Publishing a news item saves it several times, and each save would update
+the search index for it again. Within :func:`deferred_indexing`, news items
+are only marked as dirty when saved or deleted, and the search index is
+updated for all of them in one go when the transaction commits.
+"""
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from wagtail.search.backends import get_search_backends_with_name
+
+logger = logging.getLogger(__name__)
+
+_pending = ContextVar("wagtailnews_pending_index_updates", default=None)
+
+
+@contextmanager
+def deferred_indexing():
+    """
+    Defer search index updates for news items saved or deleted within this
+    block until the current transaction commits, or until the block exits
+    when not in a transaction. Nested blocks are merged in to the outermost
+    one.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+
+    pending = defaultdict(dict)
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        if pending:
+            transaction.on_commit(lambda: update_index(pending))
+
+
+@contextmanager
+def suppressed_indexing():
+    """
+    Skip search index updates for news items saved or deleted within this
+    block, for code that updates the search index for them itself afterwards
+    """
+    token = _pending.set(defaultdict(dict))
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+
+
+def defer_update(instance):
+    """
+    Mark the news item as needing a search index update, if updates are being
+    deferred. Returns ``True`` if the update was deferred.
+    """
+    pending = _pending.get()
+    if pending is None:
+        return False
+    pending[type(instance)][instance.pk] = instance
+    return True
+
+
+def update_index(pending):
+    """
+    Update the search index for a ``{model: {pk: instance}}`` dict of dirty
+    news items. News items that still exist are added to each backend in one
+    batch per model, and the others are removed.
+    """
+    backends = list(get_search_backends_with_name(with_auto_update=True))
+    for model, instances in pending.items():
+        existing = list(model.get_indexed_objects().filter(pk__in=instances.keys()))
+        existing_pks = {instance.pk for instance in existing}
+        deleted = []
+        for pk, instance in instances.items():
+            if pk not in existing_pks:
+                # Django clears the pk of deleted instances after sending
+                # the delete signals
+                instance.pk = pk
+                deleted.append(instance)
+
+        for backend_name, backend in backends:
+            try:
+                if existing:
+                    backend.add_bulk(model, existing)
+                for instance in deleted:
+                    backend.delete(instance)
+            except Exception:
+                logger.exception(
+                    "Exception raised while updating %s in the '%s' search backend",
+                    model._meta.verbose_name_plural,
+                    backend_name,
+                )
+                if not backend.catch_indexing_errors:
+                    raise
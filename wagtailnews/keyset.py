@@ -0,0 +1,57 @@
+"""
+Keyset pagination for news items.
+
+News items are listed newest first, ordered by ``(date, pk)``. Instead of an
+offset, each page ends with a cursor holding the date and pk of its last news
+item, and the next page starts from there. Every page is then one indexed
+query, however deep in to the list it is, and news items published while
+paging do not shift later pages.
+"""
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+ORDERING = ["-date", "-pk"]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(newsitem):
+    """Make the cursor for the page after a news item"""
+    data = json.dumps([newsitem.date.isoformat(), newsitem.pk])
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Get the ``(date, pk)`` from a cursor, raising InvalidCursor if it is invalid"""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date, pk = json.loads(data)
+        date = parse_datetime(date)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if date is None or not isinstance(pk, int):
+        raise InvalidCursor(cursor)
+    return date, pk
+
+
+def paginate(newsitems, cursor=None, limit=20):
+    """
+    Get a page of news items, newest first, starting after a cursor.
+    Returns the list of news items and the cursor for the next page,
+    or ``None`` if this is the last page.
+    """
+    if cursor:
+        date, pk = decode_cursor(cursor)
+        newsitems = newsitems.filter(Q(date__lt=date) | Q(date=date, pk__lt=pk))
+    # One extra news item tells whether there is a next page
+    page = list(newsitems.order_by(*ORDERING)[:limit + 1])
+    if len(page) > limit:
+        page = page[:limit]
+        return page, encode_cursor(page[-1])
+    return page, None
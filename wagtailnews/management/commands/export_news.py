@@ -0,0 +1,77 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtailnews.export import EXPORTERS
+from wagtailnews.models import get_newsitem_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Export every news item of a news item model as JSON Lines or CSV. "
+        "News items are streamed from the database in chunks, so memory use "
+        "does not grow with the number of news items."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="The news item model, as app_label.ModelName")
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="The file to write to. Defaults to standard output",
+        )
+        parser.add_argument("--format", choices=sorted(EXPORTERS), default="jsonl")
+        parser.add_argument(
+            "--index",
+            type=int,
+            help="Only export news items in the news index with this page ID",
+        )
+        parser.add_argument(
+            "--revisions",
+            action="store_true",
+            help="Include the content of the latest revision of each news item",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, **options):
+        try:
+            NewsItem = apps.get_model(options["model"])
+        except (LookupError, ValueError):
+            raise CommandError("Unknown model {}".format(options["model"]))
+        if NewsItem not in get_newsitem_models():
+            raise CommandError("{} is not a news item model".format(options["model"]))
+
+        newsitems = NewsItem.objects.all()
+        if options["index"] is not None:
+            newsitems = newsitems.filter(newsindex_id=options["index"])
+
+        lines = EXPORTERS[options["format"]](
+            newsitems,
+            revisions=options["revisions"],
+            chunk_size=options["chunk_size"],
+        )
+
+        start = time.perf_counter()
+        count = 0
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as f:
+                count = self.write(f, lines)
+        else:
+            count = self.write(self.stdout, lines)
+
+        if options["format"] == "csv":
+            count -= 1  # The header
+        if options["verbosity"] >= 1 and options["output"]:
+            self.stdout.write("Exported {} {} in {:.1f}s".format(
+                count, NewsItem._meta.verbose_name_plural, time.perf_counter() - start))
+
+    def write(self, f, lines):
+        count = 0
+        for line in lines:
+            if f is self.stdout:
+                f.write(line, ending="")
+            else:
+                f.write(line)
+            count += 1
+        return count
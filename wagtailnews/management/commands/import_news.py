@@ -0,0 +1,261 @@
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.utils import timezone
+from modelcluster.models import (
+    get_all_child_m2m_relations, get_all_child_relations)
+from taggit.forms import TagField
+from taggit.models import Tag
+from taggit.utils import edit_string_for_tags
+from wagtail.models import Page
+
+from wagtailnews import signals
+from wagtailnews.indexing import suppressed_indexing, update_index
+from wagtailnews.models import NewsIndexMixin
+from wagtailnews.views.editor import get_newsitem_edit_handler
+
+
+def read_jsonl(f):
+    for line_number, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, "Invalid JSON: {}".format(e)
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+def read_csv(f):
+    reader = csv.DictReader(f)
+    for record in reader:
+        yield reader.line_num, record, None
+
+
+READERS = {
+    "jsonl": read_jsonl,
+    "csv": read_csv,
+}
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = (
+        "Import news items in to a news index from a JSON Lines or CSV file. "
+        "Each record is validated with the news item edit form, and the news "
+        "items and their first revisions are created in chunks. "
+        "The search index is updated and signals are sent once all the "
+        "news items have been created."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help="The file to import, or - to read from standard input",
+        )
+        parser.add_argument(
+            "--index",
+            type=int,
+            required=True,
+            help="The page ID of the news index to import the news items in to",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="The format of the file. Defaults to the file extension",
+        )
+        parser.add_argument(
+            "--draft",
+            action="store_true",
+            help="Import the news items as drafts instead of publishing them",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, **options):
+        self.verbosity = options["verbosity"]
+        self.chunk_size = options["chunk_size"]
+        self.live = not options["draft"]
+
+        try:
+            self.newsindex = (
+                Page.objects.type(NewsIndexMixin).specific().get(pk=options["index"])
+            )
+        except Page.DoesNotExist:
+            raise CommandError("No news index with ID {}".format(options["index"]))
+        self.NewsItem = self.newsindex.get_newsitem_model()
+        self.Revision = self.NewsItem._meta.get_field("revisions").related_model
+        self.form_class = get_newsitem_edit_handler(self.NewsItem).get_form_class()
+
+        path = options["path"]
+        format = options["format"]
+        if format is None:
+            format = os.path.splitext(path)[1].lstrip(".").lower()
+            if format not in READERS:
+                raise CommandError(
+                    "Can not tell the format of {}, use --format".format(path))
+
+        start = time.perf_counter()
+        self.created_pks = []
+        self.invalid = 0
+        if path == "-":
+            self.import_file(sys.stdin, format)
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                self.import_file(f, format)
+        imported = time.perf_counter()
+
+        self.log("Imported {} {} in {:.1f}s ({:.0f} items/s)".format(
+            len(self.created_pks),
+            self.NewsItem._meta.verbose_name_plural,
+            imported - start,
+            len(self.created_pks) / max(imported - start, 1e-6),
+        ))
+        if self.invalid:
+            self.stderr.write("Skipped {} invalid records".format(self.invalid))
+
+        self.finish()
+        self.log("Indexed and sent signals in {:.1f}s".format(
+            time.perf_counter() - imported))
+
+    def import_file(self, f, format):
+        for chunk in chunked(READERS[format](f), self.chunk_size):
+            newsitems = []
+            for line_number, record, error in chunk:
+                if record is not None:
+                    newsitem, error = self.build_newsitem(record)
+                if error:
+                    self.invalid += 1
+                    self.stderr.write("Line {}: {}".format(line_number, error))
+                    continue
+                newsitems.append(newsitem)
+
+            if newsitems:
+                self.create_newsitems(newsitems)
+                self.created_pks.extend(newsitem.pk for newsitem in newsitems)
+                self.log("Imported {} {}".format(
+                    len(self.created_pks), self.NewsItem._meta.verbose_name_plural),
+                    level=2)
+
+    def get_form_data(self, form_class, record):
+        data = {}
+        for name, value in record.items():
+            field = form_class.base_fields.get(name)
+            if isinstance(field, TagField) and isinstance(value, list):
+                value = edit_string_for_tags([Tag(name=tag) for tag in value])
+            elif value is None:
+                value = ""
+            elif isinstance(value, bool):
+                value = "on" if value else ""
+            data[name] = value
+        return data
+
+    def build_newsitem(self, record):
+        """Validate a record with the edit form, and build an unsaved news item"""
+        instance = self.NewsItem(newsindex=self.newsindex)
+        form = self.form_class(
+            self.get_form_data(self.form_class, record), instance=instance)
+        if not form.is_valid():
+            errors = "; ".join(
+                "{}: {}".format(field, " ".join(messages))
+                for field, messages in form.errors.items()
+            )
+            return None, errors
+
+        newsitem = form.save(commit=False)
+        newsitem.newsindex = self.newsindex
+        newsitem.live = self.live
+        newsitem.has_unpublished_changes = not self.live
+        newsitem.schedule()
+        newsitem.update_teaser()
+        return newsitem, None
+
+    @transaction.atomic
+    def create_newsitems(self, newsitems):
+        """
+        Create a chunk of news items, their child objects and their
+        first revisions, with a few queries for the whole chunk.
+        """
+        now = timezone.now()
+        for newsitem in newsitems:
+            newsitem.last_modified = now
+
+        database = router.db_for_write(self.NewsItem)
+        if connections[database].features.can_return_rows_from_bulk_insert:
+            self.NewsItem.objects.bulk_create(newsitems)
+            self.create_children(newsitems)
+        else:
+            # Child objects and revisions need the pks, which this database
+            # does not return from bulk inserts, such as MySQL.
+            # Saving a news item saves its child objects too.
+            # finish() indexes them, like the bulk created news items
+            with suppressed_indexing():
+                for newsitem in newsitems:
+                    newsitem.save()
+
+        self.Revision.objects.bulk_create([
+            self.Revision(newsitem=newsitem, content_json=newsitem.to_json(),
+                          created_at=now)
+            for newsitem in newsitems
+        ])
+
+    def create_children(self, newsitems):
+        """
+        Create the child objects of a chunk of bulk created news items, such
+        as tags, which were only stored in memory by the form
+        """
+        for relation in get_all_child_relations(self.NewsItem):
+            children = []
+            for newsitem in newsitems:
+                for child in getattr(newsitem, relation.get_accessor_name()).all():
+                    setattr(child, relation.field.attname, newsitem.pk)
+                    children.append(child)
+            if children:
+                relation.related_model.objects.bulk_create(children)
+
+        m2m_relations = get_all_child_m2m_relations(self.NewsItem)
+        if m2m_relations:
+            for newsitem in newsitems:
+                for field in m2m_relations:
+                    getattr(newsitem, field.name).commit()
+
+    def finish(self):
+        """
+        Update the search index and send signals for all the imported news
+        items, a chunk at a time
+        """
+        if self.live:
+            signal = signals.newsitems_published
+        else:
+            signal = signals.newsitems_draft_saved
+        for pks in chunked(self.created_pks, self.chunk_size):
+            newsitems = list(self.NewsItem.objects.filter(pk__in=pks).order_by("pk"))
+            update_index({
+                self.NewsItem: {newsitem.pk: newsitem for newsitem in newsitems}})
+            if self.live:
+                # News items dated in the future were scheduled instead
+                newsitems = [newsitem for newsitem in newsitems if newsitem.live]
+            if newsitems:
+                signal.send(sender=self.NewsItem, instances=newsitems)
+
+    def log(self, message, level=1):
+        if self.verbosity >= level:
+            self.stdout.write(message)
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+
+from wagtailnews import signals
+from wagtailnews.bulk import publish_scheduled_newsitems
+from wagtailnews.models import get_newsitem_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Make news items that were published with a date in the future live, "
+        "once that date has passed. Run this regularly, for example every "
+        "minute from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--schedule-existing",
+            action="store_true",
+            help="First schedule any live news items dated in the future, "
+            "such as those published before scheduling was added",
+        )
+
+    def handle(self, **options):
+        now = timezone.now()
+        for NewsItem in get_newsitem_models():
+            if options["schedule_existing"]:
+                count = NewsItem.objects.filter(live=True, date__gt=now).update(
+                    live=False, go_live_at=F("date"), last_modified=now
+                )
+                if count and options["verbosity"] >= 1:
+                    self.stdout.write("Scheduled {} {}".format(
+                        count, NewsItem._meta.verbose_name_plural))
+
+            newsitems = publish_scheduled_newsitems(NewsItem.objects.all(), now=now)
+            if newsitems:
+                signals.newsitems_published.send(sender=NewsItem, instances=newsitems)
+            if options["verbosity"] >= 1:
+                self.stdout.write("Published {} scheduled {}".format(
+                    len(newsitems), NewsItem._meta.verbose_name_plural))
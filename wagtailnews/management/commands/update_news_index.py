@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from wagtail.search.backends import get_search_backends_with_name
+
+from wagtailnews.models import get_newsitem_models
+from wagtailnews.search import run_concurrently
+
+
+class Checkpoint:
+    """
+    The progress of a reindex of each news item model, saved to a JSON file
+    after every chunk so an interrupted reindex can carry on where it stopped.
+
+    Once a news item model is reindexed, the time its reindex started is
+    kept as its watermark for the next run. Each model has its own
+    watermark, so reindexing only some models never skips the changes to
+    the others.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.state = json.load(f)
+
+    def get(self, model):
+        return self.state.get(model._meta.label_lower, {})
+
+    def in_progress(self, model):
+        return "started_at" in self.get(model)
+
+    def watermark(self, model):
+        return self.get(model).get("watermark")
+
+    def since(self, model):
+        return self.get(model).get("since")
+
+    def last_pk(self, model):
+        return self.get(model).get("last_pk")
+
+    def start(self, model, since):
+        with self.lock:
+            self.state[model._meta.label_lower] = {
+                "since": since,
+                "started_at": timezone.now().isoformat(),
+                "last_pk": None,
+            }
+            self.save()
+
+    def update(self, model, last_pk):
+        with self.lock:
+            self.state[model._meta.label_lower]["last_pk"] = last_pk
+            self.save()
+
+    def finish(self, model):
+        with self.lock:
+            label = model._meta.label_lower
+            self.state[label] = {"watermark": self.state[label]["started_at"]}
+            self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Update the search index for news items modified since the last run. "
+        "Progress is saved after every chunk, and an interrupted run is "
+        "resumed the next time the command is run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--state-file",
+            default=".update_news_index.json",
+            help="Where to keep the watermark and checkpoints between runs",
+        )
+        parser.add_argument(
+            "--since",
+            help="Index news items modified after this ISO 8601 date and time, "
+            "instead of after the last run",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Index all news items, ignoring the last run",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Only index this news item model, as app_label.ModelName. "
+            "Can be repeated",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--parallel",
+            type=int,
+            default=1,
+            help="Index this many news item models at a time",
+        )
+
+    def handle(self, **options):
+        self.verbosity = options["verbosity"]
+        self.chunk_size = options["chunk_size"]
+        self.backends = list(get_search_backends_with_name())
+
+        models = get_newsitem_models()
+        if options["models"]:
+            labels = {label.lower() for label in options["models"]}
+            models = [model for model in models if model._meta.label_lower in labels]
+            if not models:
+                raise CommandError("No news item models match {}".format(
+                    ", ".join(options["models"])))
+
+        if options["since"] and parse_datetime(options["since"]) is None:
+            raise CommandError("Invalid date: {}".format(options["since"]))
+
+        self.checkpoint = Checkpoint(options["state_file"])
+        for model in models:
+            if self.checkpoint.in_progress(model) and not (
+                options["since"] or options["all"]
+            ):
+                self.log("Resuming the run of {} started at {}".format(
+                    model._meta.verbose_name_plural,
+                    self.checkpoint.get(model)["started_at"]))
+            elif options["all"]:
+                self.checkpoint.start(model, None)
+            elif options["since"]:
+                self.checkpoint.start(model, options["since"])
+            else:
+                self.checkpoint.start(model, self.checkpoint.watermark(model))
+
+        run_concurrently(
+            [self.index_fn(model) for model in models],
+            max_workers=options["parallel"],
+        )
+
+    def index_fn(self, model):
+        return lambda: self.index_model(model)
+
+    def index_model(self, model):
+        start = time.perf_counter()
+        since = self.checkpoint.since(model)
+        if since:
+            self.log("Indexing {} modified since {}".format(
+                model._meta.verbose_name_plural, since))
+        else:
+            self.log("Indexing all {}".format(model._meta.verbose_name_plural))
+
+        newsitems = model.get_indexed_objects().order_by("pk")
+        if since:
+            newsitems = newsitems.filter(last_modified__gte=parse_datetime(since))
+        last_pk = self.checkpoint.last_pk(model)
+        if last_pk is not None:
+            newsitems = newsitems.filter(pk__gt=last_pk)
+
+        count = 0
+        chunk = []
+        for newsitem in newsitems.iterator(chunk_size=self.chunk_size):
+            chunk.append(newsitem)
+            if len(chunk) >= self.chunk_size:
+                count += self.index_chunk(model, chunk)
+                chunk = []
+        if chunk:
+            count += self.index_chunk(model, chunk)
+
+        self.checkpoint.finish(model)
+        self.log("Indexed {} {} in {:.1f}s".format(
+            count, model._meta.verbose_name_plural, time.perf_counter() - start))
+
+    def index_chunk(self, model, chunk):
+        for backend_name, backend in self.backends:
+            backend.add_bulk(model, chunk)
+        self.checkpoint.update(model, chunk[-1].pk)
+        return len(chunk)
+
+    def log(self, message):
+        if self.verbosity >= 1:
+            self.stdout.write(message)
@@ -3,29 +3,76 @@ import os
 import warnings
 from urllib.parse import quote, urlparse
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.db import models
-from django.http import Http404, HttpResponsePermanentRedirect
+from django.db import models, router
+from django.db.models import Count, Min, OuterRef, Q, Subquery
+from django.db.models.functions import TruncDate
+from django.http import Http404, HttpResponsePermanentRedirect, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.utils import timezone
-from django.utils.html import format_html, mark_safe
-from django.utils.text import slugify
+from django.utils.cache import patch_cache_control
+from django.utils.html import format_html, mark_safe, strip_tags
+from django.utils.text import Truncator, slugify
 from django.utils.translation import gettext_lazy as _
 from modelcluster.models import ClusterableModel
+from taggit.managers import TaggableManager
 from wagtail.admin.panels import FieldPanel
 from wagtail.contrib.routable_page.models import RoutablePageMixin, route
 from wagtail.coreutils import resolve_model_string
 from wagtail.models import Page, PreviewableMixin
 from wagtail.search import index
 
-from . import feeds
-from .conf import paginate
+from . import cache, feeds, indexing, keyset, replica, streaming
+from .conf import apaginate, get_setting, paginate
 from .deprecation import DeprecatedCallableStr
 
 NEWSINDEX_MODEL_CLASSES = []
 
+# Always fetched for news item listings, as the URL and cache version need them
+LISTING_URL_FIELDS = ["newsindex", "date", "live", "last_modified"]
+
+# How much of the date each archive route covers, as date.timetuple() parts
+ARCHIVE_PARTS = {"year": 1, "month": 2, "day": 3}
+
+
+def get_newsitem_models():
+    """Get the news item models of all the news index models"""
+    return list(dict.fromkeys(
+        NewsIndex.get_newsitem_model() for NewsIndex in NEWSINDEX_MODEL_CLASSES))
+
+
+def get_newsitem_tags_field(NewsItem):
+    """
+    Get the ``TaggableManager`` field of a news item model, as found by its
+    news index model, or ``None`` if the news items are not tagged
+    """
+    for NewsIndex in NEWSINDEX_MODEL_CLASSES:
+        if NewsIndex.get_newsitem_model() is NewsItem:
+            return NewsIndex.get_newsitem_tags_field()
+    return None
+
+
+def set_newsindex(newsitem, newsindex):
+    """
+    Set the news index of a news item without fetching it again. The news
+    item may have been read from a replica, so this skips the check that
+    both come from the same database.
+    """
+    newsitem._meta.get_field("newsindex").set_cached_value(newsitem, newsindex)
+
+
+def archive_has_newsitems(archive_counts, view, date):
+    """
+    Check if the year, month or day archive of a date has any news items,
+    from the counts of :meth:`NewsIndexMixin.get_archive_counts`
+    """
+    parts = ARCHIVE_PARTS[view]
+    key = date.timetuple()[:parts]
+    return any(day.timetuple()[:parts] == key for day in archive_counts)
+
 
 def get_date_or_404(year, month, day):
     """Try to make a date from the given inputs, raising Http404 on error"""
@@ -43,16 +90,272 @@ class NewsIndexMixin(RoutablePageMixin):
     newsitem_model = None
     subpage_types = []
 
+    # What the index and archive routes fetch for each news item.
+    # The fields needed for the news item URL are always fetched
+    listing_fields = None
+    listing_select_related = []
+    listing_prefetch = []
+
+    # Whether the index and archive routes stream their listings, and how
+    # many news items to fetch and send at a time. See streaming.py
+    listing_stream = False
+    listing_stream_chunk_size = 100
+
+    # What the archive routes do for a date without news items: "render" an
+    # empty listing, raise a "404", or serve a "cache"d empty listing.
+    # See get_empty_archive_response()
+    empty_archives = "render"
+
+    # The news item fields the api route can return, and the news items
+    # on each page of it
+    api_fields = ["date", "teaser", "excerpt"]
+    api_limit = 20
+    api_max_limit = 100
+
+    # The database the public routes read news items from, set for each
+    # request by serve(). None is the default database
+    newsitem_database = None
+
     def get_newsitems(self):
         """Get all the news items for this news index"""
-        return self.get_newsitem_model().objects.filter(newsindex=self)
+        newsitems = self.get_newsitem_model().objects.filter(newsindex=self)
+        if self.newsitem_database is not None:
+            newsitems = newsitems.using(self.newsitem_database)
+        return newsitems
 
     def get_newsitems_for_display(self):
         """
         Get the news items that should be shown on for this news index, before
         filtering and pagination.
         """
-        return self.get_newsitems().live().filter(date__lte=timezone.now())
+        return self.get_newsitems().live()
+
+    def get_listing_newsitems(self, newsitems):
+        """
+        Fetch only what the listings of the index and archive routes use,
+        as set by :attr:`listing_fields`, :attr:`listing_select_related` and
+        :attr:`listing_prefetch`.
+        """
+        if self.listing_fields is not None:
+            # Related objects can not be selected if their foreign key is deferred
+            related = [path.split("__")[0] for path in self.listing_select_related]
+            newsitems = newsitems.only(
+                *self.get_url_fields(), *related, *self.listing_fields
+            )
+        if self.listing_select_related:
+            newsitems = newsitems.select_related(*self.listing_select_related)
+        if self.listing_prefetch:
+            newsitems = newsitems.prefetch_related(*self.listing_prefetch)
+        return newsitems
+
+    @classmethod
+    def get_url_fields(cls):
+        """
+        Get the news item fields needed to build news item URLs, which are
+        always fetched when only some fields are
+        """
+        return LISTING_URL_FIELDS + list(cls.get_newsitem_model().slug_fields)
+
+    @classmethod
+    def get_newsitem_tags_field(cls):
+        """
+        Get the ``TaggableManager`` field of the news item model, such as a
+        ``ClusterTaggableManager``, or ``None`` if news items are not tagged
+        """
+        for field in cls.get_newsitem_model()._meta.get_fields():
+            if isinstance(field, TaggableManager):
+                return field
+        return None
+
+    def get_tag_counts(self):
+        """
+        Get the tags of the live news items in this news index, most used
+        first, with the number of news items tagged with each as
+        ``newsitem_count``
+        """
+        return self.get_cached("tag_counts", self._get_tag_counts)
+
+    def _get_tag_counts(self):
+        field = self.get_newsitem_tags_field()
+        if field is None:
+            return []
+        # Tags joined to the tagged items of a subquery of the news items,
+        # grouped by tag, in one query
+        tagged = field.through._meta.get_field("tag").related_query_name()
+        newsitems = self.get_newsitems_for_display().order_by().values("pk")
+        tags = (
+            field.remote_field.model.objects.using(newsitems.db).filter(**{
+                tagged + "__content_object__in": newsitems,
+            })
+            .annotate(newsitem_count=Count(tagged))
+            .order_by("-newsitem_count", "name")
+        )
+        return list(tags)
+
+    def get_archive_counts(self):
+        """
+        Get the number of live news items in this news index on each day,
+        as a dict of dates in the current time zone to counts
+        """
+        return self.get_cached(
+            "archive_counts",
+            self._get_archive_counts,
+            timezone.get_current_timezone_name(),
+        )
+
+    async def aget_archive_counts(self):
+        """An async version of :meth:`get_archive_counts`"""
+        async def get_archive_counts():
+            return {
+                day: count async for day, count in self._get_archive_count_rows()
+            }
+
+        return await self.aget_cached(
+            "archive_counts",
+            get_archive_counts,
+            timezone.get_current_timezone_name(),
+        )
+
+    def _get_archive_counts(self):
+        return dict(self._get_archive_count_rows())
+
+    def _get_archive_count_rows(self):
+        # Counted on the database written to, as a replica that is behind
+        # would turn the archive of a news item just published into a 404
+        # until the counts expire from the cache
+        database = router.db_for_write(self.get_newsitem_model())
+        return (
+            self.get_newsitems_for_display()
+            .using(database)
+            .annotate(day=TruncDate("date", tzinfo=timezone.get_current_timezone()))
+            .order_by()
+            .values_list("day")
+            .annotate(count=Count("pk"))
+        )
+
+    def get_next_go_live_at(self):
+        """
+        Get the time the next scheduled news item in this news index goes
+        live, or ``None`` if nothing is scheduled.
+        """
+        return self.get_newsitems().filter(go_live_at__isnull=False).aggregate(
+            next_go_live_at=Min("go_live_at")
+        )["next_go_live_at"]
+
+    async def aget_next_go_live_at(self):
+        """An async version of :meth:`get_next_go_live_at`"""
+        result = await self.get_newsitems().filter(go_live_at__isnull=False).aaggregate(
+            next_go_live_at=Min("go_live_at")
+        )
+        return result["next_go_live_at"]
+
+    def get_cache_timeout(self, timeout=None):
+        """
+        Cap a cache timeout in seconds so that anything cached expires when
+        the next scheduled news item goes live. A timeout of ``None`` means
+        cache forever.
+        """
+        return cache.cap_timeout(timeout, self.get_next_go_live_at())
+
+    async def aget_cache_timeout(self, timeout=None):
+        """An async version of :meth:`get_cache_timeout`"""
+        return cache.cap_timeout(timeout, await self.aget_next_go_live_at())
+
+    def add_cache_headers(self, response):
+        """
+        Set the ``Cache-Control`` max-age from the ``WAGTAILNEWS_CACHE_MAX_AGE``
+        setting, capped at the time until the next scheduled news item goes live
+        """
+        max_age = get_setting("CACHE_MAX_AGE")
+        if max_age is not None:
+            patch_cache_control(response, max_age=self.get_cache_timeout(max_age))
+        return response
+
+    async def aadd_cache_headers(self, response):
+        """An async version of :meth:`add_cache_headers`"""
+        max_age = get_setting("CACHE_MAX_AGE")
+        if max_age is not None:
+            max_age = await self.aget_cache_timeout(max_age)
+            patch_cache_control(response, max_age=max_age)
+        return response
+
+    def get_cache_key(self, *parts):
+        """
+        Make a cache key for something derived from the news items in this
+        news index. The key changes whenever a news item in this news index
+        is published, unpublished or deleted.
+        """
+        return cache.make_cache_key(self.pk, *parts)
+
+    def get_cached(self, name, func, *vary_on):
+        """
+        Get something derived from the news items in this news index from the
+        cache, or call ``func()`` and cache what it returns. Nothing is cached
+        unless the ``WAGTAILNEWS_CACHE_TIMEOUT`` setting is set.
+        """
+        timeout = get_setting("CACHE_TIMEOUT")
+        if timeout is None:
+            return func()
+        key = self.get_cache_key(name, *vary_on)
+        value = cache.get_cache().get(key)
+        if value is None:
+            value = func()
+            cache.get_cache().set(key, value, self.get_cache_timeout(timeout))
+        return value
+
+    async def aget_cached(self, name, func, *vary_on):
+        """
+        An async version of :meth:`get_cached`, using the async cache API.
+        ``func`` is awaited for the value to cache.
+        """
+        timeout = get_setting("CACHE_TIMEOUT")
+        if timeout is None:
+            return await func()
+        key = await cache.amake_cache_key(self.pk, name, *vary_on)
+        value = await cache.get_cache().aget(key)
+        if value is None:
+            value = await func()
+            timeout = await self.aget_cache_timeout(timeout)
+            await cache.get_cache().aset(key, value, timeout)
+        return value
+
+    def get_read_database(self, request):
+        """
+        Get the database alias the public routes read news items from for a
+        request, or ``None`` for the default database. This is the
+        ``WAGTAILNEWS_REPLICA_DATABASE`` setting, except for editors, previews
+        and sessions that just changed some news items.
+        """
+        return replica.get_read_database(request)
+
+    def serve(self, request, *args, **kwargs):
+        self.newsitem_database = self.get_read_database(request)
+        return super().serve(request, *args, **kwargs)
+
+    async def aserve(self, request, view=None, args=None, kwargs=None):
+        """
+        Serve a route from an async view, such as
+        :func:`wagtailnews.views.serve.serve`. Routes with an async version,
+        named like the route with an ``a`` in front, are awaited.
+        Other routes are served in a thread.
+        """
+        async_view = None if view is None else self._get_async_view(view)
+        if async_view is None:
+            return await sync_to_async(self.serve)(request, view, args, kwargs)
+
+        self.newsitem_database = await sync_to_async(self.get_read_database)(request)
+        return await async_view(request, *(args or []), **(kwargs or {}))
+
+    def _get_async_view(self, view):
+        # A route overridden without its async version is served by the
+        # override, not by an async version from further up
+        name = view.__name__
+        for cls in type(self).__mro__:
+            if "a" + name in vars(cls):
+                return getattr(self, "a" + name)
+            if name in vars(cls):
+                return None
+        return None
 
     def get_template(self, request, view="all", **kwargs):
         template = super(NewsIndexMixin, self).get_template(
@@ -71,47 +374,271 @@ class NewsIndexMixin(RoutablePageMixin):
         return context
 
     def paginate_newsitems(self, request, newsitem_list):
-        paginator, page = paginate(request, newsitem_list)
+        return self._get_page_context(*paginate(request, newsitem_list))
+
+    async def apaginate_newsitems(self, request, newsitem_list):
+        """
+        An async version of ``paginate_newsitems``. The news items on the
+        page are fetched before it returns.
+        """
+        return self._get_page_context(*await apaginate(request, newsitem_list))
+
+    def _get_page_context(self, paginator, page):
+        for newsitem in page.object_list:
+            # Saves a query for each news item when building its URL
+            if newsitem.newsindex_id == self.pk:
+                set_newsindex(newsitem, self)
         return {
             "paginator": paginator,
             "newsitem_page": page,
             "newsitem_list": page.object_list,
         }
 
-    def respond(self, request, view, newsitems, extra_context={}):
-        """A helper that takes some news items and returns an HttpResponse"""
+    def respond(self, request, view, newsitems, extra_context={}, stream=None):
+        """
+        A helper that takes some news items and returns an HttpResponse.
+        The response is streamed if ``stream`` is true, which defaults to
+        :attr:`listing_stream`.
+        """
+        if stream is None:
+            stream = self.listing_stream
+        if stream:
+            return self.add_cache_headers(
+                self.stream_response(request, view, newsitems, extra_context)
+            )
         context = self.get_context(request, view=view)
         context.update(self.paginate_newsitems(request, newsitems))
         context.update(extra_context)
         template = self.get_template(request, view=view)
-        return TemplateResponse(request, template, context)
+        return self.add_cache_headers(TemplateResponse(request, template, context))
+
+    def stream_response(self, request, view, newsitems, extra_context={}):
+        """
+        Render a page of news items to a ``StreamingHttpResponse``. The news
+        items in the ``{% stream_newsitems %}`` tag of the template are
+        fetched and rendered a chunk at a time, after the page up to the tag
+        is sent.
+        """
+        paginator, page = paginate(request, newsitems)
+
+        def prepare(newsitem):
+            # Saves a query for each news item when building its URL
+            if newsitem.newsindex_id == self.pk:
+                set_newsindex(newsitem, self)
+
+        context = self.get_context(request, view=view)
+        context.update({
+            "paginator": paginator,
+            "newsitem_page": page,
+            # Not fetched until it is streamed
+            "newsitem_list": page.object_list,
+        })
+        context.update(extra_context)
+        template = self.get_template(request, view=view)
+        stream = streaming.NewsItemStream(self.listing_stream_chunk_size, prepare)
+        return streaming.stream_template_response(request, template, context, stream)
+
+    async def arespond(self, request, view, newsitems, extra_context={}):
+        """An async version of :meth:`respond`"""
+        # get_context() may be overridden to query the database
+        context = await sync_to_async(self.get_context)(request, view=view)
+        context.update(await self.apaginate_newsitems(request, newsitems))
+        context.update(extra_context)
+        template = self.get_template(request, view=view)
+        response = TemplateResponse(request, template, context)
+        return await self.aadd_cache_headers(response)
+
+    def get_empty_archive_response(self, request, view, date):
+        """
+        Check the archive for a date against :meth:`get_archive_counts`
+        before fetching any news items, and handle it as set by
+        :attr:`empty_archives` if it has none. Returns ``None`` when the
+        archive should be rendered as usual.
+        """
+        if self.empty_archives == "render":
+            return None
+        if archive_has_newsitems(self.get_archive_counts(), view, date):
+            return None
+        if self.empty_archives == "404":
+            raise Http404
+        response = self.get_cached(
+            "empty_archive",
+            lambda: self.render_empty_archive(request, view, date),
+            view,
+            date.isoformat(),
+            request.scheme,
+            request.get_host(),
+        )
+        return self.add_cache_headers(response)
+
+    async def aget_empty_archive_response(self, request, view, date):
+        """An async version of :meth:`get_empty_archive_response`"""
+        if self.empty_archives == "render":
+            return None
+        if archive_has_newsitems(await self.aget_archive_counts(), view, date):
+            return None
+        if self.empty_archives == "404":
+            raise Http404
+        # Templates are rendered in a thread. Cache hits do not need one
+        render = sync_to_async(lambda: self.render_empty_archive(request, view, date))
+        response = await self.aget_cached(
+            "empty_archive",
+            render,
+            view,
+            date.isoformat(),
+            request.scheme,
+            request.get_host(),
+        )
+        return await self.aadd_cache_headers(response)
+
+    def render_empty_archive(self, request, view, date):
+        """
+        Render the archive for a date that has no news items, without
+        querying for them
+        """
+        newsitems = self.get_newsitems().none()
+        context = self.get_context(request, view=view)
+        context.update(self.paginate_newsitems(request, newsitems))
+        context["date"] = date
+        template = self.get_template(request, view=view)
+        return TemplateResponse(request, template, context).render()
 
     @route(r"^$", name="index")
     def v_index(self, request):
-        return self.respond(request, "all", self.get_newsitems_for_display())
+        newsitems = self.get_listing_newsitems(self.get_newsitems_for_display())
+        return self.respond(request, "all", newsitems)
+
+    async def av_index(self, request):
+        newsitems = self.get_listing_newsitems(self.get_newsitems_for_display())
+        return await self.arespond(request, "all", newsitems)
 
     @route(r"^(?P<year>\d{4})/$", name="year")
     def v_year(self, request, year):
         date = get_date_or_404(year, 1, 1)
-        newsitems = self.get_newsitems_for_display().filter(date__year=year)
+        response = self.get_empty_archive_response(request, "year", date)
+        if response is not None:
+            return response
+        newsitems = self.get_listing_newsitems(
+            self.get_newsitems_for_display().filter(date__year=year)
+        )
         return self.respond(request, "year", newsitems, {"date": date})
 
+    async def av_year(self, request, year):
+        date = get_date_or_404(year, 1, 1)
+        response = await self.aget_empty_archive_response(request, "year", date)
+        if response is not None:
+            return response
+        newsitems = self.get_listing_newsitems(
+            self.get_newsitems_for_display().filter(date__year=year)
+        )
+        return await self.arespond(request, "year", newsitems, {"date": date})
+
     @route(r"^(?P<year>\d{4})/(?P<month>\d{1,2})/$", name="month")
     def v_month(self, request, year, month):
         date = get_date_or_404(year, month, 1)
-        newsitems = self.get_newsitems_for_display().filter(
-            date__year=year, date__month=month
+        response = self.get_empty_archive_response(request, "month", date)
+        if response is not None:
+            return response
+        newsitems = self.get_listing_newsitems(
+            self.get_newsitems_for_display().filter(date__year=year, date__month=month)
         )
         return self.respond(request, "month", newsitems, {"date": date})
 
+    async def av_month(self, request, year, month):
+        date = get_date_or_404(year, month, 1)
+        response = await self.aget_empty_archive_response(request, "month", date)
+        if response is not None:
+            return response
+        newsitems = self.get_listing_newsitems(
+            self.get_newsitems_for_display().filter(date__year=year, date__month=month)
+        )
+        return await self.arespond(request, "month", newsitems, {"date": date})
+
     @route(r"^(?P<year>\d{4})/(?P<month>\d{1,2})/(?P<day>\d{1,2})/$", name="day")
     def v_day(self, request, year, month, day):
         date = get_date_or_404(year, month, day)
-        newsitems = self.get_newsitems_for_display().filter(
-            date__year=year, date__month=month, date__day=day
+        response = self.get_empty_archive_response(request, "day", date)
+        if response is not None:
+            return response
+        newsitems = self.get_listing_newsitems(
+            self.get_newsitems_for_display().filter(
+                date__year=year, date__month=month, date__day=day
+            )
         )
         return self.respond(request, "day", newsitems, {"date": date})
 
+    async def av_day(self, request, year, month, day):
+        date = get_date_or_404(year, month, day)
+        response = await self.aget_empty_archive_response(request, "day", date)
+        if response is not None:
+            return response
+        newsitems = self.get_listing_newsitems(
+            self.get_newsitems_for_display().filter(
+                date__year=year, date__month=month, date__day=day
+            )
+        )
+        return await self.arespond(request, "day", newsitems, {"date": date})
+
+    @route(r"^tag/(?P<tag>[-\w]+)/$", name="tag")
+    def v_tag(self, request, tag):
+        field = self.get_newsitem_tags_field()
+        if field is None:
+            raise Http404
+        tag = get_object_or_404(field.remote_field.model, slug=tag)
+        # Filter on the tagged items alone, without joining the tags table
+        newsitems = self.get_listing_newsitems(
+            self.get_newsitems_for_display().filter(**{field.name: tag})
+        )
+        return self.respond(request, "tag", newsitems, {"tag": tag})
+
+    @route(r"^api/$", name="api")
+    def v_api(self, request):
+        fields = [name for name in request.GET.get("fields", "").split(",") if name]
+        if not fields:
+            fields = list(self.api_fields)
+        unknown = [name for name in fields if name not in self.api_fields]
+        if unknown:
+            return JsonResponse(
+                {"error": "Unknown fields: {}".format(", ".join(unknown))}, status=400
+            )
+
+        try:
+            limit = int(request.GET.get("limit", self.api_limit))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.api_max_limit:
+            return JsonResponse(
+                {"error": "limit must be between 1 and {}".format(self.api_max_limit)},
+                status=400,
+            )
+
+        newsitems = self.get_newsitems_for_display().only(*self.get_url_fields(), *fields)
+        try:
+            page, cursor = keyset.paginate(newsitems, request.GET.get("cursor"), limit)
+        except keyset.InvalidCursor:
+            return JsonResponse({"error": "Invalid cursor"}, status=400)
+
+        # Resolve the URL of the news index once for the whole page
+        index_url = self.get_url(request)
+        model_fields = [self.get_newsitem_model()._meta.get_field(name) for name in fields]
+        items = []
+        for newsitem in page:
+            set_newsindex(newsitem, self)
+            item = {"id": newsitem.pk, "url": index_url + newsitem.url_suffix()}
+            for field in model_fields:
+                item[field.name] = field.value_from_object(newsitem)
+            items.append(item)
+
+        next_url = None
+        if cursor is not None:
+            query = request.GET.copy()
+            query["cursor"] = cursor
+            next_url = "{}?{}".format(request.path, query.urlencode())
+
+        response = JsonResponse({"items": items, "next": next_url})
+        response = cache.conditional_response(request, response)
+        return self.add_cache_headers(response)
+
     @route(
         r"^(?P<year>\d{4})/(?P<month>\d{1,2})/(?P<day>\d{1,2})/(?P<pk>\d+)-(?P<slug>.*)/$",
         name="post",
@@ -128,9 +655,40 @@ class NewsIndexMixin(RoutablePageMixin):
         # Get the newsitem to serve itself
         return newsitem.serve(request)
 
+    async def av_post(self, request, year, month, day, pk, slug):
+        NewsItem = self.get_newsitem_model()
+        try:
+            newsitem = await self.get_newsitems_for_display().aget(pk=pk)
+        except NewsItem.DoesNotExist:
+            raise Http404
+        set_newsindex(newsitem, self)
+
+        # Building the URL may look up the site root paths
+        newsitem_url = await sync_to_async(lambda: str(newsitem.url))()
+        newsitem_path = urlparse(newsitem_url, allow_fragments=True).path
+        if quote(request.path) != newsitem_path:
+            return HttpResponsePermanentRedirect(newsitem_url)
+
+        return await sync_to_async(newsitem.serve)(request)
+
     @route(r"^rss/$", name="feed")
     def newsfeed(self, request):
-        return self.feed_class(self)(request)
+        response = self.get_cached(
+            "feed",
+            lambda: self.feed_class(self)(request),
+            request.scheme,
+            request.get_host(),
+        )
+        return self.add_cache_headers(response)
+
+    async def anewsfeed(self, request):
+        # The syndication framework is synchronous, so the feed is rendered in
+        # a thread. Cache hits do not need one
+        render = sync_to_async(lambda: self.feed_class(self)(request))
+        response = await self.aget_cached(
+            "feed", render, request.scheme, request.get_host()
+        )
+        return await self.aadd_cache_headers(response)
 
     @classmethod
     def get_newsitem_model(cls):
@@ -170,6 +728,8 @@ class AbstractNewsItemRevision(models.Model):
         # specific revision of it
         obj.live = self.newsitem.live
         obj.has_unpublished_changes = self.newsitem.has_unpublished_changes
+        obj.last_modified = self.newsitem.last_modified
+        obj.go_live_at = self.newsitem.go_live_at
 
         return obj
 
@@ -193,6 +753,7 @@ class AbstractNewsItemRevision(models.Model):
         newsitem.has_unpublished_changes = not self.is_latest_revision()
 
         newsitem.save()
+        return newsitem
 
     def __str__(self):
         return '"{}" at {}'.format(self.newsitem, self.created_at)
@@ -206,15 +767,51 @@ class NewsItemQuerySet(models.QuerySet):
     def live(self):
         return self.filter(live=True)
 
+    def annotate_latest_revision(self):
+        """Annotate each news item with the ``latest_revision_id``"""
+        Revision = self.model._meta.get_field("revisions").related_model
+        revisions = Revision.objects.filter(newsitem=OuterRef("pk")).order_by(
+            "-created_at", "-id"
+        )
+        return self.annotate(latest_revision_id=Subquery(revisions.values("pk")[:1]))
+
 
 class AbstractNewsItem(PreviewableMixin, index.Indexed, ClusterableModel):
     newsindex = models.ForeignKey(Page, on_delete=models.CASCADE)
-    date = models.DateTimeField("Published date", default=timezone.now)
+    # Indexed for the listing order, and previous and next news items
+    date = models.DateTimeField("Published date", default=timezone.now, db_index=True)
 
     live = models.BooleanField(verbose_name=_("Live"), default=True, editable=False)
     has_unpublished_changes = models.BooleanField(
         verbose_name=_("Has unpublished changes"), default=False, editable=False
     )
+    # Not auto_now, as modelcluster calls pre_save() when serialising revisions
+    last_modified = models.DateTimeField(
+        verbose_name=_("Last modified"),
+        default=timezone.now,
+        editable=False,
+        db_index=True,
+    )
+    # Set when a news item dated in the future is published. The
+    # publish_scheduled_news command makes it live once this time has passed
+    go_live_at = models.DateTimeField(
+        verbose_name=_("Go live date/time"),
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+    )
+    # Rendered from the content of the news item by render_teaser() whenever
+    # it is saved, so listings do not have to render the content themselves
+    teaser = models.TextField(verbose_name=_("Teaser"), blank=True, editable=False)
+    excerpt = models.TextField(verbose_name=_("Excerpt"), blank=True, editable=False)
+
+    # The most words to keep from the teaser for the plain text excerpt
+    excerpt_length = 50
+
+    # The fields get_slug() uses, fetched along with the fields needed for the
+    # URL when news items are listed with only some of their fields
+    slug_fields = []
 
     panels = [
         FieldPanel("date"),
@@ -224,6 +821,7 @@ class AbstractNewsItem(PreviewableMixin, index.Indexed, ClusterableModel):
         index.FilterField("date"),
         index.FilterField("newsindex_id"),
         index.FilterField("live"),
+        index.FilterField("last_modified"),
     ]
 
     class Meta:
@@ -232,6 +830,61 @@ class AbstractNewsItem(PreviewableMixin, index.Indexed, ClusterableModel):
 
     objects = NewsItemQuerySet.as_manager()
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "last_modified" in update_fields:
+            self.last_modified = timezone.now()
+        if update_fields is None or "live" in update_fields:
+            self.schedule()
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | {"go_live_at"}
+        if update_fields is None:
+            self.update_teaser()
+        super().save(*args, **kwargs)
+
+    def render_teaser(self):
+        """
+        Render the HTML teaser shown for this news item in listings.
+        Override this to summarise the content of the news item,
+        such as the first paragraph of its body.
+        The default is no teaser.
+        """
+        return ""
+
+    def render_excerpt(self, teaser):
+        """
+        Make the plain text excerpt of this news item from its teaser,
+        for places HTML can not go, such as search results and feeds
+        """
+        return Truncator(strip_tags(teaser)).words(self.excerpt_length)
+
+    def update_teaser(self):
+        """
+        Store the rendered teaser and excerpt on this news item.
+        Called whenever the news item is saved with all its fields or a
+        revision is saved, and by the bulk publish and import tools.
+        """
+        self.teaser = self.render_teaser() or ""
+        self.excerpt = self.render_excerpt(self.teaser)
+
+    def schedule(self, now=None):
+        """
+        Hold back a live news item dated in the future, so it only goes live
+        when the ``publish_scheduled_news`` command runs after that date.
+        """
+        if now is None:
+            now = timezone.now()
+        if self.live and self.date > now:
+            self.live = False
+            self.go_live_at = self.date
+        elif self.live:
+            self.go_live_at = None
+
+    def get_indexed_instance(self):
+        if indexing.defer_update(self):
+            return None
+        return super().get_indexed_instance()
+
     def get_nice_url(self):
         warnings.warn(
             "AbstractNewsItem.get_nice_url() has been renamed to AbstractNewsItem.get_slug()",
@@ -268,6 +921,87 @@ class AbstractNewsItem(PreviewableMixin, index.Indexed, ClusterableModel):
         context = self.get_context(request)
         return TemplateResponse(request, template, context)
 
+    def get_sibling_newsitems(self):
+        """
+        Get the news items that previous, next and related news items are
+        chosen from: the news items shown in the same news index
+        """
+        return self.newsindex.specific.get_newsitems_for_display()
+
+    def get_previous(self):
+        """
+        Get the news item before this one in the news index, by date,
+        or ``None`` if this is the oldest
+        """
+        return self._get_adjacent(
+            Q(date__lt=self.date) | Q(date=self.date, pk__lt=self.pk),
+            ["-date", "-pk"],
+        )
+
+    def get_next(self):
+        """
+        Get the news item after this one in the news index, by date,
+        or ``None`` if this is the newest
+        """
+        return self._get_adjacent(
+            Q(date__gt=self.date) | Q(date=self.date, pk__gt=self.pk),
+            ["date", "pk"],
+        )
+
+    def _get_adjacent(self, keyset, ordering):
+        # Seek from this news item on (date, pk), instead of counting
+        # through the news index
+        newsitem = self.get_sibling_newsitems().filter(keyset).order_by(*ordering).first()
+        if newsitem is not None:
+            set_newsindex(newsitem, self.newsindex)
+        return newsitem
+
+    def get_related(self, n=5):
+        """
+        Get up to ``n`` news items in the news index that share the most tags
+        with this one, newest first among equals
+        """
+        newsindex = self.newsindex.specific
+        newsitems = newsindex.get_cached(
+            "related", lambda: self._get_related(n), self.pk, n
+        )
+        for newsitem in newsitems:
+            set_newsindex(newsitem, self.newsindex)
+        return newsitems
+
+    def _get_related(self, n):
+        field = self.newsindex.specific.get_newsitem_tags_field()
+        if field is None or self.pk is None:
+            return []
+        # Join the tagged items of other news items once, keep the rows for
+        # the tags of this news item, and count them for each news item
+        tagged = field.through._meta.get_field("content_object").related_query_name()
+        tag_ids = field.through.objects.filter(content_object=self.pk).values("tag")
+        newsitems = (
+            self.get_sibling_newsitems()
+            .filter(**{tagged + "__tag__in": tag_ids})
+            .exclude(pk=self.pk)
+            .annotate(shared_tags=Count(tagged))
+            .order_by("-shared_tags", "-date", "-pk")
+        )
+        return list(newsitems[:n])
+
+    def get_cache_version(self):
+        """
+        Get a string that changes whenever the published content of this news
+        item changes, for use in cache keys. This is the latest revision ID
+        when the news item was fetched with ``annotate_latest_revision()``,
+        along with the live state and last modified time.
+        """
+        parts = [
+            "live" if self.live else "draft",
+            self.last_modified.timestamp() if self.last_modified else "",
+        ]
+        latest_revision_id = getattr(self, "latest_revision_id", None)
+        if latest_revision_id is not None:
+            parts.append(latest_revision_id)
+        return "-".join(str(part) for part in parts)
+
     def url_suffix(self):
         if not self.pk:
             # not yet saved (preview)
@@ -304,7 +1038,8 @@ class AbstractNewsItem(PreviewableMixin, index.Indexed, ClusterableModel):
         return None
 
     def save_revision(self, user=None, changed=True):
-        # Create revision
+        # Create revision, with the teaser for its content
+        self.update_teaser()
         revision = self.revisions.create(content_json=self.to_json(), user=user)
 
         if changed:
@@ -325,15 +1060,25 @@ class AbstractNewsItem(PreviewableMixin, index.Indexed, ClusterableModel):
             return self
 
     def unpublish(self, commit=True):
-        if self.live:
+        if self.live or self.go_live_at:
             self.live = False
             self.has_unpublished_changes = True
+            self.go_live_at = None
 
             if commit:
-                self.save(update_fields=["live", "has_unpublished_changes"])
+                self.save(
+                    update_fields=[
+                        "live",
+                        "has_unpublished_changes",
+                        "go_live_at",
+                        "last_modified",
+                    ]
+                )
 
     @property
     def status_string(self):
+        if self.go_live_at:
+            return _("scheduled")
         if not self.live:
             return _("draft")
         else:
@@ -364,7 +1109,7 @@ class AbstractNewsItem(PreviewableMixin, index.Indexed, ClusterableModel):
                         },
                     ),
                     "primary": False,
-                    "text": _("draft"),
+                    "text": _("scheduled") if self.go_live_at else _("draft"),
                 }
             )
 
@@ -1,5 +1,13 @@
+from django.db.models import Q
+from wagtail.models import Page
+
+from .conf import get_setting
 from .models import NEWSINDEX_MODEL_CLASSES
 
+#: Wagtail page permissions that grant access to the news of a news index,
+#: when per-index permissions are enabled
+NEWSINDEX_PAGE_PERMISSIONS = ["add_page", "change_page", "publish_page"]
+
 
 def format_perm(model, action):
     """
@@ -54,3 +62,75 @@ def perms_for_template(request, NewsItem):
         action: request.user.has_perm(format_perm(NewsItem, action))
         for action in ["add", "change", "delete"]
     }
+
+
+def newsindex_permissions_enabled():
+    """
+    Check if access to news items is restricted per news index, using the
+    Wagtail page permissions on the news index.
+    """
+    return bool(get_setting("INDEX_PERMISSIONS", False))
+
+
+def get_permitted_page_paths(user):
+    """
+    Get the tree paths of all the pages the user has been granted one of the
+    :data:`NEWSINDEX_PAGE_PERMISSIONS` on. A permission on a page applies to
+    all of its descendants as well.
+
+    This is evaluated for all pages in one query,
+    and is cached on the user object for the rest of the request.
+    """
+    try:
+        return user._wagtailnews_page_paths
+    except AttributeError:
+        pass
+
+    if not user.is_active:
+        paths = []
+    else:
+        paths = list(
+            Page.objects.filter(
+                group_permissions__group__user=user,
+                group_permissions__permission__codename__in=NEWSINDEX_PAGE_PERMISSIONS,
+            )
+            .values_list("path", flat=True)
+            .distinct()
+        )
+
+    user._wagtailnews_page_paths = paths
+    return paths
+
+
+def filter_newsindexes(user, queryset):
+    """
+    Filter a queryset of news index pages down to those the user can manage
+    the news for. Model permissions are not checked here.
+    """
+    if not newsindex_permissions_enabled() or user.is_superuser:
+        return queryset
+
+    paths = get_permitted_page_paths(user)
+    if not paths:
+        return queryset.none()
+
+    path_filter = Q()
+    for path in paths:
+        path_filter |= Q(path__startswith=path)
+    return queryset.filter(path_filter)
+
+
+def user_can_edit_newsindex(user, newsindex):
+    """
+    Check if the user has permission to edit the news items of a particular
+    news index.
+    """
+    if not user_can_edit_newsitem(user, newsindex.get_newsitem_model()):
+        return False
+
+    if not newsindex_permissions_enabled() or user.is_superuser:
+        return True
+
+    return any(
+        newsindex.path.startswith(path) for path in get_permitted_page_paths(user)
+    )
@@ -0,0 +1,69 @@
+"""
+Read the news items shown on the public site from a database replica.
+
+When the ``WAGTAILNEWS_REPLICA_DATABASE`` setting names a database alias,
+the public routes of news indexes read their news items from that database.
+Everything else stays on the default database: the admin, previews, anyone
+who can use the admin browsing the site, and any session that changed news
+items in the last ``WAGTAILNEWS_REPLICA_LAG`` seconds, so that editors always
+see their own changes even if the replica is behind.
+"""
+import time
+
+from django.conf import settings
+
+from .conf import get_setting
+
+SESSION_KEY = "wagtailnews_wrote_at"
+
+
+def get_replica_database():
+    """The database alias to read public news items from, if any"""
+    return get_setting("REPLICA_DATABASE")
+
+
+def _has_session(request):
+    # Visitors without a session cookie have not changed anything. Not
+    # touching their session keeps ``Vary: Cookie`` off public responses
+    if not hasattr(request, "session"):
+        return False
+    return settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+def record_write(request):
+    """
+    Note that the session of a request just changed some news items,
+    so it reads from the default database until the replica catches up
+    """
+    if get_replica_database() is None or not hasattr(request, "session"):
+        return
+    request.session[SESSION_KEY] = time.time()
+
+
+def wrote_recently(request):
+    """Check if the session of a request changed news items recently"""
+    if not _has_session(request):
+        return False
+    wrote_at = request.session.get(SESSION_KEY)
+    if wrote_at is None:
+        return False
+    return time.time() - wrote_at < get_setting("REPLICA_LAG", 30)
+
+
+def get_read_database(request):
+    """
+    Get the database alias to read public news items from for a request,
+    or ``None`` to use the default database
+    """
+    alias = get_replica_database()
+    if alias is None:
+        return None
+    if getattr(request, "is_preview", False):
+        return None
+    if _has_session(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.has_perm("wagtailadmin.access_admin"):
+            return None
+        if wrote_recently(request):
+            return None
+    return alias
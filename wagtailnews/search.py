@@ -0,0 +1,154 @@
+"""
+Search news items across all news item models at once.
+
+Search backends can only search one model at a time, so each news item model
+is searched separately and the results are merged by their relevance score.
+"""
+import base64
+import binascii
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, connections
+from wagtail.search.backends import get_search_backend
+
+from .conf import get_setting
+
+SCORE_FIELD = "_wagtailnews_score"
+
+
+def encode_cursor(offsets):
+    """Encode the per-queryset result offsets as an opaque, URL-safe string"""
+    data = json.dumps(offsets, sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by :func:`encode_cursor`.
+    Invalid cursors start the search again from the beginning.
+    """
+    if not cursor:
+        return {}
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offsets = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, binascii.Error):
+        return {}
+    if not isinstance(offsets, dict):
+        return {}
+    return {
+        str(key): offset
+        for key, offset in offsets.items()
+        if isinstance(offset, int) and offset >= 0
+    }
+
+
+def _in_thread(fn):
+    def run():
+        try:
+            return fn()
+        finally:
+            # Each thread gets its own database connections, which would
+            # otherwise be leaked when the thread finishes
+            connections.close_all()
+
+    return run
+
+
+def run_concurrently(fns, max_workers=None):
+    """
+    Call each function in ``fns`` and return a list of the results.
+
+    The functions run in a thread pool of ``max_workers`` threads,
+    defaulting to the ``WAGTAILNEWS_SEARCH_THREADS`` setting.
+    They run one after another when threads are disabled, or when in a
+    transaction: the connections of other threads can not see any
+    uncommitted changes made in this one.
+    """
+    if max_workers is None:
+        max_workers = get_setting("SEARCH_THREADS", 4)
+    max_workers = min(max_workers, len(fns))
+    if max_workers <= 1 or connection.in_atomic_block:
+        return [fn() for fn in fns]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_in_thread(fn)) for fn in fns]
+        return [future.result() for future in futures]
+
+
+class NewsItemSearchResults:
+    """One page of merged search results"""
+
+    def __init__(self, results, next_cursor):
+        self.results = results
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __len__(self):
+        return len(self.results)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def search_newsitems(querysets, query, cursor=None, page_size=20, backend=None):
+    """
+    Autocomplete search ``query`` against a list of news item querysets,
+    one for each news item model, and merge the results by relevance.
+
+    Returns a page of at most ``page_size`` results.
+    The ``next_cursor`` of the results can be passed back in as ``cursor``
+    to fetch the next page.
+    """
+    if backend is None:
+        backend = get_search_backend()
+
+    offsets = decode_cursor(cursor)
+    # Offsets are kept by the position of each queryset, as several
+    # querysets can be of the same model
+    keys = [str(index) for index in range(len(querysets))]
+
+    def search_fn(queryset, offset):
+        def search():
+            results = backend.autocomplete(query, queryset).annotate_score(SCORE_FIELD)
+            # Fetch one extra result to find out if there are more to come
+            return list(results[offset:offset + page_size + 1])
+
+        return search
+
+    result_lists = run_concurrently([
+        search_fn(queryset, offsets.get(key, 0))
+        for key, queryset in zip(keys, querysets)
+    ])
+
+    # Backends that do not support scoring give every result a score of None.
+    # Ties are broken by the rank within each model,
+    # so results from each model are interleaved.
+    candidates = sorted(
+        (
+            (-(getattr(result, SCORE_FIELD, None) or 0), rank, model_index, result)
+            for model_index, results in enumerate(result_lists)
+            for rank, result in enumerate(results[:page_size])
+        ),
+        key=lambda candidate: candidate[:3],
+    )
+    page = [candidate[3] for candidate in candidates[:page_size]]
+
+    taken = [0] * len(querysets)
+    for _score, _rank, model_index, _result in candidates[:page_size]:
+        taken[model_index] += 1
+
+    next_offsets = {}
+    has_more = False
+    for key, results, count in zip(keys, result_lists, taken):
+        next_offsets[key] = offsets.get(key, 0) + count
+        if len(results) > count:
+            has_more = True
+
+    return NewsItemSearchResults(
+        page, encode_cursor(next_offsets) if has_more else None
+    )
@@ -0,0 +1,88 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import pre_delete, pre_save
+from wagtail.signals import page_published, page_unpublished
+
+from . import signals
+from .cache import bump_generation
+from .frontend_cache import (
+    PK_ATTR, PREVIOUS_ATTR, purge_newsitems, stash_deleted_tag_slugs)
+from .models import NEWSINDEX_MODEL_CLASSES, get_newsitem_models
+
+
+def stash_previous(sender, instance, **kwargs):
+    """
+    Remember the saved state of a news item before it is changed, so that
+    the URLs for its old date and slug can be purged as well
+    """
+    if instance.pk is None or hasattr(instance, PREVIOUS_ATTR):
+        return
+    previous = sender._default_manager.filter(pk=instance.pk).first()
+    setattr(instance, PREVIOUS_ATTR, previous)
+
+
+def stash_pk(sender, instance, **kwargs):
+    # Django clears the pk of deleted instances, but the URL needs it.
+    # Their tags are gone by the time the URLs are purged
+    setattr(instance, PK_ATTR, instance.pk)
+    stash_deleted_tag_slugs(instance)
+
+
+def purge_newsitem(sender, instance, **kwargs):
+    transaction.on_commit(lambda: purge_newsitems([instance]))
+
+
+def purge_newsitem_batch(sender, instances, **kwargs):
+    instances = list(instances)
+    if instances:
+        transaction.on_commit(lambda: purge_newsitems(instances))
+
+
+def bump_newsitem_generation(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_generation(instance.newsindex_id))
+
+
+def bump_newsitem_batch_generation(sender, instances, **kwargs):
+    for newsindex_pk in {instance.newsindex_id for instance in instances}:
+        transaction.on_commit(lambda pk=newsindex_pk: bump_generation(pk))
+
+
+def bump_newsindex_generation(sender, instance, **kwargs):
+    # The feed and listings show news index fields, such as the title
+    transaction.on_commit(lambda: bump_generation(instance.pk))
+
+
+def register_signal_handlers():
+    for NewsIndex in NEWSINDEX_MODEL_CLASSES:
+        page_published.connect(bump_newsindex_generation, sender=NewsIndex)
+        page_unpublished.connect(bump_newsindex_generation, sender=NewsIndex)
+    for signal in [
+        signals.newsitem_published,
+        signals.newsitem_unpublished,
+        signals.newsitem_deleted,
+    ]:
+        signal.connect(bump_newsitem_generation)
+    for signal in [
+        signals.newsitems_published,
+        signals.newsitems_unpublished,
+        signals.newsitems_deleted,
+    ]:
+        signal.connect(bump_newsitem_batch_generation)
+
+    if apps.is_installed("wagtail.contrib.frontend_cache"):
+        for NewsItem in get_newsitem_models():
+            pre_save.connect(stash_previous, sender=NewsItem)
+            pre_delete.connect(stash_pk, sender=NewsItem)
+
+        for signal in [
+            signals.newsitem_published,
+            signals.newsitem_unpublished,
+            signals.newsitem_deleted,
+        ]:
+            signal.connect(purge_newsitem)
+        for signal in [
+            signals.newsitems_published,
+            signals.newsitems_unpublished,
+            signals.newsitems_deleted,
+        ]:
+            signal.connect(purge_newsitem_batch)
@@ -4,3 +4,8 @@ newsitem_published = Signal()  # instance, created
 newsitem_unpublished = Signal()  # instance
 newsitem_draft_saved = Signal()  # instance, created
 newsitem_deleted = Signal()  # instance
+
+newsitems_published = Signal()  # instances
+newsitems_unpublished = Signal()  # instances
+newsitems_draft_saved = Signal()  # instances
+newsitems_deleted = Signal()  # instances
@@ -0,0 +1,86 @@
+"""
+List news items in a sitemap.
+
+Wagtail's sitemap only lists pages, so news items need a sitemap of their
+own. :class:`NewsItemSitemap` works with the Wagtail and Django sitemap views,
+including paged sitemap indexes for sites with a lot of news items.
+"""
+from django.db.models import Max
+from wagtail.contrib.sitemaps import Sitemap
+from wagtail.models import Page
+
+
+class NewsItemSitemap(Sitemap):
+    """
+    A sitemap of all the live news items of one news item model,
+    in the live and public news indexes of the current site.
+
+    Subclass this and set ``model``, or pass ``model`` when creating it.
+    """
+
+    model = None
+
+    def __init__(self, request=None, model=None):
+        super().__init__(request)
+        if model is not None:
+            self.model = model
+        self._newsindexes = {}
+
+    def get_newsindexes(self):
+        """The news indexes to list the news items of"""
+        site = self.get_wagtail_site()
+        return site.root_page.get_descendants(inclusive=True).live().public()
+
+    def items(self):
+        return (
+            self.model.objects.live()
+            .filter(newsindex__in=self.get_newsindexes())
+            .order_by("pk")
+        )
+
+    def lastmod(self, obj):
+        return obj.last_modified
+
+    def get_latest_lastmod(self):
+        # Used by the sitemap index. The default would load every news item
+        return self.items().aggregate(latest=Max("last_modified"))["latest"]
+
+    def location(self, obj):
+        newsindex, newsindex_url = self._newsindexes[obj.newsindex_id]
+        obj.newsindex = newsindex
+        return newsindex_url + obj.url_suffix()
+
+    def load_newsindexes(self, newsitems):
+        """
+        Fetch the news indexes of a page of news items in one query, and
+        resolve the URL of each news index once
+        """
+        pks = {newsitem.newsindex_id for newsitem in newsitems}
+        pks.difference_update(self._newsindexes)
+        for newsindex in Page.objects.filter(pk__in=pks).specific():
+            self._newsindexes[newsindex.pk] = (
+                newsindex,
+                newsindex.get_full_url(self.request),
+            )
+
+    def _urls(self, page, protocol, domain):
+        newsitems = list(self.paginator.page(page).object_list)
+        self.load_newsindexes(newsitems)
+
+        urls = []
+        for newsitem in newsitems:
+            if self._newsindexes[newsitem.newsindex_id][1] is None:
+                # The news index is not routable from any site
+                continue
+            urls.append({
+                "item": newsitem,
+                "location": self.location(newsitem),
+                "lastmod": self.lastmod(newsitem),
+                "changefreq": self._get("changefreq", newsitem),
+                "priority": self._get("priority", newsitem) or "",
+                "alternates": [],
+            })
+
+        if urls:
+            self.latest_lastmod = max(url["lastmod"] for url in urls)
+        return urls
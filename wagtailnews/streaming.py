@@ -0,0 +1,83 @@
+"""
+Stream news item listings to the client as they are rendered.
+
+A listing template marks the part repeated for each news item with the
+``{% stream_newsitems %}`` tag. When :meth:`NewsIndexMixin.respond` streams,
+the template is rendered with that part left out, and the response sends the
+page up to it straight away. The news items are then fetched with a queryset
+iterator, and sent in chunks as they are rendered, followed by the rest of
+the page. Neither the news items nor the whole page are held in memory.
+"""
+import uuid
+
+from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
+from django.template import loader
+
+CONTEXT_KEY = "newsitem_stream"
+
+
+class NewsItemStream:
+    """
+    The news items for the ``{% stream_newsitems %}`` tag to stream,
+    in chunks of ``chunk_size``. ``prepare`` is called with each news item
+    before it is rendered.
+    """
+
+    def __init__(self, chunk_size, prepare=None):
+        self.chunk_size = chunk_size
+        self.prepare = prepare
+        self.marker = "<!-- wagtailnews stream {} -->".format(uuid.uuid4().hex)
+        self.captured = None
+
+    def capture(self, node, context, newsitems):
+        """
+        Hold on to what the tag needs to render the news items later,
+        and return the marker to render in their place. Only the first
+        tag in a template is streamed
+        """
+        if self.captured is not None:
+            return None
+        # The template context is popped once rendering finishes
+        self.captured = (node, context.new(context.flatten()), newsitems)
+        return self.marker
+
+    def iter_newsitems(self, newsitems):
+        if isinstance(newsitems, QuerySet):
+            # Fetch in chunks, without keeping every news item
+            newsitems = newsitems.iterator(chunk_size=self.chunk_size)
+        for newsitem in newsitems:
+            if self.prepare is not None:
+                self.prepare(newsitem)
+            yield newsitem
+
+    def render_chunks(self):
+        """Render the captured news items, a chunk at a time"""
+        if self.captured is None:
+            return
+        node, context, newsitems = self.captured
+        chunk = []
+        for newsitem in self.iter_newsitems(newsitems):
+            chunk.append(node.render_newsitem(context, newsitem))
+            if len(chunk) >= self.chunk_size:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+
+
+def stream_template_response(request, template, context, stream):
+    """
+    Render a template to a ``StreamingHttpResponse``, streaming the news
+    items in its ``{% stream_newsitems %}`` tag
+    """
+    context[CONTEXT_KEY] = stream
+    content = loader.render_to_string(template, context, request)
+    head, _, tail = content.partition(stream.marker)
+
+    def generate():
+        yield head
+        yield from stream.render_chunks()
+        yield tail
+
+    return StreamingHttpResponse(generate(), content_type="text/html; charset=utf-8")
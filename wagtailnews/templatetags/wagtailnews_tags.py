@@ -0,0 +1,108 @@
+from django import template
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.template.library import Library
+from django.utils.safestring import mark_safe
+
+from ..cache import cache_newsitem_fragment
+from ..streaming import CONTEXT_KEY
+
+register = Library()
+
+
+class NewsItemCacheNode(template.Node):
+    def __init__(self, nodelist, newsitem, name, vary_on, timeout):
+        self.nodelist = nodelist
+        self.newsitem = newsitem
+        self.name = name
+        self.vary_on = vary_on
+        self.timeout = timeout
+
+    def render(self, context):
+        newsitem = self.newsitem.resolve(context)
+        timeout = DEFAULT_TIMEOUT
+        if self.timeout is not None:
+            timeout = self.timeout.resolve(context)
+        fragment = cache_newsitem_fragment(
+            newsitem,
+            self.name.resolve(context),
+            lambda: self.nodelist.render(context),
+            *[var.resolve(context) for var in self.vary_on],
+            timeout=timeout,
+            request=context.get("request"),
+        )
+        return mark_safe(fragment)
+
+
+@register.tag
+def newsitem_cache(parser, token):
+    """
+    Cache a fragment of a template rendered from a news item,
+    until the news item changes::
+
+        {% newsitem_cache newsitem "teaser" [vary_on ...] [timeout=seconds] %}
+            ...
+        {% endnewsitem_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            "'{}' tag requires a news item and a fragment name".format(bits[0]))
+
+    timeout = None
+    vary_on = []
+    for bit in bits[3:]:
+        if bit.startswith("timeout="):
+            timeout = parser.compile_filter(bit[len("timeout="):])
+        else:
+            vary_on.append(parser.compile_filter(bit))
+
+    nodelist = parser.parse(("endnewsitem_cache",))
+    parser.delete_first_token()
+    return NewsItemCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+        vary_on,
+        timeout,
+    )
+
+
+class StreamNewsItemsNode(template.Node):
+    def __init__(self, nodelist, newsitems, var):
+        self.nodelist = nodelist
+        self.newsitems = newsitems
+        self.var = var
+
+    def render_newsitem(self, context, newsitem):
+        with context.push({self.var: newsitem}):
+            return self.nodelist.render(context)
+
+    def render(self, context):
+        newsitems = self.newsitems.resolve(context)
+        stream = context.get(CONTEXT_KEY)
+        if stream is not None:
+            marker = stream.capture(self, context, newsitems)
+            if marker is not None:
+                return marker
+        return mark_safe("".join(
+            self.render_newsitem(context, newsitem) for newsitem in newsitems))
+
+
+@register.tag
+def stream_newsitems(parser, token):
+    """
+    Render a fragment of a template for each news item in a listing,
+    streaming them to the client when the listing is streamed::
+
+        {% stream_newsitems newsitem_list as newsitem %}
+            ...
+        {% endstream_newsitems %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 4 or bits[2] != "as":
+        raise template.TemplateSyntaxError(
+            "'{}' tag requires a list of news items and 'as' a name".format(bits[0]))
+
+    nodelist = parser.parse(("endstream_newsitems",))
+    parser.delete_first_token()
+    return StreamNewsItemsNode(nodelist, parser.compile_filter(bits[1]), bits[3])
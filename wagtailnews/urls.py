@@ -25,6 +25,12 @@ urlpatterns = [
         editor.NewsItemDeleteView.as_view(),
         name="delete",
     ),
+    re_path(
+        r"^(?P<pk>\d+)/bulk/$",
+        editor.BulkActionView.as_view(),
+        name="bulk_action",
+    ),
+    re_path(r"^(?P<pk>\d+)/export/$", editor.export, name="export"),
     re_path(
         r"^(?P<pk>\d+)/view_draft/(?P<newsitem_pk>.*)/$",
         editor.view_draft,
@@ -3,9 +3,12 @@ import logging
 from django import forms
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
+from django.db.models import Case, Count, Max, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 from wagtail.admin.forms.search import SearchForm
 from wagtail.admin.ui.tables import Column
@@ -17,56 +20,106 @@ from wagtail.search.backends import get_search_backend
 
 from ..models import NEWSINDEX_MODEL_CLASSES, NewsIndexMixin
 from ..permissions import (
-    format_perm, perms_for_template, user_can_edit_news, user_can_edit_newsitem)
+    filter_newsindexes, format_perm, newsindex_permissions_enabled,
+    perms_for_template, user_can_edit_news, user_can_edit_newsindex,
+    user_can_edit_newsitem)
+from ..search import NewsItemSearchResults, search_newsitems
 
 LOGGER = logging.getLogger(__name__)
 
 
 def get_allowed_news_types(user):
-    """Get a list of all NewsIndex models that the user can edit"""
-    return [
+    """
+    Get a list of all NewsIndex models that the user can edit. This is cached
+    on the user object for the rest of the request.
+    """
+    try:
+        return user._wagtailnews_news_types
+    except AttributeError:
+        pass
+
+    user._wagtailnews_news_types = [
         NewsIndex
         for NewsIndex in NEWSINDEX_MODEL_CLASSES
         if user_can_edit_newsitem(user, NewsIndex.get_newsitem_model())
     ]
+    return user._wagtailnews_news_types
+
+
+def get_newsindexes(user):
+    """Get a queryset of all the news index pages that the user can edit"""
+    allowed_news_types = get_allowed_news_types(user)
+    allowed_cts = ContentType.objects.get_for_models(*allowed_news_types).values()
+    return filter_newsindexes(user, Page.objects.filter(content_type__in=allowed_cts))
+
+
+def _newsitem_subquery(NewsItem, aggregate):
+    newsitems = (
+        NewsItem.objects.filter(newsindex=OuterRef("pk"))
+        .order_by()
+        .values("newsindex")
+        .annotate(value=aggregate)
+    )
+    return Subquery(newsitems.values("value"))
+
+
+def annotate_newsitem_stats(queryset, news_types):
+    """
+    Annotate a queryset of news index pages with ``newsitem_count``,
+    ``newsitem_draft_count`` and ``newsitem_latest_date``, using a subquery
+    against the news item model of each news index type.
+    """
+    if not news_types:
+        return queryset
+
+    counts, draft_counts, latest_dates = [], [], []
+    for NewsIndex, ct in ContentType.objects.get_for_models(*news_types).items():
+        NewsItem = NewsIndex.get_newsitem_model()
+        is_draft = Q(live=False) | Q(has_unpublished_changes=True)
+        counts.append(When(
+            content_type=ct,
+            then=_newsitem_subquery(NewsItem, Count("pk"))))
+        draft_counts.append(When(
+            content_type=ct,
+            then=_newsitem_subquery(NewsItem, Count("pk", filter=is_draft))))
+        latest_dates.append(When(
+            content_type=ct,
+            then=_newsitem_subquery(NewsItem, Max("date", filter=Q(live=True)))))
+
+    return queryset.annotate(
+        newsitem_count=Coalesce(Case(*counts), 0),
+        newsitem_draft_count=Coalesce(Case(*draft_counts), 0),
+        newsitem_latest_date=Case(*latest_dates),
+    )
 
 
 def choose(request):
     if not user_can_edit_news(request.user):
         raise PermissionDenied
 
-    allowed_news_types = get_allowed_news_types(request.user)
-
-    allowed_cts = ContentType.objects.get_for_models(*allowed_news_types).values()
-    newsindex_list = Page.objects.filter(content_type__in=allowed_cts).specific()
-    newsindex_count = newsindex_list.count()
+    newsindex_list = list(
+        annotate_newsitem_stats(
+            get_newsindexes(request.user),
+            get_allowed_news_types(request.user),
+        ).specific()
+    )
 
-    if newsindex_count == 1:
-        newsindex = newsindex_list.first()
-        return redirect("wagtailnews:index", pk=newsindex.pk)
+    if len(newsindex_list) == 1:
+        return redirect("wagtailnews:index", pk=newsindex_list[0].pk)
 
     return render(
         request,
         "wagtailnews/choose.html",
         {
-            "has_news": newsindex_count != 0,
-            "newsindex_list": (
-                (newsindex, newsindex.content_type.model_class()._meta.verbose_name)
+            "has_news": bool(newsindex_list),
+            "newsindex_list": [
+                (newsindex, newsindex._meta.verbose_name)
                 for newsindex in newsindex_list
-            ),
+            ],
         },
     )
 
 
-def _search_newsitems(request, newsitem_models, query):
-    backend = get_search_backend()
-
-    for NewsItem in newsitem_models:
-        results = backend.autocomplete(query, NewsItem)[:10]
-        for r in results:
-            yield r
-
-
 def search(request):
     if not user_can_edit_news(request.user):
         raise PermissionDenied
@@ -74,16 +127,29 @@ def search(request):
     query = request.GET.get("q", "")
 
     allowed_news_types = get_allowed_news_types(request.user)
-    # FIXME: this is crap, need to construct a single query for all types
-    # to search by relevance however that's not currently possible in
-    # a backend agnostic way :(
-    newsitem_models = [
+    newsitem_models = list(dict.fromkeys(
         NewsIndex.get_newsitem_model() for NewsIndex in allowed_news_types
-    ]
-    if query:
-        newsitem_results = list(_search_newsitems(request, newsitem_models, query))
+    ))
+
+    newsindex_ids = None
+    if newsindex_permissions_enabled():
+        newsindex_ids = list(
+            get_newsindexes(request.user).values_list("pk", flat=True)
+        )
+
+    querysets = []
+    for NewsItem in newsitem_models:
+        newsitems = NewsItem.objects.all()
+        if newsindex_ids is not None:
+            newsitems = newsitems.filter(newsindex_id__in=newsindex_ids)
+        querysets.append(newsitems)
+
+    if query and querysets:
+        newsitem_results = search_newsitems(
+            querysets, query, cursor=request.GET.get("cursor")
+        )
     else:
-        newsitem_results = []
+        newsitem_results = NewsItemSearchResults([], None)
 
     if request.META.get("HTTP_X_REQUESTED_WITH") == "XMLHttpRequest":
         template = "wagtailnews/newsitem_list.html"
@@ -94,9 +160,8 @@ def search(request):
         request,
         template,
         {
-            "single_result_type": len(newsitem_results) == 1,
-            "single_newsitem_model": len(newsitem_models) == 1,
-            "object_list": newsitem_results,
+            "object_list": newsitem_results.results,
+            "next_cursor": newsitem_results.next_cursor,
             "search_form": SearchForm(request.GET if request.GET else None),
             "query_string": query,
             "is_searching": True,
@@ -115,8 +180,7 @@ class NewsItemIndexView(IndexView):
         self.newsindex = get_object_or_404(
             Page.objects.specific().type(NewsIndexMixin), pk=self.kwargs["pk"]
         )
-        NewsItem = self.newsindex.get_newsitem_model()
-        if not user_can_edit_newsitem(request.user, NewsItem):
+        if not user_can_edit_newsindex(request.user, self.newsindex):
             raise PermissionDenied()
         return super().dispatch(request, *args, **kwargs)
 
@@ -205,17 +269,14 @@ class IndexFilterMixin(forms.Form):
 
 
 class BaseNewsItemChooserMixin:
+    @cached_property
+    def newsindex_list(self):
+        return list(get_newsindexes(self.request.user).specific())
+
     def get_filter_form_class(self):
         filter_class = super().get_filter_form_class()
 
-        allowed_news_types = get_allowed_news_types(self.request.user)
-
-        allowed_cts = ContentType.objects.get_for_models(*allowed_news_types).values()
-        self.newsindex_list = Page.objects.filter(
-            content_type__in=allowed_cts
-        ).specific()
-        newsindex_count = self.newsindex_list.count()
-        if newsindex_count > 1:
+        if len(self.newsindex_list) > 1:
             return type(
                 "FilterForm",
                 (IndexFilterMixin, filter_class),
@@ -225,10 +286,18 @@ class BaseNewsItemChooserMixin:
 
     def get_filter_form(self):
         FilterForm = self.get_filter_form_class()
-        if self.newsindex_list.count() > 1:
+        if len(self.newsindex_list) > 1:
             return FilterForm(self.request.GET, indexes=self.newsindex_list)
         return FilterForm(self.request.GET)
 
+    def get_object_list(self):
+        objects = super().get_object_list()
+        if newsindex_permissions_enabled():
+            objects = objects.filter(
+                newsindex__in=[newsindex.pk for newsindex in self.newsindex_list]
+            )
+        return objects
+
     @property
     def columns(self):
         columns = [self.title_column]
@@ -2,10 +2,15 @@ from functools import lru_cache
 
 from django.core.exceptions import PermissionDenied
 from django.forms import Media
-from django.shortcuts import get_object_or_404
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.formats import date_format
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+from django.views.generic import TemplateView
 from wagtail.admin import messages
 from wagtail.admin.panels import (
     ObjectList, extract_panel_definitions_from_model_class)
@@ -16,10 +21,13 @@ from wagtail.admin.views.generic.preview import \
     PreviewOnEdit as GenericPreviewOnEdit
 from wagtail.models import Page
 
-from wagtailnews.permissions import format_perm, format_perms
+from wagtailnews.permissions import (
+    format_perm, format_perms, user_can_edit_newsindex)
 
-from .. import signals
+from .. import bulk, replica, signals
+from ..export import CONTENT_TYPES, EXPORTERS
 from ..forms import SaveActionSet
+from ..indexing import deferred_indexing
 from ..models import NewsIndexMixin
 
 
@@ -32,11 +40,22 @@ def get_newsitem_edit_handler(NewsItem):
     return ObjectList(panels).bind_to_model(NewsItem)
 
 
+def is_scheduled(newsitem):
+    """Whether the latest revision of a news item is waiting to go live"""
+    if newsitem.live or newsitem.has_unpublished_changes:
+        return False
+    return newsitem.go_live_at is not None
+
+
+def format_go_live_at(newsitem):
+    return date_format(timezone.localtime(newsitem.go_live_at), "DATETIME_FORMAT")
+
+
 class NewItemPermissionMixin:
     def dispatch(self, request, *args, **kwargs):
         if not self.request.user.has_perms(
             format_perms(self.newsindex.get_newsitem_model(), self.permissions_required)
-        ):
+        ) or not user_can_edit_newsindex(self.request.user, self.newsindex):
             raise PermissionDenied()
         return super().dispatch(request, *args, **kwargs)
 
@@ -106,12 +125,20 @@ class NewsItemAdminMixin:
         return get_newsitem_edit_handler(NewsItem)
 
     def save_instance(self):
+        # Publishing saves the news item several times,
+        # but it only needs to be indexed once
+        with deferred_indexing():
+            return self._save_instance()
+
+    def _save_instance(self):
         newsitem = self.form.save(commit=False)
         action = SaveActionSet.from_post_data(self.request.POST)
         created = False
+        was_live = newsitem.live
         if not newsitem.pk:
             # Must be creation
             created = True
+            was_live = False
             newsitem.newsindex = self.newsindex
             newsitem.live = action is SaveActionSet.publish
             newsitem.newsindex = self.newsindex
@@ -122,10 +149,19 @@ class NewsItemAdminMixin:
 
         # TODO replace with DraftStateMixin
         if action is SaveActionSet.publish:
-            revision.publish()
-            signals.newsitem_published.send(
-                sender=NewsItem, instance=newsitem, created=created
-            )
+            published = revision.publish()
+            # News items dated in the future are scheduled instead
+            newsitem.live = published.live
+            newsitem.go_live_at = published.go_live_at
+            newsitem.has_unpublished_changes = published.has_unpublished_changes
+            replica.record_write(self.request)
+            if newsitem.live:
+                signals.newsitem_published.send(
+                    sender=NewsItem, instance=newsitem, created=created
+                )
+            elif was_live:
+                # Taken off the site until it goes live
+                signals.newsitem_unpublished.send(sender=NewsItem, instance=newsitem)
 
         elif action is SaveActionSet.draft:
             signals.newsitem_draft_saved.send(
@@ -155,6 +191,10 @@ class CreateNewsItemView(NewItemPermissionMixin, NewsItemAdminMixin, CreateView)
     def get_success_message(self, instance):
         if instance.live:
             return _('The news post "{0!s}" has been published').format(instance)
+        elif is_scheduled(instance):
+            return _('The news post "{0!s}" has been scheduled to go live on {1}').format(
+                instance, format_go_live_at(instance)
+            )
         else:
             return _('A draft news post "{0!s}" has been created').format(instance)
 
@@ -169,6 +209,10 @@ class EditNewsItemView(NewItemPermissionMixin, NewsItemAdminMixin, EditView):
     def get_success_message(self):
         if self.object.live:
             return _('Your changes to "{0!s}" have been published').format(self.object)
+        elif is_scheduled(self.object):
+            return _('Your changes to "{0!s}" have been scheduled to go live on {1}').format(
+                self.object, format_go_live_at(self.object)
+            )
         else:
             return _('Your changes to "{0!s}" have been saved as a draft').format(
                 self.object
@@ -178,8 +222,10 @@ class EditNewsItemView(NewItemPermissionMixin, NewsItemAdminMixin, EditView):
         return [messages.button(self.get_edit_url(), _("Edit"))]
 
     def get_object(self, queryset=None):
-        self.object = self.newsindex.get_newsitem_model().objects.get(
-            pk=self.kwargs["newsitem_pk"]
+        self.object = get_object_or_404(
+            self.newsindex.get_newsitem_model(),
+            newsindex=self.newsindex,
+            pk=self.kwargs["newsitem_pk"],
         )
         return self.object.get_latest_revision_as_newsitem()
 
@@ -234,10 +280,12 @@ class UnpublishNewsItemView(NewItemPermissionMixin, UnpublishView):
         )
 
     def unpublish(self):
-        self.object.unpublish()
-        signals.newsitem_unpublished.send(
-            sender=self.newsindex.get_newsitem_model(), instance=self.object
-        )
+        with deferred_indexing():
+            self.object.unpublish()
+            replica.record_write(self.request)
+            signals.newsitem_unpublished.send(
+                sender=self.newsindex.get_newsitem_model(), instance=self.object
+            )
 
 
 class NewsItemDeleteView(NewItemPermissionMixin, DeleteView):
@@ -269,14 +317,167 @@ class NewsItemDeleteView(NewItemPermissionMixin, DeleteView):
         return self.object
 
     def delete_action(self):
-        super().delete_action()
-        signals.newsitem_deleted.send(
-            sender=self.newsindex.get_newsitem_model(), instance=self.object
+        with deferred_indexing():
+            super().delete_action()
+            replica.record_write(self.request)
+            signals.newsitem_deleted.send(
+                sender=self.newsindex.get_newsitem_model(), instance=self.object
+            )
+
+
+class BulkActionView(NewItemPermissionMixin, TemplateView):
+    """
+    Publish, unpublish or delete many news items at once.
+    The news items are listed for confirmation on GET, and acted on in bulk
+    on POST.
+    """
+
+    template_name = "wagtailnews/bulk_action.html"
+    actions = {
+        "publish": {
+            "function": bulk.publish_newsitems,
+            "signal": signals.newsitems_published,
+            "permissions": ["change"],
+            "label": _("Publish"),
+            "message": lambda n: ngettext(
+                "%(count)d news post has been published",
+                "%(count)d news posts have been published",
+                n,
+            ),
+            # The function also returns the news items it scheduled,
+            # and those of them that were live before
+            "scheduled_message": lambda n: ngettext(
+                "%(count)d news post has been scheduled",
+                "%(count)d news posts have been scheduled",
+                n,
+            ),
+        },
+        "unpublish": {
+            "function": bulk.unpublish_newsitems,
+            "signal": signals.newsitems_unpublished,
+            "permissions": ["change"],
+            "label": _("Unpublish"),
+            "message": lambda n: ngettext(
+                "%(count)d news post has been unpublished",
+                "%(count)d news posts have been unpublished",
+                n,
+            ),
+        },
+        "delete": {
+            "function": bulk.delete_newsitems,
+            "signal": signals.newsitems_deleted,
+            "permissions": ["delete"],
+            "label": _("Delete"),
+            "message": lambda n: ngettext(
+                "%(count)d news post has been deleted",
+                "%(count)d news posts have been deleted",
+                n,
+            ),
+        },
+    }
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.newsindex = get_object_or_404(
+            Page.objects.specific().type(NewsIndexMixin), pk=kwargs["pk"]
+        )
+        data = request.POST if request.method == "POST" else request.GET
+        self.action_name = data.get("action")
+        self.action = self.actions.get(self.action_name)
+        if self.action is None:
+            self.permissions_required = ["change"]
+        else:
+            self.permissions_required = self.action["permissions"]
+        self.ids = [pk for pk in data.getlist("id") if pk.isdigit()]
+
+    def get_index_url(self):
+        return reverse("wagtailnews:index", kwargs={"pk": self.newsindex.pk})
+
+    def get_queryset(self):
+        NewsItem = self.newsindex.get_newsitem_model()
+        return NewsItem.objects.filter(newsindex=self.newsindex, pk__in=self.ids)
+
+    def get(self, request, *args, **kwargs):
+        if self.action is None or not self.ids:
+            return redirect(self.get_index_url())
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        if self.action is None:
+            return redirect(self.get_index_url())
+
+        NewsItem = self.newsindex.get_newsitem_model()
+        with deferred_indexing():
+            instances = self.action["function"](self.get_queryset())
+            scheduled = []
+            if "scheduled_message" in self.action:
+                instances, scheduled, unpublished = instances
+                if unpublished:
+                    # Taken off the site until they go live
+                    signals.newsitems_unpublished.send(
+                        sender=NewsItem, instances=unpublished
+                    )
+            if instances or scheduled:
+                replica.record_write(request)
+            if instances:
+                self.action["signal"].send(sender=NewsItem, instances=instances)
+
+        if instances or not scheduled:
+            messages.success(
+                request,
+                self.action["message"](len(instances)) % {"count": len(instances)},
+            )
+        if scheduled:
+            messages.success(
+                request,
+                self.action["scheduled_message"](len(scheduled))
+                % {"count": len(scheduled)},
+            )
+        return redirect(self.get_index_url())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(
+            {
+                "newsindex": self.newsindex,
+                "newsitem_opts": self.newsindex.get_newsitem_model()._meta,
+                "action": self.action_name,
+                "action_label": self.action["label"],
+                "object_list": self.get_queryset().order_by("-date", "-pk"),
+                "index_url": self.get_index_url(),
+            }
         )
+        return context
+
+
+def export(request, pk):
+    """Download every news item in a news index as JSON Lines or CSV"""
+    newsindex = get_object_or_404(Page.objects.specific().type(NewsIndexMixin), pk=pk)
+    NewsItem = newsindex.get_newsitem_model()
+    if not request.user.has_perm(
+        format_perm(NewsItem, "change")
+    ) or not user_can_edit_newsindex(request.user, newsindex):
+        raise PermissionDenied()
+
+    format = request.GET.get("format", "jsonl")
+    if format not in EXPORTERS:
+        raise Http404
+    lines = EXPORTERS[format](
+        NewsItem.objects.filter(newsindex=newsindex),
+        revisions=bool(request.GET.get("revisions")),
+    )
+
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[format])
+    response["Content-Disposition"] = 'attachment; filename="{}.{}"'.format(
+        newsindex.slug, format
+    )
+    return response
 
 
 def view_draft(request, pk, newsitem_pk):
     newsindex = get_object_or_404(Page.objects.specific().type(NewsIndexMixin), pk=pk)
+    if not user_can_edit_newsindex(request.user, newsindex):
+        raise PermissionDenied()
     NewsItem = newsindex.get_newsitem_model()
     newsitem = get_object_or_404(NewsItem, newsindex=newsindex, pk=newsitem_pk)
     newsitem = newsitem.get_latest_revision_as_newsitem()
@@ -288,6 +489,8 @@ class PreviewOnEdit(GenericPreviewOnEdit):
         self.newsindex = get_object_or_404(
             Page.objects.specific().type(NewsIndexMixin), pk=kwargs["index_pk"]
         )
+        if not user_can_edit_newsindex(request.user, self.newsindex):
+            raise PermissionDenied()
         super().setup(request, *args, **kwargs)
 
     @property
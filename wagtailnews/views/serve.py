@@ -0,0 +1,50 @@
+"""
+An async version of the Wagtail ``serve`` view, for sites running under ASGI.
+
+News indexes serve their routes with the async versions of them, so the news
+items are fetched with the async ORM. Everything else, including finding the
+page and the ``before_serve_page`` hooks, runs in a thread as usual.
+"""
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse
+from wagtail import hooks
+from wagtail.models import Site
+
+from ..models import NewsIndexMixin
+
+
+def route(request, path):
+    """
+    Find the page for a path, and run the ``before_serve_page`` hooks.
+    Returns a response from a hook, or the page and its route arguments.
+    """
+    site = Site.find_for_request(request)
+    if not site:
+        raise Http404
+
+    path_components = [component for component in path.split("/") if component]
+    page, args, kwargs = site.root_page.localized.specific.route(
+        request, path_components
+    )
+
+    for fn in hooks.get_hooks("before_serve_page"):
+        result = fn(page, request, args, kwargs)
+        if isinstance(result, HttpResponse):
+            return result
+
+    return page, args, kwargs
+
+
+async def serve(request, path):
+    """
+    Serve a Wagtail page. Use this in place of the Wagtail ``serve`` view,
+    with the same URL pattern and name.
+    """
+    result = await sync_to_async(route)(request, path)
+    if isinstance(result, HttpResponse):
+        return result
+
+    page, args, kwargs = result
+    if isinstance(page, NewsIndexMixin):
+        return await page.aserve(request, *args, **kwargs)
+    return await sync_to_async(page.serve)(request, *args, **kwargs)